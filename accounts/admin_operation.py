@@ -1,15 +1,23 @@
-import re
+from contextlib import suppress
 
+from django import forms
 from django.contrib import admin, messages
-from django.contrib.admin import SimpleListFilter
+from django.contrib.admin import SimpleListFilter, helpers
+from django.core.exceptions import PermissionDenied
 from django.db import transaction
-from django.db.models import BooleanField, ExpressionWrapper, F, Q, Sum
-from django.db.models.functions import Round
+from django.db.models import (
+    Exists,
+    OuterRef,
+)
 from django.http import Http404, HttpResponseRedirect
 from django.shortcuts import get_object_or_404, redirect
+from django.template.response import TemplateResponse
 from django.urls import path, reverse
+from django.utils.decorators import method_decorator
 from django.utils.html import format_html
+from django.views.decorators.http import require_POST
 from import_export.admin import ImportMixin
+from import_export.forms import ConfirmImportForm
 
 from accounts.admin_custom_views import (
     LinkToBillView,
@@ -17,16 +25,23 @@ from accounts.admin_custom_views import (
     LinkToSignupView,
 )
 from accounts.admin_inline import JustificationInline
-from accounts.format import BPostCSV, FortisCSV
+from accounts.format import CAMT053, CODA, BPostCSV, FortisCSV, statement_hash
+from accounts.matching import refresh_suggestions
 from accounts.models import (
-    Bill,
     ExpenditureChoices,
     ExpenseReport,
     IncomeChoices,
     Operation,
     OperationValidation,
+    ReconciliationSuggestion,
+)
+from accounts.reconciliation import (
+    allocate,
+    apply_signup_payments,
+    plan_signup_payments,
 )
 from accounts.resource import OperationResource
+from dynasignup.mixins import StreamingCSVExportMixin
 
 
 class JustifiedFilter(SimpleListFilter):
@@ -43,17 +58,42 @@ class JustifiedFilter(SimpleListFilter):
 
     def queryset(self, request, queryset):
         filters = {
-            "valid": {"_justified": True},
-            "unkown": {"_justified__isnull": True},
-            "invalid": {"_justified": False},
+            "valid": {"justified": True},
+            "unkown": {"justified__isnull": True},
+            "invalid": {"justified": False},
             None: {},
         }
-        return queryset.distinct().filter(**filters[self.value()])
+        return queryset.filter(**filters[self.value()])
 
 
-class OperationAdmin(ImportMixin, admin.ModelAdmin):
+class ToReconcileFilter(SimpleListFilter):
+    title = "À réconcilier"
+    parameter_name = "to_reconcile"
+
+    def lookups(self, request, model_admin):
+        return [("yes", "Avec suggestion"), ("no", "Sans suggestion")]
+
+    def queryset(self, request, queryset):
+        if self.value() is None:
+            return queryset
+        has_suggestion = Exists(
+            ReconciliationSuggestion.objects.filter(operation=OuterRef("pk"))
+        )
+        if self.value() == "no":
+            has_suggestion = ~has_suggestion
+        return queryset.filter(has_suggestion, justified__isnull=True)
+
+
+class StatementConfirmImportForm(ConfirmImportForm):
+    file_hash = forms.CharField(widget=forms.HiddenInput(), required=False)
+
+
+class OperationAdmin(ImportMixin, StreamingCSVExportMixin, admin.ModelAdmin):
     inlines = [JustificationInline]
     resource_class = OperationResource
+    import_export_change_list_template = (
+        "admin/import_export/change_list_import_export.html"
+    )
 
     list_display = (
         "number",
@@ -97,7 +137,7 @@ class OperationAdmin(ImportMixin, admin.ModelAdmin):
     )
 
     date_hierarchy = "date"
-    list_filter = ("year", "account__name", JustifiedFilter)
+    list_filter = ("year", "account__name", JustifiedFilter, ToReconcileFilter)
 
     actions = [
         "link_selected_operations_to_bill",
@@ -105,6 +145,8 @@ class OperationAdmin(ImportMixin, admin.ModelAdmin):
         "action_bank_fee",
         "cancel_each_other_out",
         "link_expense",
+        "refresh_selected_suggestions",
+        "reconcile_signup_payments",
     ]
 
     @admin.action(description="Link selected operations to bill")
@@ -182,28 +224,80 @@ class OperationAdmin(ImportMixin, admin.ModelAdmin):
             )
         return HttpResponseRedirect(request.META.get("HTTP_REFERER"))
 
-    def get_queryset(self, request):
-        qs = super().get_queryset(request).filter(year__gte="2023")
-        return qs.alias(
-            _justified_amount=Round(Sum("operationvalidation__amount") - F("amount"), 2)
-        ).annotate(
-            _justified_amount=F("_justified_amount"),
-            _justified=ExpressionWrapper(
-                Q(_justified_amount__exact=0), output_field=BooleanField()
-            ),
+    @admin.action(description="Recalculer les suggestions de réconciliation")
+    def refresh_selected_suggestions(self, request, queryset):
+        count = refresh_suggestions(queryset)
+        messages.success(request, f"{count} suggestions enregistrées.")
+
+    @admin.action(description="Réconcilier les paiements des inscriptions 2026")
+    def reconcile_signup_payments(self, request, queryset):
+        plan = plan_signup_payments(queryset, created_by=request.user)
+        if request.POST.get("apply"):
+            applied = apply_signup_payments(plan)
+            messages.success(
+                request, f"{len(applied)} opérations liées à une inscription 2026."
+            )
+            return None
+        return TemplateResponse(
+            request,
+            "admin/accounts/reconcile_signup_payments.html",
+            {
+                **self.admin_site.each_context(request),
+                "opts": self.model._meta,
+                "title": "Réconcilier les paiements des inscriptions 2026",
+                "plan": plan,
+                "applied_count": sum(allocation.applied for allocation in plan),
+                "queryset": queryset,
+                "action_checkbox_name": helpers.ACTION_CHECKBOX_NAME,
+            },
         )
 
-    def justified_amount(self, inst):
-        return inst._justified_amount
-
-    def justified(self, inst):
-        return inst._justified
-
-    justified.boolean = True
-    justified.admin_order_field = "_justified"
+    def get_queryset(self, request):
+        return super().get_queryset(request).filter(year__gte="2023")
 
     def get_import_formats(self):
-        return [BPostCSV, FortisCSV]
+        return [BPostCSV, FortisCSV, CODA, CAMT053]
+
+    def get_confirm_form_class(self, request):
+        return StatementConfirmImportForm
+
+    def write_to_tmp_storage(self, import_file, input_format):
+        tmp_storage = super().write_to_tmp_storage(import_file, input_format)
+        import_file.file_hash = statement_hash(tmp_storage.read())
+        return tmp_storage
+
+    def get_confirm_form_initial(self, request, import_form):
+        initial = super().get_confirm_form_initial(request, import_form)
+        if import_form is not None:
+            initial["file_hash"] = import_form.cleaned_data["import_file"].file_hash
+        return initial
+
+    @method_decorator(require_POST)
+    def process_import(self, request, **kwargs):
+        """Import the rows parsed for the preview, without reading the file again.
+
+        Falls back to parsing the uploaded file when they left the cache.
+        """
+        if not self.has_import_permission(request):
+            raise PermissionDenied
+        confirm_form = self.create_confirm_form(request)
+        if confirm_form.is_valid() and confirm_form.cleaned_data["file_hash"]:
+            input_format = self.get_import_formats()[
+                int(confirm_form.cleaned_data["format"])
+            ]()
+            dataset = input_format.cached_dataset(
+                confirm_form.cleaned_data["file_hash"]
+            )
+            if dataset is not None:
+                result = self.process_dataset(dataset, confirm_form, request, **kwargs)
+                tmp_storage = self.get_tmp_storage_class()(
+                    name=confirm_form.cleaned_data["import_file_name"],
+                    **self.get_tmp_storage_class_kwargs(),
+                )
+                with suppress(FileNotFoundError):
+                    tmp_storage.remove()
+                return self.process_result(result, request)
+        return super().process_import(request, **kwargs)
 
     def get_urls(self):
         urls = super().get_urls()
@@ -246,67 +340,45 @@ class OperationAdmin(ImportMixin, admin.ModelAdmin):
         ]
         return my_urls + urls
 
-    def communication_(self, obj):
-        if obj.operationvalidation_set.exists():
-            return obj.communication
-        if match := re.search(r"reunion[-_ ]*(\d+)", obj.communication, re.IGNORECASE):
-            print(match)
-            from reunion.models import Signup as ReunionSignup
-
-            reunion_id = ReunionSignup.objects.get(id=match.group(1)).id
-            url = reverse(
-                "admin:accounts_operation_link_to_reunion", args=[obj.id, reunion_id]
-            )
-            return format_html(
-                '<p>{}</p><a class="button" href="{}">Link to reunion #{}</a>',
-                obj.communication,
-                url,
-                reunion_id,
-            )
+    LINK_URL_NAMES = {
+        "reunion": "admin:accounts_operation_link_to_reunion",
+        "expense_report": "admin:accounts_operation_link_to_expense_report",
+        "signup2026": "admin:accounts_operation_link_to_signup2026",
+        "signup": "admin:accounts_operation_link_to_signup",
+    }
+
+    def get_changelist_instance(self, request):
+        cl = super().get_changelist_instance(request)
+        # Read the suggestions of the whole page at once.
+        unjustified = [
+            operation for operation in cl.result_list if operation.justified is None
+        ]
+        suggestions = {}
+        for suggestion in ReconciliationSuggestion.objects.filter(
+            operation__in=unjustified
+        ):
+            suggestions.setdefault(suggestion.operation_id, suggestion)
+        for operation in cl.result_list:
+            operation.suggestion = suggestions.get(operation.pk)
+        return cl
 
-        match = re.search(r"(\d\d\d\d-\d\d\d\d)", obj.communication, re.IGNORECASE)
-        if match:
-            expense_report_title = match.group(0)
-            try:
-                expense_report_id = ExpenseReport.objects.get(
-                    title=expense_report_title
-                ).id
-                url = reverse(
-                    "admin:accounts_operation_link_to_expense_report",
-                    args=[obj.id, expense_report_id],
-                )
-                return format_html(
-                    '<p>{}</p><a class="button" href="{}">Link to NF {}</a>',
-                    obj.communication,
-                    url,
-                    expense_report_title,
-                )
-            except Bill.DoesNotExist:
-                print("erreur")
-                pass
-
-        match = re.search(r"(inscription +)?(\d+)", obj.communication, re.IGNORECASE)
-        if match:
-            signup_id = match.group(2)
-            from signup2026.models import Signup as Signup2026
-
-            if Signup2026.objects.filter(id=signup_id).exists():
-                url = reverse(
-                    "admin:accounts_operation_link_to_signup2026",
-                    args=[obj.id, signup_id],
-                )
-            else:
-                url = reverse(
-                    "admin:accounts_operation_link_to_signup", args=[obj.id, signup_id]
-                )
-            return format_html(
-                '<p>{}</p><a class="button" href="{}">Link to #{}</a>',
-                obj.communication,
-                url,
-                signup_id,
+    def communication_(self, obj):
+        if not hasattr(obj, "suggestion"):
+            obj.suggestion = (
+                None if obj.justified is not None else obj.suggestions.first()
             )
-
-        return obj.communication
+        suggestion = obj.suggestion
+        if suggestion is None:
+            return obj.communication
+        url = reverse(
+            self.LINK_URL_NAMES[suggestion.kind], args=[obj.id, suggestion.object_id]
+        )
+        return format_html(
+            '<p>{}</p><a class="button" href="{}">Link to {}</a>',
+            obj.communication,
+            url,
+            suggestion.label,
+        )
 
     communication_.name = "communication"
     communication_.short_description = "communication"
@@ -344,32 +416,15 @@ class OperationAdmin(ImportMixin, admin.ModelAdmin):
         operation = get_object_or_404(Operation, id=operation_id)
         signup = get_object_or_404(Signup, id=signup_id)
 
-        remaining = operation.amount
-
-        with transaction.atomic():
-            for participant in signup.participants_set.with_amounts().filter(
-                amount_due_remaining__gt=0
-            ):
-                if remaining <= 0:
-                    break
-                amount = min(remaining, participant.amount_due_remaining)
-                OperationValidation.objects.create(
-                    operation=operation,
-                    amount=amount,
-                    event=participant,
-                    validation_type=IncomeChoices.SIGNUP,
-                    created_by=request.user,
-                )
-                remaining -= amount
-
-            if remaining > 0:
-                OperationValidation.objects.create(
-                    operation=operation,
-                    amount=remaining,
-                    event=signup,
-                    validation_type=IncomeChoices.DONATION,
-                    created_by=request.user,
-                )
+        validations = allocate(
+            operation,
+            signup,
+            signup.participants_set.with_amounts()
+            .filter(amount_due_remaining__gt=0)
+            .order_by("id"),
+            created_by=request.user,
+        )
+        OperationValidation.objects.bulk_create(validations)
 
         if signup.payed():
             signup.send_payment_confirmation_mail()
@@ -0,0 +1,75 @@
+"""Import large bank statements without building a dataset in memory.
+
+The rows of a :class:`~accounts.format.BankStatementFormat` are read lazily
+and inserted in chunks. Operations already known by ``(account, year,
+number)`` are skipped: the bank never changes a booked operation.
+
+Only the ``import_bank_statement`` command goes through here. The admin
+import still loads the whole statement into a dataset, which its preview and
+row-by-row diff need; use the command for statements too large for that.
+"""
+
+from dataclasses import dataclass
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import Q
+
+from accounts.format import HEADERS
+from accounts.matching import refresh_suggestions
+from accounts.models import Operation
+
+
+@dataclass
+class ImportReport:
+    new: int = 0
+    skipped: int = 0
+
+
+def existing_keys(operations):
+    """``(account_id, year, number)`` of ``operations`` already stored."""
+    lookup = Q()
+    for account_id, year in {(op.account_id, op.year) for op in operations}:
+        lookup |= Q(
+            account_id=account_id,
+            year=year,
+            number__in=[
+                op.number
+                for op in operations
+                if (op.account_id, op.year) == (account_id, year)
+            ],
+        )
+    return set(
+        Operation.objects.filter(lookup).values_list("account", "year", "number")
+    )
+
+
+def import_operations(rows, batch_size=1000):
+    """Insert the operations of ``rows`` that are not stored yet.
+
+    :param rows: iterable of tuples of ``HEADERS`` values, as produced by
+        :meth:`~accounts.format.BankStatementFormat.iter_rows`.
+    :return: an :class:`ImportReport`.
+    """
+    report = ImportReport()
+    rows = iter(rows)
+    while chunk := list(islice(rows, batch_size)):
+        operations = {}
+        for row in chunk:
+            values = dict(zip(HEADERS, row, strict=True))
+            operation = Operation(
+                account_id=values.pop("account"),
+                number=int(values.pop("number")),
+                **values,
+            )
+            operations[(operation.account_id, operation.year, operation.number)] = (
+                operation
+            )
+        known = existing_keys(operations.values())
+        new = [op for key, op in operations.items() if key not in known]
+        with transaction.atomic():
+            Operation.objects.bulk_create(new)
+            refresh_suggestions(new)
+        report.new += len(new)
+        report.skipped += len(chunk) - len(new)
+    return report
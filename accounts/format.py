@@ -1,79 +1,85 @@
 import csv
+import hashlib
 from datetime import datetime
+from decimal import Decimal
 from io import StringIO
+from xml.etree import ElementTree
 
 import tablib
+from django.core.cache import cache
 from import_export.formats.base_formats import Format
 
 from accounts.models import Account
 
+HEADERS = (
+    "account",
+    "number",
+    "year",
+    "date",
+    "description",
+    "amount",
+    "currency",
+    "effective_date",
+    "counterparty_IBAN",
+    "counterparty_name",
+    "communication",
+    "reference",
+)
+
+
+#: How long a parsed statement waits for the import to be confirmed.
+PARSED_STATEMENT_TIMEOUT = 60 * 60
+
+
+def parse_amount(amount):
+    return Decimal(amount.replace(",", "."))
+
+
+def structured_communication(digits):
+    """Belgian structured communication, as printed on transfer forms."""
+    return f"+++{digits[:3]}/{digits[3:7]}/{digits[7:12]}+++"
+
+
+def statement_hash(in_stream):
+    return hashlib.sha256(in_stream.encode()).hexdigest()
+
+
+class BankStatementFormat(Format):
+    """Import-only format for a bank statement export.
+
+    Subclasses implement :meth:`iter_rows`, which parses the statement lazily
+    into tuples of ``HEADERS`` values. The admin import builds a dataset from
+    it, :func:`accounts.bulk_import.import_operations` streams it.
+
+    The rows parsed for the import preview are cached by hash of the file, so
+    that confirming the import does not parse the file again.
+    """
 
-class BPostCSV(Format):
     CONTENT_TYPE = "text/csv"
 
     def __init__(self, encoding=None):
         super().__init__()
 
-    def get_title(self):
-        return "csv extract from bpost"
-
-    def create_dataset(self, in_stream):
-        csv_reader = csv.reader(StringIO(in_stream), delimiter=";")
-
-        _, iban, account_type = next(csv_reader)
-        account, _ = Account.objects.get_or_create(IBAN=iban, name=account_type)
-        account_id = account.id
-        data = tablib.Dataset()
-        next(csv_reader)
-        data.headers = (
-            "account",
-            "number",
-            "year",
-            "date",
-            "description",
-            "amount",
-            "currency",
-            "effective_date",
-            "counterparty_IBAN",
-            "counterparty_name",
-            "communication",
-            "reference",
-        )
+    def iter_rows(self, lines):
+        raise NotImplementedError()
 
-        for row in csv_reader:
-            (
-                number,
-                date,
-                description,
-                amount,
-                currency,
-                effective_date,
-                counterparty_IBAN,
-                counterparty_name,
-                *communication,
-                reference,
-                _,
-            ) = row
-            transaction_date = datetime.strptime(date, "%Y-%m-%d")
-            effective_date = datetime.strptime(effective_date, "%Y-%m-%d")
-            data.append(
-                (
-                    account_id,
-                    number,
-                    transaction_date.year,
-                    transaction_date,
-                    description,
-                    float(amount.replace(",", ".")),
-                    currency,
-                    effective_date,
-                    counterparty_IBAN,
-                    counterparty_name,
-                    "\n".join(communication),
-                    reference,
-                )
-            )
+    def cache_key(self, file_hash):
+        return f"accounts:statement:{type(self).__name__}:{file_hash}"
 
-        return data
+    def create_dataset(self, in_stream):
+        key = self.cache_key(statement_hash(in_stream))
+        rows = cache.get(key)
+        if rows is None:
+            rows = list(self.iter_rows(StringIO(in_stream)))
+            cache.set(key, rows, PARSED_STATEMENT_TIMEOUT)
+        return tablib.Dataset(*rows, headers=HEADERS)
+
+    def cached_dataset(self, file_hash):
+        """Dataset parsed from the file of hash ``file_hash``, if still cached."""
+        rows = cache.get(self.cache_key(file_hash))
+        if rows is None:
+            return None
+        return tablib.Dataset(*rows, headers=HEADERS)
 
     def export_data(self, dataset, **kwargs):
         """
@@ -104,12 +110,51 @@ class BPostCSV(Format):
         return False
 
 
-class FortisCSV(Format):
-    CONTENT_TYPE = "text/csv"
+class BPostCSV(BankStatementFormat):
+    def get_title(self):
+        return "csv extract from bpost"
+
+    def iter_rows(self, lines):
+        csv_reader = csv.reader(lines, delimiter=";")
+
+        _, iban, account_type = next(csv_reader)
+        account, _ = Account.objects.get_or_create(IBAN=iban, name=account_type)
+        account_id = account.id
+        next(csv_reader)
+
+        for row in csv_reader:
+            (
+                number,
+                date,
+                description,
+                amount,
+                currency,
+                effective_date,
+                counterparty_IBAN,
+                counterparty_name,
+                *communication,
+                reference,
+                _,
+            ) = row
+            transaction_date = datetime.strptime(date, "%Y-%m-%d")
+            effective_date = datetime.strptime(effective_date, "%Y-%m-%d")
+            yield (
+                account_id,
+                number,
+                transaction_date.year,
+                transaction_date,
+                description,
+                parse_amount(amount),
+                currency,
+                effective_date,
+                counterparty_IBAN,
+                counterparty_name,
+                "\n".join(communication),
+                reference,
+            )
 
-    def __init__(self, encoding=None):
-        super().__init__()
 
+class FortisCSV(BankStatementFormat):
     def get_title(self):
         return "csv extract from fortis"
 
@@ -125,24 +170,9 @@ class FortisCSV(Format):
             self._account_ids[iban] = account_id
         return account_id
 
-    def create_dataset(self, in_stream):
-        csv_reader = csv.reader(StringIO(in_stream), delimiter=";")
-        data = tablib.Dataset()
+    def iter_rows(self, lines):
+        csv_reader = csv.reader(lines, delimiter=";")
         next(csv_reader)
-        data.headers = (
-            "account",
-            "number",
-            "year",
-            "date",
-            "description",
-            "amount",
-            "currency",
-            "effective_date",
-            "counterparty_IBAN",
-            "counterparty_name",
-            "communication",
-            "reference",
-        )
 
         for row in csv_reader:
             (
@@ -164,49 +194,187 @@ class FortisCSV(Format):
             if not number:
                 continue
             transaction_date = datetime.strptime(date, "%d/%m/%Y")
-            data.append(
-                (
-                    self.get_account_id(account),
-                    number,
-                    transaction_date.year,
-                    transaction_date,
-                    description,
-                    float(amount.replace(",", ".")),
-                    currency,
-                    datetime.strptime(effective_date, "%d/%m/%Y"),
-                    counterparty_IBAN,
-                    counterparty_name,
-                    communication,
-                    description,
-                )
+            yield (
+                self.get_account_id(account),
+                number,
+                transaction_date.year,
+                transaction_date,
+                description,
+                parse_amount(amount),
+                currency,
+                datetime.strptime(effective_date, "%d/%m/%Y"),
+                counterparty_IBAN,
+                counterparty_name,
+                communication,
+                description,
             )
 
-        return data
 
-    def export_data(self, dataset, **kwargs):
-        """
-        Returns format representation for given dataset.
-        """
-        raise NotImplementedError()
+class CODA(BankStatementFormat):
+    """Belgian CODA statements: fixed-width records of 128 characters.
 
-    def is_binary(self):
-        return False
+    Movements are numbered ``statement number * 10000 + sequence number``,
+    which is unique within a year like the numbers of the CSV exports, but not
+    the same: do not mix formats for one account.
+    """
 
-    def get_read_mode(self):
-        return "r"
+    CONTENT_TYPE = "text/plain"
+
+    def get_title(self):
+        return "CODA"
 
     def get_extension(self):
-        return ("csv",)
+        return ("cod", "coda")
 
     def get_content_type(self):
-        return "text/csv"
+        return self.CONTENT_TYPE
+
+    def iter_rows(self, lines):
+        account_id = currency = None
+        movement = {}
+        for line in lines:
+            record = line.rstrip("\r\n").ljust(128)
+            if record[0] in "189" or record[:2] == "21":
+                if movement:
+                    yield self.movement_row(movement, account_id, currency)
+                movement = {}
+            if record[0] == "1":
+                account_id, currency = self.read_account(record)
+            elif record[:2] == "21":
+                # Details of a globalised movement repeat its total.
+                if record[6:10] == "0000":
+                    movement = {"21": record}
+            elif record[:2] in ("22", "23") and movement:
+                movement[record[:2]] = record
+        if movement:
+            yield self.movement_row(movement, account_id, currency)
+
+    def read_account(self, record):
+        if record[1] == "0":
+            iban, currency = record[5:17], record[18:21]
+        else:
+            iban, currency = record[5:39].strip(), record[39:42]
+        account, _ = Account.objects.get_or_create(
+            IBAN=iban, defaults={"name": record[64:90].strip() or "CODA"}
+        )
+        return account.id, currency
+
+    def movement_row(self, movement, account_id, currency):
+        main = movement["21"]
+        more = movement.get("22", " " * 128)
+        counterparty = movement.get("23", " " * 128)
+        entry_date = datetime.strptime(main[115:121], "%d%m%y")
+        amount = Decimal(main[32:47]) / 1000
+        if main[31] == "1":
+            amount = -amount
+        if main[61] == "1" and main[62:65] in ("101", "102"):
+            communication = structured_communication(main[65:77])
+        else:
+            communication = (main[62:115] + more[10:63] + counterparty[82:125]).strip()
+        return (
+            account_id,
+            int(main[121:124]) * 10000 + int(main[2:6]),
+            entry_date.year,
+            entry_date,
+            f"Code {main[53:61]}",
+            amount,
+            currency,
+            datetime.strptime(main[47:53], "%d%m%y"),
+            counterparty[10:44].strip(),
+            counterparty[47:82].strip(),
+            communication,
+            main[10:31].strip(),
+        )
 
-    @classmethod
-    def is_available(cls):
-        return True
 
-    def can_import(self):
-        return True
+class CAMT053(BankStatementFormat):
+    """ISO 20022 ``camt.053`` bank to customer statements.
 
-    def can_export(self):
-        return False
+    The XML is read with ``iterparse`` and every entry is dropped once it is
+    yielded. Entries are numbered ``statement sequence number * 10000 +
+    position in the statement``.
+    """
+
+    CONTENT_TYPE = "application/xml"
+
+    def get_title(self):
+        return "camt.053 (XML)"
+
+    def get_extension(self):
+        return ("xml",)
+
+    def get_content_type(self):
+        return self.CONTENT_TYPE
+
+    def iter_rows(self, lines):
+        account_id = currency = None
+        statement = position = 0
+        for _, element in ElementTree.iterparse(lines):
+            tag = element.tag.rsplit("}", 1)[-1]
+            if tag in ("ElctrncSeqNb", "LglSeqNb") and not statement:
+                statement = int(element.text)
+                position = 0
+            elif tag == "Acct" and account_id is None:
+                iban = element.findtext("{*}Id/{*}IBAN") or element.findtext(
+                    "{*}Id/{*}Othr/{*}Id"
+                )
+                currency = element.findtext("{*}Ccy", "EUR")
+                account, _ = Account.objects.get_or_create(
+                    IBAN=iban,
+                    defaults={"name": element.findtext("{*}Nm") or "camt.053"},
+                )
+                account_id = account.id
+            elif tag == "Ntry":
+                position += 1
+                yield self.entry_row(
+                    element, account_id, currency, statement * 10000 + position
+                )
+                element.clear()
+            elif tag == "Stmt":
+                account_id = None
+                statement = 0
+                element.clear()
+
+    def entry_row(self, entry, account_id, currency, number):
+        amount_element = entry.find("{*}Amt")
+        amount = Decimal(amount_element.text)
+        credit = entry.findtext("{*}CdtDbtInd") == "CRDT"
+        if not credit:
+            amount = -amount
+        booking_date = datetime.fromisoformat(
+            (
+                entry.findtext("{*}BookgDt/{*}Dt")
+                or entry.findtext("{*}BookgDt/{*}DtTm")
+            )[:10]
+        )
+        value_date = entry.findtext("{*}ValDt/{*}Dt")
+        details = entry.find("{*}NtryDtls/{*}TxDtls")
+        if details is None:
+            details = ElementTree.Element("TxDtls")
+        party = "Dbtr" if credit else "Cdtr"
+        counterparty_name = details.findtext(
+            f"{{*}}RltdPties/{{*}}{party}/{{*}}Nm"
+        ) or details.findtext(f"{{*}}RltdPties/{{*}}{party}/{{*}}Pty/{{*}}Nm", "")
+        reference = details.findtext("{*}RmtInf/{*}Strd/{*}CdtrRefInf/{*}Ref")
+        if reference and reference.isdigit() and len(reference) == 12:
+            communication = structured_communication(reference)
+        elif reference:
+            communication = reference
+        else:
+            communication = "\n".join(
+                element.text or "" for element in details.iterfind("{*}RmtInf/{*}Ustrd")
+            )
+        return (
+            account_id,
+            number,
+            booking_date.year,
+            booking_date,
+            (entry.findtext("{*}AddtlNtryInf") or "")[:255],
+            amount,
+            amount_element.get("Ccy", currency),
+            datetime.fromisoformat(value_date) if value_date else booking_date,
+            details.findtext(f"{{*}}RltdPties/{{*}}{party}Acct/{{*}}Id/{{*}}IBAN", ""),
+            counterparty_name[:255],
+            communication[:255],
+            entry.findtext("{*}AcctSvcrRef") or entry.findtext("{*}NtryRef", ""),
+        )
@@ -2,7 +2,6 @@ from django import forms
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import transaction
-from django.db.models import F, Sum
 
 from accounts.models import (
     Bill,
@@ -103,9 +102,7 @@ class VentilationForm(forms.ModelForm):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         instance = kwargs.get("instance")
-        qs = Operation.objects.alias(
-            _justified_amount=Sum("operationvalidation__amount") - F("amount")
-        ).filter(_justified_amount__isnull=True, year=2022)
+        qs = Operation.objects.filter(justified__isnull=True, year=2022)
         if instance is not None:
             qs |= Operation.objects.filter(id=instance.operation_id)
 
@@ -128,3 +125,21 @@ class CreateVentilationForm(forms.ModelForm):
     class Meta:
         model = OperationValidation
         fields = ("operation", "validation_type", "amount")
+
+
+class ComparativeReportForm(forms.Form):
+    first_year = forms.IntegerField()
+    last_year = forms.IntegerField()
+    period = forms.ChoiceField(
+        choices=(("year", "par année"), ("month", "par mois")), required=False
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        first_year = cleaned_data.get("first_year")
+        last_year = cleaned_data.get("last_year")
+        if first_year is not None and last_year is not None and first_year > last_year:
+            raise ValidationError(
+                "La première année ne peut pas être postérieure à la dernière."
+            )
+        return cleaned_data
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.bulk_import import import_operations
+from accounts.format import CAMT053, CODA, BPostCSV, FortisCSV
+
+FORMATS = {"bpost": BPostCSV, "fortis": FortisCSV, "coda": CODA, "camt053": CAMT053}
+
+
+class Command(BaseCommand):
+    help = (
+        "Import a bank statement export, streaming it in chunks. Operations "
+        "already imported are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--format", dest="format_name", choices=sorted(FORMATS), required=True
+        )
+        parser.add_argument("--encoding", default="utf-8")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, path, format_name, encoding, batch_size, **options):
+        start = time.perf_counter()
+        with open(path, encoding=encoding, newline="") as lines:
+            report = import_operations(
+                FORMATS[format_name]().iter_rows(lines), batch_size=batch_size
+            )
+        self.stdout.write(
+            f"{report.new} new operations, {report.skipped} skipped "
+            f"in {time.perf_counter() - start:.1f}s."
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from accounts.models import LedgerRollup
+
+
+class Command(BaseCommand):
+    help = "Recompute the monthly totals of the validations by type."
+
+    def handle(self, *args, **options):
+        count = LedgerRollup.objects.rebuild()
+        self.stdout.write(f"{count} ledger rollups rebuilt.")
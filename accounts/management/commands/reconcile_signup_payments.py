@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from accounts.models import Operation
+from accounts.reconciliation import apply_signup_payments, plan_signup_payments
+
+
+class Command(BaseCommand):
+    help = (
+        "Link the unjustified incoming operations to the 2026 signups their "
+        "communication points to. Only prints what would be done unless "
+        "--apply is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--year", type=int, default=settings.DYNAMOBILE_LAST_DAY.year
+        )
+        parser.add_argument(
+            "--apply",
+            action="store_true",
+            help="Store the validations instead of only printing them.",
+        )
+
+    def handle(self, *args, year, apply, **options):
+        plan = plan_signup_payments(Operation.objects.filter(year=year))
+        for allocation in plan:
+            operation = allocation.operation
+            style = self.style.SUCCESS if allocation.applied else self.style.WARNING
+            self.stdout.write(
+                style(
+                    f"{operation.date} {operation.number:>5} "
+                    f"{operation.amount:>9}€ → #{allocation.signup.pk} "
+                    f"(reste {allocation.due}€) {allocation.status}"
+                )
+            )
+        to_apply = sum(allocation.applied for allocation in plan)
+        if not apply:
+            self.stdout.write(
+                f"{to_apply}/{len(plan)} operations would be linked, "
+                "run again with --apply."
+            )
+            return
+        applied = apply_signup_payments(plan)
+        self.stdout.write(f"{len(applied)}/{len(plan)} operations linked.")
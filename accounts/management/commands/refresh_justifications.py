@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from accounts.models import Operation
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the stored justified amount and state of the bank "
+        "operations from their validations."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--year", type=int, help="Only this year's operations.")
+
+    def handle(self, *args, year, **options):
+        operations = Operation.objects.all()
+        if year:
+            operations = operations.filter(year=year)
+        count = operations.refresh_justification()
+        self.stdout.write(f"{count} operations refreshed.")
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from accounts.matching import refresh_suggestions
+from accounts.models import Operation
+
+
+class Command(BaseCommand):
+    help = (
+        "Match the communications of the bank operations again and store the "
+        "reconciliation suggestions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--year", type=int, help="Only this year's operations.")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, year, batch_size, **options):
+        operations = Operation.objects.order_by("pk")
+        if year:
+            operations = operations.filter(year=year)
+        total = 0
+        last_pk = 0
+        while batch := list(operations.filter(pk__gt=last_pk)[:batch_size]):
+            total += refresh_suggestions(batch)
+            last_pk = batch[-1].pk
+        self.stdout.write(f"{total} suggestions stored.")
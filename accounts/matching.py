@@ -0,0 +1,189 @@
+"""Match bank operations to what they pay for, from their communication.
+
+A communication can mention a reunion signup (``reunion 12``), an expense
+report (``2025-0003``) or a signup number (``inscription 42``). The matches of
+a whole list of operations are resolved together, with one ``id__in`` query
+per target model.
+
+Matching runs when bank statements are imported: the results are stored as
+:class:`~accounts.models.ReconciliationSuggestion` rows, which the operation
+admin reads instead of parsing the communications again.
+"""
+
+import re
+from dataclasses import dataclass
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+
+from accounts.models import ExpenseReport, OperationValidation, ReconciliationSuggestion
+
+REUNION_RE = re.compile(r"reunion[-_ ]*(\d+)", re.IGNORECASE)
+EXPENSE_REPORT_RE = re.compile(r"(\d\d\d\d-\d\d\d\d)")
+SIGNUP_RE = re.compile(r"(inscription +)?(\d+)", re.IGNORECASE)
+STRUCTURED_RE = re.compile(r"\+\+\+\d{3}/\d{4}/\d{5}\+\+\+")
+
+
+@dataclass(frozen=True)
+class Match:
+    """What an operation's communication refers to.
+
+    ``kind`` is one of ``"reunion"``, ``"expense_report"``, ``"signup2026"``
+    and ``"signup"`` (2023 signups). ``confidence`` goes from 0 to 100.
+    """
+
+    kind: str
+    target_id: int
+    label: str
+    confidence: int
+
+
+@dataclass(frozen=True)
+class Candidates:
+    reunion_id: int | None = None
+    expense_report_title: str | None = None
+    signup_id: int | None = None
+    signup_prefixed: bool = False
+
+
+def parse_communication(communication):
+    """Ids and titles mentioned in ``communication``, in order of precedence."""
+    communication = communication or ""
+    if STRUCTURED_RE.fullmatch(communication):
+        # We do not hand out structured communications: their digits are
+        # not a signup number.
+        return Candidates()
+    if match := REUNION_RE.search(communication):
+        return Candidates(reunion_id=int(match.group(1)))
+    expense_report_title = None
+    if match := EXPENSE_REPORT_RE.search(communication):
+        expense_report_title = match.group(0)
+    signup_id = None
+    signup_prefixed = False
+    if match := SIGNUP_RE.search(communication):
+        signup_id = int(match.group(2))
+        signup_prefixed = match.group(1) is not None
+    return Candidates(
+        expense_report_title=expense_report_title,
+        signup_id=signup_id,
+        signup_prefixed=signup_prefixed,
+    )
+
+
+def resolve_matches(operations):
+    """Match ``operations`` in one pass.
+
+    :return: a dict mapping the operation pks to a :class:`Match`, or to
+        ``None`` when the communication refers to nothing known.
+    """
+    from reunion.models import Signup as ReunionSignup
+    from signup2026.models import Signup as Signup2026
+
+    candidates = {
+        operation.pk: parse_communication(operation.communication)
+        for operation in operations
+    }
+    reunion_ids = {c.reunion_id for c in candidates.values() if c.reunion_id}
+    titles = {
+        c.expense_report_title for c in candidates.values() if c.expense_report_title
+    }
+    signup_ids = {c.signup_id for c in candidates.values() if c.signup_id}
+
+    known_reunions = set()
+    if reunion_ids:
+        known_reunions = set(
+            ReunionSignup.objects.filter(id__in=reunion_ids).values_list(
+                "id", flat=True
+            )
+        )
+    expense_reports = {}
+    if titles:
+        for report_id, title in (
+            ExpenseReport.objects.filter(title__in=titles)
+            .order_by("-id")
+            .values_list("id", "title")
+        ):
+            expense_reports[title] = report_id
+    signups_2026 = set()
+    if signup_ids:
+        signups_2026 = set(
+            Signup2026.objects.filter(id__in=signup_ids).values_list("id", flat=True)
+        )
+
+    matches = {}
+    for pk, candidate in candidates.items():
+        match = None
+        if candidate.reunion_id:
+            if candidate.reunion_id in known_reunions:
+                match = Match(
+                    "reunion",
+                    candidate.reunion_id,
+                    f"reunion #{candidate.reunion_id}",
+                    90,
+                )
+        elif candidate.expense_report_title in expense_reports:
+            match = Match(
+                "expense_report",
+                expense_reports[candidate.expense_report_title],
+                f"NF {candidate.expense_report_title}",
+                90,
+            )
+        elif candidate.signup_id in signups_2026:
+            match = Match(
+                "signup2026",
+                candidate.signup_id,
+                f"#{candidate.signup_id}",
+                80 if candidate.signup_prefixed else 50,
+            )
+        elif candidate.signup_id is not None:
+            # Not checked: most 2023 signups are paid for already.
+            match = Match("signup", candidate.signup_id, f"#{candidate.signup_id}", 10)
+        matches[pk] = match
+    return matches
+
+
+TARGET_MODELS = {
+    "reunion": ("reunion", "signup"),
+    "expense_report": ("accounts", "expensereport"),
+    "signup2026": ("signup2026", "signup"),
+    "signup": ("signup2023", "signup"),
+}
+
+
+def refresh_suggestions(operations):
+    """Replace the reconciliation suggestions of ``operations``.
+
+    Operations which are (even partly) justified get no suggestion.
+
+    :return: the number of suggestions created.
+    """
+    operations = list(operations)
+    pks = [operation.pk for operation in operations]
+    justified = set(
+        OperationValidation.objects.filter(operation__in=pks).values_list(
+            "operation_id", flat=True
+        )
+    )
+    matches = resolve_matches(
+        [operation for operation in operations if operation.pk not in justified]
+    )
+    content_types = {
+        kind: ContentType.objects.get_by_natural_key(*natural_key)
+        for kind, natural_key in TARGET_MODELS.items()
+    }
+    suggestions = [
+        ReconciliationSuggestion(
+            operation_id=pk,
+            kind=match.kind,
+            content_type=content_types[match.kind],
+            object_id=match.target_id,
+            label=match.label,
+            confidence=match.confidence,
+        )
+        for pk, match in matches.items()
+        if match is not None
+    ]
+    with transaction.atomic():
+        ReconciliationSuggestion.objects.filter(operation__in=pks).delete()
+        ReconciliationSuggestion.objects.bulk_create(suggestions)
+    return len(suggestions)
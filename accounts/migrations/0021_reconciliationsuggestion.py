@@ -0,0 +1,68 @@
+# Generated by Django 6.0.6 on 2026-10-18 08:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0020_alter_operationvalidation_content_type_and_more"),
+        ("contenttypes", "0002_remove_content_type_name"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReconciliationSuggestion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("reunion", "réunion"),
+                            ("expense_report", "note de frais"),
+                            ("signup2026", "inscription 2026"),
+                            ("signup", "inscription 2023"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("object_id", models.PositiveIntegerField()),
+                ("label", models.CharField(max_length=255)),
+                ("confidence", models.PositiveSmallIntegerField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+                (
+                    "operation",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="suggestions",
+                        to="accounts.operation",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("operation", "-confidence"),
+                "indexes": [
+                    models.Index(
+                        fields=["content_type", "object_id"],
+                        name="accounts_re_content_c60d6a_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 6.0.6 on 2026-10-18 08:47
+
+from django.db import migrations, models
+from django.db.models import Case, F, OuterRef, Subquery, Sum, When
+from django.db.models.functions import Round
+
+
+def fill_justification(apps, schema_editor):
+    Operation = apps.get_model("accounts", "Operation")
+    OperationValidation = apps.get_model("accounts", "OperationValidation")
+    validated = Subquery(
+        OperationValidation.objects.filter(operation=OuterRef("pk"))
+        .values("operation")
+        .annotate(total=Sum("amount"))
+        .values("total")[:1],
+        output_field=models.DecimalField(max_digits=11, decimal_places=2),
+    )
+    Operation.objects.update(justified_amount=Round(validated - F("amount"), 2))
+    Operation.objects.update(
+        justified=Case(
+            When(justified_amount__isnull=True, then=None),
+            When(justified_amount=0, then=True),
+            default=False,
+            output_field=models.BooleanField(null=True),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0021_reconciliationsuggestion"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="operation",
+            name="justified",
+            field=models.BooleanField(db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="operation",
+            name="justified_amount",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, editable=False, max_digits=11, null=True
+            ),
+        ),
+        migrations.RunPython(fill_justification, migrations.RunPython.noop),
+    ]
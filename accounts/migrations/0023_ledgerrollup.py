@@ -0,0 +1,115 @@
+# Generated by Django 6.0.6 on 2026-10-18 08:56
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+
+def fill_rollups(apps, schema_editor):
+    LedgerRollup = apps.get_model("accounts", "LedgerRollup")
+    OperationValidation = apps.get_model("accounts", "OperationValidation")
+    LedgerRollup.objects.bulk_create(
+        LedgerRollup(**row)
+        for row in OperationValidation.objects.filter(operation__isnull=False)
+        .values(
+            "validation_type",
+            year=ExtractYear("operation__date"),
+            month=ExtractMonth("operation__date"),
+        )
+        .annotate(amount=Sum("amount"), count=Count("id"))
+        .order_by()
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0022_operation_justified"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LedgerRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("year", models.PositiveSmallIntegerField()),
+                ("month", models.PositiveSmallIntegerField()),
+                (
+                    "validation_type",
+                    models.IntegerField(
+                        blank=True,
+                        choices=[
+                            (
+                                "Expenses",
+                                [
+                                    (6010, "matériel"),
+                                    (6015, "location de matériel"),
+                                    (6030, "cuisine mobile"),
+                                    (6031, "encas / collations"),
+                                    (6041, "marchandises(t-shirts etc)"),
+                                    (6104, "location salles"),
+                                    (6111, "frais réunions"),
+                                    (6120, "fournitures bureau"),
+                                    (6124, "poste"),
+                                    (6131, "activités culturelles"),
+                                    (6132, "photocopies"),
+                                    (6133, "conférences communiqués presse"),
+                                    (6135, "brochures"),
+                                    (6136, "activités sportives"),
+                                    (6141, "assurance sportive groupe"),
+                                    (6142, "goodwill - cadeaux"),
+                                    (6150, "transport organisateurs"),
+                                    (6151, "indemnités km organisateurs"),
+                                    (6152, "logement repas organisateurs"),
+                                    (6153, "voitures suiveuses"),
+                                    (6154, "transport participants"),
+                                    (6156, "logement participants"),
+                                    (6160, "telecom"),
+                                    (6161, "site web"),
+                                    (6171, "documentation - cartes"),
+                                    (6173, "formation"),
+                                    (6501, "frais bancaires"),
+                                    (6502, "frais administratifs"),
+                                ],
+                            ),
+                            (
+                                "Incomes",
+                                [
+                                    (7000, "INSCRIPTIONS"),
+                                    (7001, "DONS"),
+                                    (7002, "SUBSIDES"),
+                                    (7003, "VENTE MARCHANDISES"),
+                                    (7512, "PRODUITS BANCAIRES"),
+                                ],
+                            ),
+                        ],
+                        null=True,
+                        verbose_name="justification",
+                    ),
+                ),
+                (
+                    "amount",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=11, verbose_name="montant"
+                    ),
+                ),
+                ("count", models.PositiveIntegerField()),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("year", "month", "validation_type"),
+                        name="unique_ledger_rollup",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(fill_rollups, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,14 @@
 # Create your models here.
 
-from datetime import datetime
+from datetime import date, datetime
 
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, Count, F, OuterRef, Q, Subquery, Sum, When
+from django.db.models.functions import ExtractMonth, ExtractYear, Round
 from django.urls import NoReverseMatch, reverse
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext as _
@@ -22,6 +24,44 @@ class Account(models.Model):
         return self.name
 
 
+class OperationQuerySet(models.QuerySet):
+    def refresh_justification(self):
+        """Store how much of each operation is justified by its validations.
+
+        ``justified_amount`` is the sum of the validations minus the amount of
+        the operation, ``None`` without validations. ``justified`` is ``True``
+        when it is zero, ``False`` otherwise and ``None`` without validations.
+        """
+        validated = Subquery(
+            OperationValidation.objects.filter(operation=OuterRef("pk"))
+            .values("operation")
+            .annotate(total=Sum("amount"))
+            .values("total")[:1],
+            output_field=models.DecimalField(max_digits=11, decimal_places=2),
+        )
+        count = self.update(justified_amount=Round(validated - F("amount"), 2))
+        self.update(
+            justified=Case(
+                When(justified_amount__isnull=True, then=None),
+                When(justified_amount=0, then=True),
+                default=False,
+                output_field=models.BooleanField(null=True),
+            )
+        )
+        return count
+
+    def refresh_from_validations(self):
+        """Update what is derived from the validations of these operations."""
+        self.refresh_justification()
+        LedgerRollup.objects.refresh_months(
+            self.values_list("date__year", "date__month").distinct()
+        )
+        # The signup exports show the payments and filter on them.
+        from signup2026.models import ExportJob
+
+        transaction.on_commit(ExportJob.objects.outdate)
+
+
 class Operation(models.Model):
     account = models.ForeignKey(Account, on_delete=models.CASCADE)
     year = models.IntegerField()
@@ -35,6 +75,12 @@ class Operation(models.Model):
     counterparty_name = models.CharField(max_length=255)
     communication = models.CharField(max_length=255)
     reference = models.CharField(max_length=255)
+    justified_amount = models.DecimalField(
+        max_digits=11, decimal_places=2, null=True, blank=True, editable=False
+    )
+    justified = models.BooleanField(null=True, editable=False, db_index=True)
+
+    objects = OperationQuerySet.as_manager()
 
     class Meta:
         unique_together = (
@@ -89,6 +135,36 @@ class IncomeChoices(models.IntegerChoices):
     INTERESTS = 7512, _("PRODUITS BANCAIRES")
 
 
+class OperationValidationQuerySet(models.QuerySet):
+    """Keeps the justification of the operations and the ledger rollups
+    current on bulk writes."""
+
+    TRACKED_FIELDS = {"amount", "operation", "operation_id", "validation_type"}
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        Operation.objects.filter(
+            pk__in={obj.operation_id for obj in objs}
+        ).refresh_from_validations()
+        return objs
+
+    bulk_create.alters_data = True
+
+    def update(self, **kwargs):
+        # bulk_update() goes through here too.
+        if not kwargs.keys() & self.TRACKED_FIELDS:
+            return super().update(**kwargs)
+        pks = list(self.values_list("pk", flat=True))
+        validations = OperationValidation.objects.filter(pk__in=pks)
+        operation_ids = set(validations.values_list("operation_id", flat=True))
+        rows = super().update(**kwargs)
+        operation_ids |= set(validations.values_list("operation_id", flat=True))
+        Operation.objects.filter(pk__in=operation_ids).refresh_from_validations()
+        return rows
+
+    update.alters_data = True
+
+
 class OperationValidation(models.Model):
     "Each operation should be validated, this is done by validating the operation against another event in the db"
 
@@ -123,6 +199,15 @@ class OperationValidation(models.Model):
         verbose_name=_("justification"),
     )
 
+    objects = OperationValidationQuerySet.as_manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets the signal handlers update the operation it is moved away from.
+        instance._loaded_operation_id = instance.__dict__.get("operation_id")
+        return instance
+
     def justification_link(self):
         if event := self.event:
             url_name = "admin:%s_%s_change" % (
@@ -140,6 +225,122 @@ class OperationValidation(models.Model):
         return f"{self.validation_type}-{self.get_validation_type_display()} {self.amount:,.2f}€"
 
 
+class ReconciliationSuggestion(models.Model):
+    """What an operation probably pays for, as read from its communication.
+
+    Filled in when bank statements are imported, see
+    :func:`accounts.matching.refresh_suggestions`.
+    """
+
+    class Kind(models.TextChoices):
+        REUNION = "reunion", _("réunion")
+        EXPENSE_REPORT = "expense_report", _("note de frais")
+        SIGNUP2026 = "signup2026", _("inscription 2026")
+        SIGNUP = "signup", _("inscription 2023")
+
+    operation = models.ForeignKey(
+        Operation, on_delete=models.CASCADE, related_name="suggestions"
+    )
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    target = GenericForeignKey()
+    label = models.CharField(max_length=255)
+    confidence = models.PositiveSmallIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ("operation", "-confidence")
+        indexes = [models.Index(fields=["content_type", "object_id"])]
+
+    def __str__(self):
+        return f"{self.operation_id} → {self.label} ({self.confidence}%)"
+
+
+def month_range(year, month):
+    start = date(year, month, 1)
+    end = date(year + month // 12, month % 12 + 1, 1)
+    return start, end
+
+
+class LedgerRollupQuerySet(models.QuerySet):
+    @staticmethod
+    def totals(validations):
+        """Sum ``validations`` by month of their operation and by type."""
+        return [
+            LedgerRollup(**row)
+            for row in validations.values(
+                "validation_type",
+                year=ExtractYear("operation__date"),
+                month=ExtractMonth("operation__date"),
+            )
+            .annotate(amount=Sum("amount"), count=Count("id"))
+            .order_by()
+        ]
+
+    def refresh_months(self, months):
+        """Recompute the rows of ``months``, an iterable of ``(year, month)``."""
+        months = set(months)
+        if not months:
+            return
+        validations = Q()
+        rollups = Q()
+        for year, month in months:
+            start, end = month_range(year, month)
+            validations |= Q(operation__date__gte=start, operation__date__lt=end)
+            rollups |= Q(year=year, month=month)
+        rows = self.totals(OperationValidation.objects.filter(validations))
+        with transaction.atomic():
+            self.filter(rollups).delete()
+            self.bulk_create(rows)
+
+    def rebuild(self):
+        """Recompute every row.
+
+        :return: the number of rows.
+        """
+        rows = self.totals(OperationValidation.objects.filter(operation__isnull=False))
+        with transaction.atomic():
+            self.all().delete()
+            self.bulk_create(rows)
+        return len(rows)
+
+
+class LedgerRollup(models.Model):
+    """Total of the validations of a month by type, dated by their operation.
+
+    Kept current by :meth:`OperationQuerySet.refresh_from_validations`.
+    """
+
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    validation_type = models.IntegerField(
+        choices=OperationValidation._meta.get_field("validation_type").choices,
+        null=True,
+        blank=True,
+        verbose_name=_("justification"),
+    )
+    amount = models.DecimalField(
+        max_digits=11, decimal_places=2, verbose_name=_("montant")
+    )
+    count = models.PositiveIntegerField()
+
+    objects = LedgerRollupQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["year", "month", "validation_type"],
+                name="unique_ledger_rollup",
+            )
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.year}-{self.month:02d} {self.validation_type} {self.amount:,.2f}€"
+        )
+
+
 def validate_iban(value):
     try:
         IBAN(value)
@@ -0,0 +1,190 @@
+"""Link incoming bank operations to the 2026 signups they pay for.
+
+A payment is spread over the participants of the signup that still owe
+something, in participant order; what is left over is recorded as a donation
+to the signup.
+
+:func:`plan_signup_payments` matches a batch of operations to signups from
+their reconciliation suggestions and amounts, without writing anything, so the
+plan can be shown first. :func:`apply_signup_payments` then stores the
+validations of the whole plan at once.
+"""
+
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Prefetch
+
+from accounts.models import (
+    IncomeChoices,
+    Operation,
+    OperationValidation,
+    ReconciliationSuggestion,
+)
+
+EXACT = "exact"
+PARTIAL = "partial"
+OVERPAID = "overpaid"
+NOTHING_DUE = "nothing due"
+CANCELLED = "cancelled"
+
+#: Only these are linked automatically, the others need a look.
+APPLIED_STATUSES = (EXACT, PARTIAL)
+
+
+def allocate(operation, signup, participants, amount=None, created_by=None):
+    """Spread ``amount`` (the operation amount by default) over ``participants``.
+
+    ``participants`` must be annotated with ``amount_due_remaining`` and
+    filtered on ``amount_due_remaining__gt=0``: it is ``None`` for the
+    participants whose amount was never calculated. It is decreased by what
+    they are allocated, so that several payments can be allocated to the same
+    signup in a row.
+
+    :return: the unsaved validations.
+    """
+    remaining = operation.amount if amount is None else amount
+    validations = []
+    for participant in participants:
+        if remaining <= 0:
+            break
+        if participant.amount_due_remaining <= 0:
+            continue
+        share = min(remaining, participant.amount_due_remaining)
+        validations.append(
+            OperationValidation(
+                operation=operation,
+                amount=share,
+                event=participant,
+                validation_type=IncomeChoices.SIGNUP,
+                created_by=created_by,
+            )
+        )
+        participant.amount_due_remaining -= share
+        remaining -= share
+    if remaining > 0:
+        validations.append(
+            OperationValidation(
+                operation=operation,
+                amount=remaining,
+                event=signup,
+                validation_type=IncomeChoices.DONATION,
+                created_by=created_by,
+            )
+        )
+    return validations
+
+
+@dataclass
+class Allocation:
+    operation: Operation
+    signup: object
+    status: str
+    due: Decimal
+    validations: list = field(default_factory=list)
+
+    @property
+    def applied(self):
+        return self.status in APPLIED_STATUSES
+
+
+def plan_signup_payments(operations, created_by=None):
+    """Match the unjustified incoming ``operations`` to 2026 signups.
+
+    Operations are matched through their ``signup2026`` suggestion and taken
+    in date order, each one reducing what the signup still owes for the next.
+
+    :return: a list of :class:`Allocation`.
+    """
+    from signup2026.models import Participant
+    from signup2026.models import Signup as Signup2026
+
+    operations = list(
+        operations.filter(amount__gt=0, justified__isnull=True)
+        .filter(
+            Exists(
+                ReconciliationSuggestion.objects.filter(
+                    operation=OuterRef("pk"),
+                    kind=ReconciliationSuggestion.Kind.SIGNUP2026,
+                )
+            )
+        )
+        .prefetch_related(
+            Prefetch(
+                "suggestions",
+                queryset=ReconciliationSuggestion.objects.filter(
+                    kind=ReconciliationSuggestion.Kind.SIGNUP2026
+                ),
+            )
+        )
+        .order_by("date", "number")
+    )
+    signup_ids = {
+        suggestion.object_id
+        for operation in operations
+        for suggestion in operation.suggestions.all()[:1]
+    }
+    signups = Signup2026.objects.prefetch_related(
+        Prefetch(
+            "participants_set",
+            queryset=Participant.objects.with_amounts()
+            .filter(amount_due_remaining__gt=0)
+            .order_by("id"),
+        )
+    ).in_bulk(signup_ids)
+
+    plan = []
+    for operation in operations:
+        [suggestion] = operation.suggestions.all()[:1]
+        signup = signups.get(suggestion.object_id)
+        if signup is None:
+            continue
+        participants = signup.participants_set.all()
+        due = sum((p.amount_due_remaining for p in participants), Decimal(0))
+        if signup.cancelled_at is not None:
+            status = CANCELLED
+        elif due <= 0:
+            status = NOTHING_DUE
+        elif operation.amount == due:
+            status = EXACT
+        elif operation.amount < due:
+            status = PARTIAL
+        else:
+            status = OVERPAID
+        allocation = Allocation(operation, signup, status, due)
+        if allocation.applied:
+            allocation.validations = allocate(
+                operation, signup, participants, created_by=created_by
+            )
+        plan.append(allocation)
+    return plan
+
+
+def apply_signup_payments(plan):
+    """Store the validations of the applied allocations of ``plan``.
+
+    Queues a payment confirmation for the signups the plan pays off.
+
+    :return: the list of allocations that were applied.
+    """
+    applied = [allocation for allocation in plan if allocation.applied]
+    with transaction.atomic():
+        OperationValidation.objects.bulk_create(
+            [
+                validation
+                for allocation in applied
+                for validation in allocation.validations
+            ]
+        )
+    paid_off = {
+        allocation.signup.pk: allocation.signup
+        for allocation in applied
+        if all(
+            participant.amount_due_remaining <= 0
+            for participant in allocation.signup.participants_set.all()
+        )
+    }
+    for signup in paid_off.values():
+        signup.send_payment_confirmation_mail()
+    return applied
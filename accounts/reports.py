@@ -0,0 +1,117 @@
+"""Comparative accounts over several years, read from the ledger rollups."""
+
+import csv
+from collections import defaultdict
+from decimal import Decimal
+
+from openpyxl import Workbook
+
+from accounts.models import ExpenditureChoices, IncomeChoices, LedgerRollup
+from dynasignup.mixins import Echo
+
+MONTHS = (
+    "janv.",
+    "févr.",
+    "mars",
+    "avr.",
+    "mai",
+    "juin",
+    "juil.",
+    "août",
+    "sept.",
+    "oct.",
+    "nov.",
+    "déc.",
+)
+
+
+class ComparativeReport:
+    """Totals by validation type for each year, or each month, of a range.
+
+    Rows are lists: the code, its label, one amount per period and the total
+    of the range. The charges come first, then the incomes, each followed by
+    their total. The amounts without validation type, then those of a type
+    that is not a choice anymore, come next, and the result comes last.
+    """
+
+    def __init__(self, first_year, last_year, by_month=False):
+        self.years = range(first_year, last_year + 1)
+        self.by_month = by_month
+        if by_month:
+            self.periods = [
+                (year, month) for year in self.years for month in range(1, 13)
+            ]
+        else:
+            self.periods = list(self.years)
+
+    def header(self):
+        if self.by_month:
+            labels = [f"{MONTHS[month - 1]} {year}" for year, month in self.periods]
+        else:
+            labels = [str(year) for year in self.periods]
+        return ["code", "libellé", *labels, "total"]
+
+    def totals(self):
+        """Amounts by validation type and by period."""
+        totals = defaultdict(lambda: defaultdict(Decimal))
+        for year, month, validation_type, amount in LedgerRollup.objects.filter(
+            year__gte=self.years.start, year__lt=self.years.stop
+        ).values_list("year", "month", "validation_type", "amount"):
+            period = (year, month) if self.by_month else year
+            totals[validation_type][period] += amount
+        return totals
+
+    def line(self, code, label, amounts):
+        amounts = [amounts.get(period, Decimal(0)) for period in self.periods]
+        return [code, label, *amounts, sum(amounts, Decimal(0))]
+
+    def rows(self):
+        totals = self.totals()
+        result = defaultdict(Decimal)
+        for choices, label in (
+            (ExpenditureChoices, "TOTAL DES CHARGES"),
+            (IncomeChoices, "TOTAL DES PRODUITS"),
+        ):
+            group = defaultdict(Decimal)
+            for code, description in choices.choices:
+                amounts = totals.pop(code, {})
+                for period, amount in amounts.items():
+                    group[period] += amount
+                yield self.line(code, description.upper(), amounts)
+            for period, amount in group.items():
+                result[period] += amount
+            yield self.line("", label, group)
+        # What is left has no validation type, or one that is not a choice.
+        unclassified = totals.pop(None, {})
+        others = defaultdict(Decimal)
+        for amounts in totals.values():
+            for period, amount in amounts.items():
+                others[period] += amount
+        for label, amounts in (("NON CLASSÉ", unclassified), ("AUTRES", others)):
+            if amounts:
+                for period, amount in amounts.items():
+                    result[period] += amount
+                yield self.line("", label, amounts)
+        yield self.line("", "BÉNÉFICE / PERTE", result)
+
+
+def iter_csv(report):
+    """Lines of ``report`` as CSV, one by one."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(report.header())
+    for row in report.rows():
+        yield writer.writerow(row)
+
+
+def write_xlsx(report, file):
+    """Write ``report`` to ``file`` row by row.
+
+    The workbook is opened in write-only mode, so rows are not kept in memory
+    once appended.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Comptes")
+    sheet.append(report.header())
+    for row in report.rows():
+        sheet.append(row)
+    workbook.save(file)
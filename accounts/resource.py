@@ -1,5 +1,7 @@
 from import_export import resources
+from import_export.results import RowResult
 
+from .matching import refresh_suggestions
 from .models import Operation
 
 
@@ -9,3 +11,18 @@ class OperationResource(resources.ModelResource):
         skip_unchanged = True
         report_skipped = False
         import_id_fields = ("account", "year", "number")
+
+    def after_import(self, dataset, result, **kwargs):
+        super().after_import(dataset, result, **kwargs)
+        if self._is_dry_run(kwargs):
+            return
+        imported = [
+            row.object_id
+            for row in result.rows
+            if row.import_type
+            in (RowResult.IMPORT_TYPE_NEW, RowResult.IMPORT_TYPE_UPDATE)
+        ]
+        if imported:
+            operations = Operation.objects.filter(pk__in=imported)
+            operations.refresh_from_validations()
+            refresh_suggestions(operations)
@@ -0,0 +1,50 @@
+"""Keep ``Operation.justified_amount``, ``Operation.justified`` and the
+ledger rollups current.
+
+Bulk writes go through :class:`accounts.models.OperationValidationQuerySet`,
+which refreshes the operations itself. The rollups are dated by the operation,
+so they are also refreshed when an operation is deleted or changes date.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from accounts.models import LedgerRollup, Operation, OperationValidation
+
+
+@receiver(post_save, sender=OperationValidation)
+@receiver(post_delete, sender=OperationValidation)
+def refresh_operation_justification(sender, instance, **kwargs):
+    operation_ids = {
+        instance.operation_id,
+        getattr(instance, "_loaded_operation_id", None),
+    } - {None}
+    if operation_ids:
+        Operation.objects.filter(pk__in=operation_ids).refresh_from_validations()
+    instance._loaded_operation_id = instance.operation_id
+
+
+@receiver(pre_save, sender=Operation)
+def remember_operation_date(sender, instance, raw=False, **kwargs):
+    if instance.pk is not None and not raw:
+        instance._stored_date = (
+            Operation.objects.filter(pk=instance.pk)
+            .values_list("date", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Operation)
+def refresh_rollups_of_moved_operation(sender, instance, **kwargs):
+    stored_date = getattr(instance, "_stored_date", None)
+    if stored_date is not None and stored_date != instance.date:
+        LedgerRollup.objects.refresh_months(
+            (date.year, date.month) for date in (stored_date, instance.date)
+        )
+    instance._stored_date = instance.date
+
+
+@receiver(post_delete, sender=Operation)
+def refresh_rollups_of_deleted_operation(sender, instance, **kwargs):
+    # Its validations are gone already: they cannot point at the month anymore.
+    LedgerRollup.objects.refresh_months([(instance.date.year, instance.date.month)])
@@ -1,7 +1,12 @@
 from django.urls import path
 
-from .views import AnnualAccountsView
+from .views import AnnualAccountsView, ComparativeAccountsView
 
 urlpatterns = [
     path("annual/<int:year>/", AnnualAccountsView.as_view(), name="annual_accounts"),
+    path(
+        "comparative/<int:first_year>/<int:last_year>/",
+        ComparativeAccountsView.as_view(),
+        name="comparative_accounts",
+    ),
 ]
@@ -1,17 +1,20 @@
 # Create your views here.
 import datetime
+import tempfile
 
 from django.contrib.auth.mixins import PermissionRequiredMixin
-from django.db.models import BooleanField, ExpressionWrapper, F, Q, Sum
-from django.db.models.functions import Round
+from django.db.models import Q, Sum
+from django.http import FileResponse, HttpResponseBadRequest, StreamingHttpResponse
 from django.views.generic import TemplateView
 
+from accounts.forms import ComparativeReportForm
 from accounts.models import (
     ExpenditureChoices,
     IncomeChoices,
+    LedgerRollup,
     Operation,
-    OperationValidation,
 )
+from accounts.reports import ComparativeReport, iter_csv, write_xlsx
 
 
 class AnnualAccountsView(PermissionRequiredMixin, TemplateView):
@@ -26,10 +29,7 @@ class AnnualAccountsView(PermissionRequiredMixin, TemplateView):
 
         movement_details = {
             validation_type: total
-            for validation_type, total in OperationValidation.objects.filter(
-                operation__date__gte=start_date,
-                operation__date__lt=end_date,
-            )
+            for validation_type, total in LedgerRollup.objects.filter(year=year)
             .values("validation_type")
             .annotate(year_sum=Sum("amount"))
             .values_list("validation_type", "year_sum")
@@ -70,26 +70,14 @@ class AnnualAccountsView(PermissionRequiredMixin, TemplateView):
         kwargs["incomes"] = incomes
         kwargs["total_incomes"] = sum((_["sum"] for _ in incomes.values()))
 
-        pending_operations = (
-            Operation.objects.alias(
-                _justified_amount=Round(
-                    Sum("operationvalidation__amount") - F("amount"), 2
-                )
-            )
-            .annotate(
-                _justified_amount=F("_justified_amount"),
-                _justified=ExpressionWrapper(
-                    Q(_justified_amount__exact=0), output_field=BooleanField()
-                ),
-            )
-            .filter(date__gte=start_date, date__lt=end_date, _justified__isnull=True)
+        pending = Operation.objects.filter(
+            date__gte=start_date, date__lt=end_date, justified__isnull=True
+        ).aggregate(
+            positive=Sum("amount", filter=Q(amount__gt=0)),
+            negative=Sum("amount", filter=Q(amount__lt=0)),
         )
-        kwargs["positive_pending_transactions"] = pending_operations.filter(
-            amount__gt=0
-        ).aggregate(total=Sum("amount"))["total"]
-        kwargs["negative_pending_transactions"] = pending_operations.filter(
-            amount__lt=0
-        ).aggregate(total=Sum("amount"))["total"]
+        kwargs["positive_pending_transactions"] = pending["positive"]
+        kwargs["negative_pending_transactions"] = pending["negative"]
         kwargs["total"] = kwargs["total_incomes"] + kwargs["total_spends"]
         kwargs["year"] = year
         # Display period as 01/01/<year> → 31/12/<year>
@@ -98,3 +86,55 @@ class AnnualAccountsView(PermissionRequiredMixin, TemplateView):
             f"{start_date.strftime('%d/%m/%Y')} → {period_end_display.strftime('%d/%m/%Y')}"
         )
         return kwargs
+
+
+class ComparativeAccountsView(PermissionRequiredMixin, TemplateView):
+    """Totals by code from ``first_year`` to ``last_year``, per year or per month.
+
+    ``?format=csv`` and ``?format=xlsx`` download the report instead.
+    """
+
+    permission_required = "is_superuser"
+    template_name = "comparative_accounts.html"
+
+    def get_report(self):
+        data = self.form.cleaned_data
+        return ComparativeReport(
+            data["first_year"], data["last_year"], by_month=data["period"] == "month"
+        )
+
+    def get(self, request, *args, **kwargs):
+        self.form = ComparativeReportForm(
+            {
+                "first_year": self.kwargs["first_year"],
+                "last_year": self.kwargs["last_year"],
+                "period": request.GET.get("period", ""),
+            }
+        )
+        if not self.form.is_valid():
+            return HttpResponseBadRequest(self.form.errors.as_text())
+        export_format = request.GET.get("format")
+        filename = (
+            f"comptes_{self.kwargs['first_year']}_{self.kwargs['last_year']}"
+            f".{export_format}"
+        )
+        if export_format == "csv":
+            return StreamingHttpResponse(
+                iter_csv(self.get_report()),
+                content_type="text/csv",
+                headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+            )
+        if export_format == "xlsx":
+            file = tempfile.TemporaryFile()
+            write_xlsx(self.get_report(), file)
+            file.seek(0)
+            return FileResponse(file, as_attachment=True, filename=filename)
+        return super().get(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        kwargs = super().get_context_data(**kwargs)
+        report = self.get_report()
+        kwargs["report"] = report
+        kwargs["header"] = report.header()
+        kwargs["rows"] = report.rows()
+        return kwargs
@@ -0,0 +1,83 @@
+"""SQLite backend tuned for concurrent writers behind gunicorn.
+
+Compared to Django's backend:
+
+- connections use WAL journaling, ``synchronous=NORMAL`` and a busy timeout,
+  so readers never wait for a writer and writers wait for each other inside
+  SQLite instead of failing at once;
+- transactions start with ``BEGIN IMMEDIATE``: the write lock is taken up
+  front, so a transaction cannot fail half-way when it upgrades from a read
+  to a write lock;
+- when the lock cannot be taken within the busy timeout, ``BEGIN`` and the
+  other statements run in autocommit are retried with a jittered backoff.
+  Nothing has been written at that point, so retrying is safe.
+
+Retries are logged and counted in :data:`lock_retries`.
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import Counter
+
+from django.db.backends.sqlite3 import base
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+RETRY_DELAY = 0.05  # seconds, doubled on each attempt
+
+lock_retries = Counter()
+_lock_retries_lock = threading.Lock()
+
+
+def is_locked_error(exc):
+    return "database is locked" in str(exc) or "database table is locked" in str(exc)
+
+
+def retry_when_locked(operation, what):
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            return operation()
+        except base.Database.OperationalError as exc:
+            if attempt == MAX_ATTEMPTS or not is_locked_error(exc):
+                raise
+            with _lock_retries_lock:
+                lock_retries[what] += 1
+            delay = random.uniform(0, RETRY_DELAY * 2**attempt)
+            logger.warning(
+                "Database locked on %s, retry %d in %.3fs", what, attempt, delay
+            )
+            time.sleep(delay)
+
+
+class SQLiteCursorWrapper(base.SQLiteCursorWrapper):
+    def execute(self, query, params=None):
+        if self.connection.in_transaction:
+            return super().execute(query, params)
+        return retry_when_locked(
+            lambda: super(SQLiteCursorWrapper, self).execute(query, params),
+            "begin" if query.startswith("BEGIN") else "autocommit",
+        )
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    busy_timeout = 5  # seconds, unless set in OPTIONS["timeout"]
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        kwargs.setdefault("timeout", self.busy_timeout)
+        if self.transaction_mode is None:
+            self.transaction_mode = "IMMEDIATE"
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        if not self.is_in_memory_db():
+            conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    def create_cursor(self, name=None):
+        return self.connection.cursor(factory=SQLiteCursorWrapper)
@@ -0,0 +1,105 @@
+"""Price of the participants of a Dynamobile edition.
+
+``settings.DYNAMOBILE_PRICES`` lists the age bands as
+``(min_age, max_age, all_days_price, upfront_price)``. A participant signed
+up for every day pays ``upfront_price + all_days_price``, a partial signup
+pays ``all_days_price / 8`` per day on top of the upfront price. Children
+(under 18) get 25 % off for the second child of the group and 50 % off from
+the third one on.
+
+Prices are exact ``Decimal`` amounts rounded to the cent. They only depend on
+the age band, the number of days and the rank of the child, so each
+combination is computed once and memoised.
+"""
+
+from bisect import bisect_right
+from decimal import ROUND_HALF_UP, Decimal
+from functools import lru_cache
+from typing import NamedTuple
+
+from django.conf import settings
+
+CENT = Decimal("0.01")
+PRICED_DAYS = 8
+ADULT_AGE = 18
+CHILD_REDUCTIONS = (Decimal("0"), Decimal("0.25"), Decimal("0.50"))
+
+
+class Price(NamedTuple):
+    amount: Decimal
+    explanation: str
+
+
+class PriceBand(NamedTuple):
+    min_age: int
+    max_age: int
+    all_days_price: Decimal
+    upfront_price: Decimal
+
+
+@lru_cache
+def compile_price_table(prices):
+    """Sort the bands of ``prices`` for :func:`find_band`."""
+    bands = sorted(
+        PriceBand(min_age, max_age, Decimal(all_days_price), Decimal(upfront_price))
+        for min_age, max_age, all_days_price, upfront_price in prices
+    )
+    return [band.min_age for band in bands], bands
+
+
+def find_band(age, prices=None):
+    min_ages, bands = compile_price_table(prices or settings.DYNAMOBILE_PRICES)
+    index = bisect_right(min_ages, age) - 1
+    if index < 0 or age >= bands[index].max_age:
+        raise ValueError(f"Aucune tranche de prix pour l'âge {age}")
+    return bands[index]
+
+
+@lru_cache(maxsize=4096)
+def band_price(band, nb_days, complete, child_rank):
+    """Price for a participant of ``band``.
+
+    ``child_rank`` is the 0-based rank of the child in the group, ``None``
+    for adults.
+    """
+    if complete:
+        price = band.upfront_price + band.all_days_price
+        explanation = f"(totalité) {band.upfront_price} + {band.all_days_price} "
+    else:
+        price = band.upfront_price + band.all_days_price / PRICED_DAYS * nb_days
+        explanation = (
+            f"(partiel) {band.upfront_price} + {band.all_days_price} "
+            f"/ {PRICED_DAYS} * {nb_days} "
+        )
+    if child_rank is not None:
+        reduction = CHILD_REDUCTIONS[min(child_rank, len(CHILD_REDUCTIONS) - 1)]
+        price *= 1 - reduction
+        explanation += f"enfant {child_rank + 1} réduction {reduction:.0%} "
+    price = price.quantize(CENT, rounding=ROUND_HALF_UP)
+    return Price(price, f"{explanation}= {price}€")
+
+
+def price_participants(participants):
+    """Price ``participants``, which must be ordered by birthday.
+
+    Works with the participants of any edition: they provide
+    ``age_at_dynamobile_end()``, ``complete_signup()`` and ``nb_of_days()``.
+
+    :return: a list of ``(participant, Price)``.
+    """
+    priced = []
+    child_rank = 0
+    for participant in participants:
+        age = participant.age_at_dynamobile_end()
+        try:
+            band = find_band(age)
+        except ValueError as exc:
+            raise ValueError(f"{exc} ({participant})") from exc
+        rank = None
+        if age < ADULT_AGE:
+            rank = child_rank
+            child_rank += 1
+        complete = bool(participant.complete_signup())
+        nb_days = 0 if complete else participant.nb_of_days()
+        priced.append((participant, band_price(band, nb_days, complete, rank)))
+    return priced
@@ -138,7 +138,7 @@ WSGI_APPLICATION = "dynasignup.wsgi.application"
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
+        "ENGINE": "dynasignup.db.backends.sqlite3",
         "NAME": BASE_DIR / "data" / "db.sqlite3",
     }
 }
@@ -214,11 +214,28 @@ LOCALE_PATHS = [BASE_DIR / "locale"]
 
 SESSION_ENGINE = "django.contrib.sessions.backends.signed_cookies"
 
+# Shared between the gunicorn workers: the home page, the kitchen counts and
+# the parsed bank statements.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / "data" / "cache",
+    }
+}
+
 brussels_tz = zoneinfo.ZoneInfo("Europe/Brussels")
 
 DYNAMOBILE_START_SIGNUP = parse_datetime(
     config("DYNAMOBILE_START_SIGNUP", default="2026-04-22 20:00:00")
 ).replace(tzinfo=brussels_tz)
+# Waiting room in front of the signup forms when the signup opens: tickets are
+# admitted at this rate (per minute) during the given number of minutes.
+DYNAMOBILE_ADMISSIONS_PER_MINUTE = config(
+    "DYNAMOBILE_ADMISSIONS_PER_MINUTE", default=30, cast=int
+)
+DYNAMOBILE_WAITING_ROOM_DURATION = timedelta(
+    minutes=config("DYNAMOBILE_WAITING_ROOM_MINUTES", default=60, cast=int)
+)
 DYNAMOBILE_START_PARTIAL_SIGNUP = parse_datetime("2026-05-22 17:00:00").replace(
     tzinfo=brussels_tz
 )
@@ -244,6 +261,8 @@ DYNAMOBILE_MAX_PARTICIPANTS = config(
 DYNAMOBILE_MAX_VAE_PARTICIPANTS = config(
     "DYNAMOBILE_MAX_VAE_PARTICIPANTS", default=20, cast=int
 )
+# The kitchen cannot serve more than 120 eaters (6 years and older) a day.
+DYNAMOBILE_MAX_EATERS = config("DYNAMOBILE_MAX_EATERS", default=120, cast=int)
 
 DYNAMOBILE_PRICES = (
     (0, 2, 0, 0),
@@ -8,10 +8,10 @@ from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
 from django_object_actions import DjangoObjectActions, action
 from import_export import resources
-from import_export.admin import ExportMixin
 from import_export.fields import Field
 
 from accounts.models import OperationValidation
+from dynasignup.mixins import StreamingCSVExportMixin
 from signup2026.models import Signup as Signup2026
 
 from .models import (
@@ -282,7 +282,7 @@ class ParticipantResource(resources.ModelResource):
         )
 
 
-class ParticipantAmin(ExportMixin, CanBePayedAdminMixin, admin.ModelAdmin):
+class ParticipantAmin(StreamingCSVExportMixin, CanBePayedAdminMixin, admin.ModelAdmin):
     list_display = (
         "id",
         "first_name",
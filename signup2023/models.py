@@ -14,6 +14,7 @@ from django.utils.translation import gettext_lazy as _
 from phonenumber_field.modelfields import PhoneNumberField
 
 from accounts.models import OperationValidation
+from dynasignup import pricing
 
 
 class Signup(models.Model):
@@ -390,45 +391,14 @@ class Bill(models.Model):
 
     def calculate_amount_and_explain(self):
         description = ""
-        child_nb = 0
-        total_price = 0
-        for participant in self.signup.participants_set.all().order_by("birthday"):
-            age = participant.age_at_dynamobile_end()
+        total_price = decimal.Decimal(0)
+        participants = self.signup.participants_set.all().order_by("birthday")
+        for participant, price in pricing.price_participants(participants):
             description += (
                 f"prix pour {participant.first_name} {participant.last_name}: "
+                f"{price.explanation}\n"
             )
-            for (
-                min_age,
-                max_age,
-                all_days_price,
-                upfront_price,
-            ) in settings.DYNAMOBILE_PRICES:
-                if min_age <= age < max_age:
-                    if participant.complete_signup():
-                        price = upfront_price + all_days_price
-                        description += f"(totalité) {upfront_price} + {all_days_price} "
-                    else:
-                        nb_days = participant.nb_of_days()
-                        price = upfront_price + (all_days_price / 8 * nb_days)
-                        description += f"(partiel) {upfront_price} + {all_days_price} / 8 * {nb_days} "
-
-                    if age < 18:
-                        child_reduction = 0
-                        if child_nb == 1:
-                            child_reduction = 0.25
-                        elif child_nb >= 2:
-                            child_reduction = 0.50
-                        price *= 1 - child_reduction
-                        child_nb += 1
-                        description += (
-                            f"enfant {child_nb} réduction {child_reduction:.0%} "
-                        )
-
-                    total_price += price
-                    description += f"        = {price:.2f}€\n"
-                    break
-            else:
-                raise Exception("Apparently participant is older than 999.")
+            total_price += price.amount
         description += f"total: {total_price:.2f}€"
         self.calculation = description
         self.calculated_amount = total_price
@@ -3,26 +3,41 @@ from django.contrib import admin, messages
 from django.contrib.admin import SimpleListFilter
 from django.contrib.contenttypes.admin import GenericTabularInline
 from django.contrib.contenttypes.forms import BaseGenericInlineFormSet
-from django.core.mail import send_mail
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import PermissionDenied
+from django.db import transaction
 from django.db.models import Q
 from django.forms.models import BaseModelFormSet
-from django.shortcuts import redirect
+from django.http import FileResponse, Http404
+from django.shortcuts import get_object_or_404, redirect
 from django.template.loader import get_template
+from django.template.response import TemplateResponse
 from django.urls import path, reverse
 from django.utils.safestring import mark_safe
-from django.utils.timezone import localdate
+from django.utils.timezone import localdate, now
 from django_object_actions import action
 from import_export import resources
-from import_export.admin import ExportMixin
+from import_export.formats.base_formats import XLSX
 from import_export.resources import ModelResource
 
 from accounts.models import OperationValidation
+from dynasignup.mixins import StreamingCSVExportMixin
 from reunion.admin import (
     SignupAminMixin,
 )
 
+from . import export_jobs
 from .admin_views import SyncMailingListFormView
-from .models import ExtraParticipantInfo, Participant, Signup, WaitingListParticipant
+from .models import (
+    DAYS,
+    ExportJob,
+    ExtraParticipantInfo,
+    Participant,
+    QueuedMail,
+    SeatLedger,
+    Signup,
+    WaitingListParticipant,
+)
 
 
 class _PassthroughFormSet(BaseGenericInlineFormSet):
@@ -56,7 +71,7 @@ class _PassthroughFormSet(BaseGenericInlineFormSet):
 def waiting_list(modeladmin, request, queryset):
     for el in queryset:
         if el.signup_group.on_hold_at:
-            send_mail(
+            QueuedMail.objects.queue(
                 subject="Dynamobile place sur la liste d'attente",
                 message=get_template("signup/email/waiting_list.txt").render(),
                 from_email=settings.EMAIL_HOST_USER,
@@ -162,9 +177,18 @@ class ParticipantDaysInline(admin.TabularInline):
     )
 
 
+@admin.action(description="Recalculer les montants")
+def recalculate_signup_amounts(modeladmin, request, queryset):
+    count = Signup.objects.filter(pk__in=queryset.values("pk")).calculate_amounts()
+    modeladmin.message_user(
+        request, f"Montants recalculés pour {count} inscription(s)."
+    )
+
+
 @admin.register(Signup)
 class SignupAdmin(SignupAminMixin, admin.ModelAdmin):
     inlines = [ParticipantInfoInline, ParticipantDaysInline, SignupPaymentsInline]
+    actions = [recalculate_signup_amounts]
 
     change_actions = (
         "validate",
@@ -176,8 +200,10 @@ class SignupAdmin(SignupAminMixin, admin.ModelAdmin):
     )
 
     def validate(self, request, obj):
-        obj.validated_at = localdate()
-        obj.calculate_amounts()
+        with transaction.atomic():
+            obj.validated_at = localdate()
+            obj.calculate_amounts()
+            SeatLedger.rebuild(obj.year)
         self.message_user(request, "Amounts calculated and signup validated.")
 
     def get_change_actions(self, request, object_id, form_url):
@@ -195,6 +221,31 @@ class SignupAdmin(SignupAminMixin, admin.ModelAdmin):
         messages.success(request, f"Payment confirmation sent to {signup.owner.email}.")
         return redirect("admin:signup2026_signup_change", signup.id)
 
+    @action(description="validate")
+    def validate_signup(self, request, signup):
+        with transaction.atomic():
+            response = super().validate_signup(request, signup)
+            SeatLedger.rebuild(signup.year)
+        return response
+
+    @action(description="cancel signup")
+    def cancel_signup(self, request, signup):
+        with transaction.atomic():
+            response = super().cancel_signup(request, signup)
+            SeatLedger.rebuild(signup.year)
+        return response
+
+    @action(description="Put signup on hold")
+    def put_on_hold_signup(self, request, signup):
+        with transaction.atomic():
+            response = super().put_on_hold_signup(request, signup)
+            SeatLedger.rebuild(signup.year)
+        return response
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        SeatLedger.rebuild(form.instance.year)
+
     def get_queryset(self, request):
         return super().get_queryset(request).with_amounts()
 
@@ -266,8 +317,8 @@ class SignupDayFilter(SimpleListFilter):
         ]
 
     def queryset(self, request, queryset):
-        if self.value():
-            return queryset.distinct().filter(**{self.value(): True})
+        if self.value() in DAYS:
+            return queryset.attending(DAYS.index(self.value()) + 1)
 
 
 class ParticipantPayedFilter(SimpleListFilter):
@@ -288,13 +339,51 @@ class ParticipantPayedFilter(SimpleListFilter):
         return queryset
 
 
+class BackgroundXLSXExportMixin(StreamingCSVExportMixin):
+    """Render XLSX exports in the background, see :mod:`signup2026.export_jobs`.
+
+    The export redirects to the status page of the job, which is reused while
+    the exported data does not change. Exports of a selection from the action
+    menu stay synchronous.
+    """
+
+    def _do_file_export(self, file_format, request, queryset, export_form=None):
+        if not isinstance(file_format, XLSX) or (
+            export_form is not None and "export_items" in export_form.changed_data
+        ):
+            return super()._do_file_export(
+                file_format, request, queryset, export_form=export_form
+            )
+        if not self.has_export_permission(request):
+            raise PermissionDenied
+
+        content_type = ContentType.objects.get_for_model(self.model)
+        resource = self.get_resource_index(export_form)
+        export_fields = self.get_export_resource_fields_from_form(export_form) or []
+        query = request.GET.urlencode()
+        key = export_jobs.job_key(
+            content_type, resource, export_fields, query, request.user
+        )
+        job = ExportJob.objects.reusable(key)
+        if job is None:
+            job = ExportJob.objects.create(
+                key=key,
+                content_type=content_type,
+                resource=resource,
+                export_fields=export_fields,
+                query=query,
+                created_by=request.user,
+            )
+        return redirect("admin:signup2026_exportjob_status", job.pk)
+
+
 class ParticipantResource(resources.ModelResource):
     class Meta:
         model = Participant
 
 
 @admin.register(Participant)
-class ParticipantAdmin(ExportMixin, admin.ModelAdmin):
+class ParticipantAdmin(BackgroundXLSXExportMixin, admin.ModelAdmin):
     resource_class = ParticipantResource
     import_export_change_list_template = "admin/signups/participant_changelist.html"
 
@@ -344,8 +433,9 @@ class ParticipantAdmin(ExportMixin, admin.ModelAdmin):
     )
     fields = []
 
+    @admin.display(description="Age", ordering="age")
     def age(self, obj: Participant):
-        return obj.age_at_dynamobile_end()
+        return obj.age
 
     @admin.display(boolean=True, description="Payé", ordering="amount_due_remaining")
     def is_payed(self, obj: Participant):
@@ -372,7 +462,9 @@ class ParticipantAdmin(ExportMixin, admin.ModelAdmin):
             super()
             .get_queryset(request)
             .filter(signup_group__year=settings.DYNAMOBILE_LAST_DAY.year)
+            .select_related("signup_group__owner")
             .with_amounts()
+            .with_age()
         )
 
 
@@ -402,17 +494,18 @@ class ExtraInfoRessource(ModelResource):
 @admin.action(description="Débloquer le(s) participant(s)")
 def unblock_participant(modeladmin, request, queryset):
     signups_done = set()
+    years = set()
     for participant in queryset.select_related("signup_group__owner"):
         signup = participant.signup_group
         if signup.id in signups_done:
             continue
         signups_done.add(signup.id)
+        years.add(signup.year)
         signup.on_hold_at = None
         signup.on_hold_vae = False
         signup.on_hold_partial = False
         signup.save()
-        signup.calculate_amounts()
-        send_mail(
+        QueuedMail.objects.queue(
             subject="Votre inscription à Dynamobile",
             message=get_template("signup2026/email/unblock_waitinglist.txt").render(
                 {"signup": signup}
@@ -423,6 +516,9 @@ def unblock_participant(modeladmin, request, queryset):
                 "signup2026/email/unblock_waitinglist.html"
             ).render({"signup": signup}),
         )
+    Signup.objects.filter(pk__in=signups_done).calculate_amounts()
+    for year in years:
+        SeatLedger.rebuild(year)
     modeladmin.message_user(
         request, f"{len(signups_done)} inscription(s) débloquée(s)."
     )
@@ -447,7 +543,7 @@ class WaitingListParticipantAdmin(admin.ModelAdmin):
         "day8",
         "day9",
     )
-    ordering = ()
+    ordering = ("signup_group__waiting_number",)
 
     def get_queryset(self, request):
         return (
@@ -462,9 +558,9 @@ class WaitingListParticipantAdmin(admin.ModelAdmin):
             .select_related("signup_group")
         )
 
-    @admin.display(description="N° d'attente")
+    @admin.display(description="N° d'attente", ordering="signup_group__waiting_number")
     def waiting_number(self, obj):
-        return obj.signup_group.waiting_number()
+        return obj.signup_group.waiting_number
 
     @admin.display(description="Raison")
     def on_hold_reason(self, obj):
@@ -477,7 +573,7 @@ class WaitingListParticipantAdmin(admin.ModelAdmin):
 
 
 @admin.register(ExtraParticipantInfo)
-class ExtraParticipantInfoAdmin(ExportMixin, admin.ModelAdmin):
+class ExtraParticipantInfoAdmin(BackgroundXLSXExportMixin, admin.ModelAdmin):
     resource_classes = [ExtraInfoRessource]
 
     list_display = (
@@ -498,3 +594,127 @@ class ExtraParticipantInfoAdmin(ExportMixin, admin.ModelAdmin):
         "tandem_pilot",
         "comments",
     )
+
+
+@admin.action(description="Renvoyer le(s) e-mail(s)")
+def retry_queued_mail(modeladmin, request, queryset):
+    count = queryset.filter(sent_at__isnull=True).update(
+        attempts=0, failed_at=None, next_attempt_at=now()
+    )
+    modeladmin.message_user(request, f"{count} e-mail(s) remis en file d'attente.")
+
+
+@admin.register(QueuedMail)
+class QueuedMailAdmin(admin.ModelAdmin):
+    actions = [retry_queued_mail]
+    list_display = (
+        "id",
+        "subject",
+        "recipient_list",
+        "created_at",
+        "attempts",
+        "next_attempt_at",
+        "sent_at",
+        "failed_at",
+    )
+    list_filter = (
+        ("sent_at", admin.EmptyFieldListFilter),
+        ("failed_at", admin.EmptyFieldListFilter),
+    )
+    search_fields = ("subject", "recipient_list")
+    readonly_fields = (
+        "subject",
+        "message",
+        "html_message",
+        "from_email",
+        "recipient_list",
+        "created_at",
+        "attempts",
+        "last_error",
+        "sent_at",
+        "failed_at",
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "content_type",
+        "created_by",
+        "created_at",
+        "status",
+        "progress",
+        "total",
+        "outdated",
+    )
+    list_filter = ("status", "content_type")
+    readonly_fields = (
+        "key",
+        "content_type",
+        "resource",
+        "export_fields",
+        "query",
+        "created_by",
+        "status",
+        "progress",
+        "total",
+        "file",
+        "error",
+        "outdated",
+        "created_at",
+        "started_at",
+        "finished_at",
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                "<int:pk>/status/",
+                self.admin_site.admin_view(self.status_view),
+                name="signup2026_exportjob_status",
+            ),
+            path(
+                "<int:pk>/download/",
+                self.admin_site.admin_view(self.download_view),
+                name="signup2026_exportjob_download",
+            ),
+        ] + super().get_urls()
+
+    def has_job_permission(self, request, job):
+        """Whether ``request`` may export what ``job`` exports."""
+        model_admin = self.admin_site._registry.get(job.content_type.model_class())
+        return model_admin is not None and model_admin.has_export_permission(request)
+
+    def status_view(self, request, pk):
+        job = get_object_or_404(ExportJob, pk=pk)
+        if not self.has_job_permission(request, job):
+            raise PermissionDenied
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": f"Export {job.content_type.name}",
+            "job": job,
+            "finished": job.status in (ExportJob.Status.DONE, ExportJob.Status.FAILED),
+        }
+        return TemplateResponse(
+            request, "admin/signup2026/exportjob/status.html", context
+        )
+
+    def download_view(self, request, pk):
+        job = get_object_or_404(ExportJob, pk=pk, status=ExportJob.Status.DONE)
+        if not self.has_job_permission(request, job):
+            raise PermissionDenied
+        if not job.file:
+            raise Http404
+        return FileResponse(
+            job.file.open("rb"),
+            as_attachment=True,
+            filename=job.file.name.rsplit("/", 1)[-1],
+        )
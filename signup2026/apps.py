@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class Signup2026Config(AppConfig):
     name = "signup2026"
+
+    def ready(self):
+        from signup2026 import signals  # noqa: F401
@@ -0,0 +1,90 @@
+"""XLSX exports of the admin, rendered in the background.
+
+The admin records an :class:`~signup2026.models.ExportJob` instead of
+building the workbook while the request waits, and the ``run_export_jobs``
+worker renders it. The workbook is written row by row in write-only mode to
+``MEDIA_ROOT/exports``, and the progress is saved every ``chunk_size`` rows.
+"""
+
+import hashlib
+import json
+import tempfile
+
+from django.contrib import admin
+from django.core.files import File
+from django.test import RequestFactory
+from django.utils import timezone
+from openpyxl import Workbook
+
+from .models import ExportJob
+
+
+def job_key(content_type, resource, export_fields, query, user):
+    """What is exported, for whom: the queryset may depend on the user."""
+    data = [content_type.pk, resource, sorted(export_fields), query, user.pk]
+    return hashlib.sha256(json.dumps(data).encode()).hexdigest()
+
+
+def export_request(job):
+    """Changelist request of the job's author, to get the exported queryset."""
+    request = RequestFactory().get(f"/?{job.query}")
+    request.user = job.created_by
+    return request
+
+
+def write_workbook(job, file, chunk_size=500):
+    model = job.content_type.model_class()
+    model_admin = admin.site._registry[model]
+    request = export_request(job)
+    resource_class = model_admin.get_export_resource_classes(request)[job.resource]
+    resource = resource_class(**model_admin.get_export_resource_kwargs(request))
+    selected_fields = job.export_fields or None
+    queryset = model_admin.get_streaming_export_queryset(
+        resource.filter_export(model_admin.get_export_queryset(request)),
+        resource.get_export_fields(selected_fields),
+    )
+    job.total = queryset.count()
+    job.save(update_fields=["total"])
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(model._meta.verbose_name_plural[:31])
+    sheet.append(resource.get_export_headers(selected_fields=selected_fields))
+    for count, instance in enumerate(queryset.iterator(chunk_size=chunk_size), 1):
+        sheet.append(
+            resource.export_resource(
+                instance, selected_fields=selected_fields, force_native_type=True
+            )
+        )
+        if count % chunk_size == 0:
+            ExportJob.objects.filter(pk=job.pk).update(progress=count)
+    job.progress = job.total
+    workbook.save(file)
+
+
+def run(job, chunk_size=500):
+    """Render ``job``, claimed by :meth:`ExportJobQuerySet.claim`."""
+    try:
+        with tempfile.TemporaryFile() as file:
+            write_workbook(job, file, chunk_size=chunk_size)
+            file.seek(0)
+            name = f"{job.content_type.model}-{timezone.localdate():%Y-%m-%d}.xlsx"
+            job.file.save(name, File(file), save=False)
+    except Exception as exc:
+        job.status = ExportJob.Status.FAILED
+        job.error = repr(exc)
+    else:
+        job.status = ExportJob.Status.DONE
+    job.finished_at = timezone.now()
+    # Leave ``outdated`` alone: the data may have changed while rendering.
+    job.save(
+        update_fields=["status", "error", "file", "progress", "total", "finished_at"]
+    )
+    if job.status == ExportJob.Status.DONE:
+        # Older exports of the same data are not offered anymore.
+        for old in ExportJob.objects.filter(
+            key=job.key,
+            status__in=[ExportJob.Status.DONE, ExportJob.Status.FAILED],
+        ).exclude(pk=job.pk):
+            old.file.delete(save=False)
+            old.delete()
+    return job
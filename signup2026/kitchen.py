@@ -0,0 +1,64 @@
+"""Cached counts of the kitchen, keyed by a data version.
+
+The data version is a random token kept in the cache. It is dropped whenever
+a participant or a signup changes (see :mod:`signup2026.signals`), and
+expires after ``VERSION_SECONDS`` for the writes that do not send signals,
+like ``update()``. The counts are cached under the current version, which
+doubles as ``ETag`` of the meal forecast.
+"""
+
+import secrets
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Participant
+
+VERSION_KEY = "signup2026:kitchen:version"
+VERSION_SECONDS = 10 * 60
+
+
+def data_version():
+    """Current data version, a new one if there is none yet."""
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, secrets.token_hex(8), VERSION_SECONDS)
+        # Another worker may have added its own version first.
+        version = cache.get(VERSION_KEY) or secrets.token_hex(8)
+    return version
+
+
+def invalidate():
+    cache.delete(VERSION_KEY)
+
+
+def counts(version=None):
+    """:meth:`ParticipantQuerySet.kitchen_counts`, cached under ``version``."""
+    key = f"signup2026:kitchen:{version or data_version()}"
+    result = cache.get(key)
+    if result is None:
+        result = Participant.objects.kitchen_counts()
+        cache.set(key, result, VERSION_SECONDS)
+    return result
+
+
+def forecast(version=None):
+    """Meals to plan per day, by age band, with the daily limit."""
+    result = counts(version)
+    max_eaters = settings.DYNAMOBILE_MAX_EATERS
+    return {
+        "max_eaters": max_eaters,
+        "days": [
+            {
+                "date": day.isoformat(),
+                "label": label,
+                **bands,
+                "over_capacity": bands["eaters"] > max_eaters,
+            }
+            for (day, _), (label, bands) in zip(
+                settings.DYNAMOBILE_DAYS, result["days"].items(), strict=True
+            )
+        ],
+        "arrive_day_before": result["arrive_day_before"],
+        "takes_car_back": result["takes_car_back"],
+    }
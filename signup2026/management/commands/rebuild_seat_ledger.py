@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from signup2026.models import SeatLedger
+
+
+class Command(BaseCommand):
+    help = "Recount the seats taken by validated signups for an edition."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--year", type=int, default=settings.DYNAMOBILE_LAST_DAY.year
+        )
+
+    def handle(self, *args, year, **options):
+        ledger = SeatLedger.rebuild(year)
+        self.stdout.write(str(ledger))
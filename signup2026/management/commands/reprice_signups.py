@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from signup2026.models import Signup
+
+
+class Command(BaseCommand):
+    help = "Recalculate the amounts due by every signup of an edition."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--year", type=int, default=settings.DYNAMOBILE_LAST_DAY.year
+        )
+
+    def handle(self, *args, year, **options):
+        count = Signup.objects.filter(year=year).calculate_amounts()
+        self.stdout.write(f"{count} signups repriced for {year}.")
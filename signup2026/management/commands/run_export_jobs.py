@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from signup2026 import export_jobs
+from signup2026.models import ExportJob
+
+
+class Command(BaseCommand):
+    help = "Render the exports requested from the admin."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and poll for new exports every --interval seconds.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to wait between two polls when running with --loop.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Rows read at a time, and between two progress updates.",
+        )
+
+    def handle(self, *args, loop, interval, chunk_size, **options):
+        while True:
+            job = ExportJob.objects.claim()
+            if job is not None:
+                job = export_jobs.run(job, chunk_size=chunk_size)
+                self.stdout.write(f"Export {job.pk}: {job.get_status_display()}.")
+                continue
+            if not loop:
+                return
+            time.sleep(interval)
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from signup2026.models import QueuedMail
+
+
+class Command(BaseCommand):
+    help = "Send the emails waiting in the outbox, in batches over one connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="Number of emails sent over a single SMTP connection.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and poll the outbox every --interval seconds.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to wait between two polls when running with --loop.",
+        )
+
+    def handle(self, *args, batch_size, loop, interval, **options):
+        while True:
+            sent, failed = QueuedMail.objects.send_due(batch_size=batch_size)
+            if sent or failed:
+                self.stdout.write(f"{sent} email(s) sent, {failed} failed.")
+            if not loop:
+                # Drain the outbox before returning when run as a one-shot.
+                if sent or failed:
+                    continue
+                return
+            if sent + failed < batch_size:
+                time.sleep(interval)
@@ -0,0 +1,390 @@
+import re
+import statistics
+import threading
+import time
+from collections import defaultdict
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode, urljoin, urlsplit
+from urllib.request import HTTPCookieProcessor, Request, build_opener
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Q, TextField
+from django.db.models.functions import Cast
+from django.urls import reverse
+from django.utils.crypto import get_random_string
+from magiclink.helpers import create_magiclink
+from magiclink.models import MagicLink
+
+from signup2026.models import Participant, QueuedMail, SeatLedger, WaitingRoomCounter
+
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1", "testserver"}
+SAFE_EMAIL_BACKENDS = {
+    "django.core.mail.backends.console.EmailBackend",
+    "django.core.mail.backends.locmem.EmailBackend",
+    "django.core.mail.backends.dummy.EmailBackend",
+}
+STEPS = ("login", "group_edit", "day_edit", "group_extra_info", "review")
+EMAIL_DOMAIN = "loadtest.invalid"
+
+ID_FIELD_RE = re.compile(r'name="(participants_set-\d+-id)"[^>]*value="(\d+)"')
+
+
+class StepFailed(Exception):
+    def __init__(self, step, status, body=""):
+        super().__init__(f"{step}: HTTP {status}")
+        self.step = step
+        self.status = status
+        self.lock_error = "database is locked" in body
+
+
+class SentToWaitingRoom(Exception):
+    """The waiting room held the user back: not a failure of the server."""
+
+    def __init__(self, step):
+        super().__init__(f"{step}: sent to the waiting room")
+        self.step = step
+
+
+class SimulatedUser:
+    """One browser going through the 2026 signup with its own cookie jar."""
+
+    def __init__(self, base_url, email, login_url, participants, timeout):
+        self.base_url = base_url
+        self.email = email
+        self.login_url = login_url
+        self.participants = participants
+        self.timeout = timeout
+        self.cookies = CookieJar()
+        self.opener = build_opener(HTTPCookieProcessor(self.cookies))
+        self.timings = {}
+        self.completed = False
+        self.waiting = False
+
+    def csrf_token(self):
+        for cookie in self.cookies:
+            if cookie.name == settings.CSRF_COOKIE_NAME:
+                return cookie.value
+        return ""
+
+    def request(self, step, path, data=None, expected_path=None):
+        url = urljoin(self.base_url, path)
+        body = None
+        headers = {}
+        if data is not None:
+            data = {"csrfmiddlewaretoken": self.csrf_token(), **data}
+            body = urlencode(data).encode()
+            headers = {"Referer": url}
+        start = time.perf_counter()
+        try:
+            response = self.opener.open(
+                Request(url, data=body, headers=headers), timeout=self.timeout
+            )
+            content = response.read().decode("utf-8", errors="replace")
+        except HTTPError as exc:
+            content = exc.read().decode("utf-8", errors="replace")
+            raise StepFailed(step, exc.code, content) from exc
+        except (URLError, TimeoutError) as exc:
+            raise StepFailed(step, type(exc).__name__) from exc
+        finally:
+            self.timings[step] = time.perf_counter() - start
+        if urlsplit(response.url).path == reverse("signup2026:waiting_room"):
+            raise SentToWaitingRoom(step)
+        if expected_path and urlsplit(response.url).path != expected_path:
+            # The form was rendered again with errors instead of redirecting.
+            raise StepFailed(step, f"{response.status} on {response.url}", content)
+        return content
+
+    def log_in(self):
+        return self.request("login", self.login_url)
+
+    def sign_up(self):
+        page = self.request(
+            "group_edit",
+            reverse("signup2026:group_edit"),
+            self.participant_form(),
+            expected_path=reverse("signup2026:day_edit"),
+        )
+        ids = ID_FIELD_RE.findall(page)
+        days = self.management_form(len(ids), initial=len(ids))
+        for name, value in ids:
+            days[name] = value
+            prefix = name.removesuffix("-id")
+            for day in range(1, 10):
+                days[f"{prefix}-day{day}"] = "on"
+        page = self.request(
+            "day_edit",
+            reverse("signup2026:day_edit"),
+            days,
+            expected_path=reverse("signup2026:group_extra_info"),
+        )
+        extra = self.management_form(len(ids), initial=len(ids))
+        for name, value in ID_FIELD_RE.findall(page):
+            extra[name] = value
+            prefix = name.removesuffix("-id")
+            extra[f"{prefix}-vae"] = "False"
+            extra[f"{prefix}-takes_car_back"] = "no"
+        self.request(
+            "group_extra_info",
+            reverse("signup2026:group_extra_info"),
+            extra,
+            expected_path=reverse("signup2026:review"),
+        )
+        self.request(
+            "review",
+            reverse("signup2026:review"),
+            {},
+            expected_path=reverse("signup2026:completed"),
+        )
+        self.completed = True
+
+    @staticmethod
+    def management_form(total, initial=0):
+        return {
+            "participants_set-TOTAL_FORMS": str(total),
+            "participants_set-INITIAL_FORMS": str(initial),
+            "participants_set-MIN_NUM_FORMS": "1",
+            "participants_set-MAX_NUM_FORMS": "1000",
+        }
+
+    def participant_form(self):
+        data = self.management_form(self.participants)
+        local_part = self.email.split("@")[0]
+        for i in range(self.participants):
+            data.update(
+                {
+                    f"participants_set-{i}-first_name": "Charge",
+                    f"participants_set-{i}-last_name": f"Test {local_part} {i}",
+                    f"participants_set-{i}-email": self.email,
+                    f"participants_set-{i}-phone": "0470000000",
+                    f"participants_set-{i}-birthday": "1980-01-01",
+                    f"participants_set-{i}-city": "Bruxelles",
+                    f"participants_set-{i}-country": "Belgique",
+                }
+            )
+        return data
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Send simulated users through the 2026 signup at the same instant "
+        "against a local server and report latencies, SQLite lock errors and "
+        "overbooking. Never run this against production."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000/")
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument(
+            "--participants",
+            type=int,
+            default=2,
+            help="Participants per simulated group.",
+        )
+        parser.add_argument("--timeout", type=float, default=60)
+        parser.add_argument(
+            "--pre-signup",
+            action="store_true",
+            help="Put the simulated users in the préinscriptions group, to "
+            "run before DYNAMOBILE_START_SIGNUP.",
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the simulated users and their signups afterwards.",
+        )
+
+    def handle(self, *args, base_url, users, participants, timeout, **options):
+        self.check_safe(base_url)
+        year = settings.DYNAMOBILE_LAST_DAY.year
+        run = get_random_string(6).lower()
+        emails = [f"load-{run}-{i}@{EMAIL_DOMAIN}" for i in range(users)]
+        tickets = (
+            WaitingRoomCounter.objects.filter(year=year)
+            .values_list("tickets", flat=True)
+            .first()
+        )
+        simulated = self.create_users(
+            base_url, emails, participants, timeout, options["pre_signup"]
+        )
+
+        try:
+            failures, duration = self.run(simulated)
+            self.report(simulated, failures, duration)
+            self.report_seats(year)
+        finally:
+            if not options["keep"]:
+                self.clean_up(year, run, emails, tickets)
+
+    def clean_up(self, year, run, emails, tickets):
+        """Remove what the run left behind, its mails above all.
+
+        The review emails are queued to the simulated users and to
+        ``EMAIL_HOST_USER``: a ``send_queued_mail`` worker would send them.
+        """
+        get_user_model().objects.filter(email__in=emails).delete()
+        MagicLink.objects.filter(email__in=emails).delete()
+        QueuedMail.objects.annotate(
+            recipients=Cast("recipient_list", TextField())
+        ).filter(recipients__contains=f"load-{run}-").delete()
+        counter = WaitingRoomCounter.objects.filter(year=year)
+        if tickets is None:
+            counter.delete()
+        else:
+            counter.update(tickets=tickets)
+        SeatLedger.rebuild(year)
+
+    def check_safe(self, base_url):
+        host = urlsplit(base_url).hostname
+        if host not in LOCAL_HOSTS:
+            raise CommandError(f"Refusing to load-test {host}: not a local server.")
+        if settings.EMAIL_BACKEND not in SAFE_EMAIL_BACKENDS:
+            raise CommandError(
+                "Refusing to run with EMAIL_BACKEND="
+                f"{settings.EMAIL_BACKEND}: use the console backend."
+            )
+
+    def create_users(self, base_url, emails, participants, timeout, pre_signup):
+        """Create the users and log them in without going through the mailbox.
+
+        The magic links are written straight to the database, which is what
+        makes this a local-only tool.
+        """
+        User = get_user_model()
+        pre_signup_group = None
+        if pre_signup:
+            pre_signup_group, _ = Group.objects.get_or_create(name="préinscriptions")
+        simulated = []
+        for email in emails:
+            user = User.objects.create(username=email, email=email)
+            if pre_signup_group:
+                user.groups.add(pre_signup_group)
+            link = create_magiclink(
+                email, None, redirect_url=reverse("signup2026:group_edit")
+            )
+            login_url = "{}?{}".format(
+                reverse("magiclink:login_verify"),
+                urlencode({"token": link.token, "email": email}),
+            )
+            simulated.append(
+                SimulatedUser(base_url, email, login_url, participants, timeout)
+            )
+        return simulated
+
+    def run(self, simulated):
+        """Log everyone in, then release them all on the signup at once."""
+        barrier = threading.Barrier(len(simulated) + 1)
+        failures = []
+        lock = threading.Lock()
+
+        def worker(user):
+            try:
+                user.log_in()
+            except StepFailed as exc:
+                with lock:
+                    failures.append(exc)
+                barrier.wait()
+                return
+            except SentToWaitingRoom:
+                user.waiting = True
+                barrier.wait()
+                return
+            barrier.wait()
+            try:
+                user.sign_up()
+            except StepFailed as exc:
+                with lock:
+                    failures.append(exc)
+            except SentToWaitingRoom:
+                user.waiting = True
+
+        threads = [threading.Thread(target=worker, args=(user,)) for user in simulated]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        return failures, time.perf_counter() - start
+
+    def report(self, simulated, failures, duration):
+        completed = sum(user.completed for user in simulated)
+        waiting = sum(user.waiting for user in simulated)
+        self.stdout.write(
+            f"{completed}/{len(simulated)} signups completed in {duration:.2f}s, "
+            f"{waiting} sent to the waiting room"
+        )
+        self.stdout.write(
+            f"{'step':<18}{'n':>6}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}"
+        )
+        for step in STEPS:
+            values = sorted(
+                user.timings[step] for user in simulated if step in user.timings
+            )
+            if not values:
+                continue
+            row = [percentile(values, p) for p in (50, 95, 99)] + [values[-1]]
+            self.stdout.write(
+                f"{step:<18}{len(values):>6}"
+                + "".join(f"{value * 1000:>8.0f}ms" for value in row)
+            )
+
+        by_step = defaultdict(int)
+        for failure in failures:
+            by_step[failure.step] += 1
+        lock_errors = sum(failure.lock_error for failure in failures)
+        style = self.style.ERROR if failures else self.style.SUCCESS
+        self.stdout.write(
+            style(f"{len(failures)} failed requests, {lock_errors} SQLite lock errors")
+        )
+        for step, count in by_step.items():
+            statuses = sorted({str(f.status) for f in failures if f.step == step})
+            self.stdout.write(f"  {step}: {count} ({', '.join(statuses)})")
+
+    def report_seats(self, year):
+        seats = Participant.objects.filter(
+            signup_group__year=year,
+            signup_group__validated_at__isnull=False,
+            signup_group__on_hold_at__isnull=True,
+            signup_group__cancelled_at__isnull=True,
+        ).aggregate(participants=Count("id"), vae=Count("id", filter=Q(vae=True)))
+        overbooked = seats["participants"] - settings.DYNAMOBILE_MAX_PARTICIPANTS
+        overbooked_vae = seats["vae"] - settings.DYNAMOBILE_MAX_VAE_PARTICIPANTS
+        style = (
+            self.style.ERROR
+            if overbooked > 0 or overbooked_vae > 0
+            else self.style.SUCCESS
+        )
+        self.stdout.write(
+            style(
+                f"Seats taken: {seats['participants']}/"
+                f"{settings.DYNAMOBILE_MAX_PARTICIPANTS} participants, "
+                f"{seats['vae']}/{settings.DYNAMOBILE_MAX_VAE_PARTICIPANTS} VAE, "
+                f"overbooked by {max(overbooked, 0)} participants and "
+                f"{max(overbooked_vae, 0)} VAE"
+            )
+        )
+        ledger = SeatLedger.objects.filter(year=year).first()
+        expected = SeatLedger.count_seats(year)
+        if ledger and (ledger.participants, ledger.vae) != (
+            expected["participants"],
+            expected["vae"],
+        ):
+            self.stdout.write(
+                self.style.ERROR(
+                    f"Seat ledger drifted: {ledger} but the signups count "
+                    f"{expected['participants']} participants, "
+                    f"{expected['vae']} VAE"
+                )
+            )
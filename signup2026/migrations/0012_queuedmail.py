@@ -0,0 +1,50 @@
+# Generated by Django 6.0.6 on 2026-10-18 08:09
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("signup2026", "0011_alter_extraparticipantinfo_full_address"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QueuedMail",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("subject", models.CharField(max_length=255)),
+                ("message", models.TextField()),
+                ("html_message", models.TextField(blank=True, default="")),
+                ("from_email", models.CharField(max_length=255)),
+                ("recipient_list", models.JSONField(default=list)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(
+                        db_index=True, default=django.utils.timezone.now
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True, default="")),
+                ("sent_at", models.DateTimeField(blank=True, default=None, null=True)),
+                (
+                    "failed_at",
+                    models.DateTimeField(blank=True, default=None, null=True),
+                ),
+            ],
+            options={
+                "verbose_name": "E-mail en attente d'envoi",
+                "verbose_name_plural": "E-mails en attente d'envoi",
+            },
+        ),
+    ]
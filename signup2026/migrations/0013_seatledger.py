@@ -0,0 +1,34 @@
+# Generated by Django 6.0.6 on 2026-10-18 08:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("signup2026", "0012_queuedmail"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SeatLedger",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("year", models.IntegerField(unique=True)),
+                ("participants", models.PositiveIntegerField(default=0)),
+                ("vae", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Places occupées",
+                "verbose_name_plural": "Places occupées",
+            },
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 6.0.6 on 2026-10-18 08:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def number_waiting_list(apps, schema_editor):
+    Signup = apps.get_model("signup2026", "Signup")
+    waiting = Signup.objects.filter(
+        on_hold_at__isnull=False,
+        validated_at__isnull=False,
+        cancelled_at__isnull=True,
+    ).annotate(
+        ranking=models.Case(
+            models.When(
+                validated_at__lt=settings.DYNAMOBILE_START_PARTIAL_SIGNUP,
+                on_hold_partial=False,
+                then=models.Value(1),
+            ),
+            models.When(
+                validated_at__lt=settings.DYNAMOBILE_START_PARTIAL_SIGNUP,
+                on_hold_partial=True,
+                then=models.Value(2),
+            ),
+            default=models.Value(3),
+        )
+    )
+    for year in waiting.values_list("year", flat=True).distinct():
+        signups = list(
+            waiting.filter(year=year).order_by("ranking", "validated_at", "id")
+        )
+        for number, signup in enumerate(signups, start=1):
+            signup.waiting_number = number
+        Signup.objects.bulk_update(signups, ["waiting_number"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("signup2026", "0013_seatledger"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="signup",
+            name="waiting_number",
+            field=models.PositiveIntegerField(
+                blank=True,
+                default=None,
+                editable=False,
+                null=True,
+                verbose_name="N° d'attente",
+            ),
+        ),
+        migrations.RunPython(number_waiting_list, migrations.RunPython.noop),
+    ]
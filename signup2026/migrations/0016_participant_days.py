@@ -0,0 +1,32 @@
+# Generated by Django 6.0.6 on 2026-10-18 09:17
+
+from django.db import migrations, models
+from django.db.models import Case, Value, When
+
+
+def fill_days(apps, schema_editor):
+    Participant = apps.get_model("signup2026", "Participant")
+    Participant.objects.update(
+        days=sum(
+            (
+                Case(When(**{f"day{day}": True}, then=Value(1 << (day - 1))), default=0)
+                for day in range(1, 10)
+            ),
+            start=Value(0),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("signup2026", "0015_exportjob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="participant",
+            name="days",
+            field=models.PositiveSmallIntegerField(default=511, editable=False),
+        ),
+        migrations.RunPython(fill_days, migrations.RunPython.noop),
+    ]
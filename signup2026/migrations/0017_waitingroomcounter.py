@@ -0,0 +1,32 @@
+# Generated by Django 6.0.6 on 2026-10-18 09:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("signup2026", "0016_participant_days"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WaitingRoomCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("year", models.IntegerField(unique=True)),
+                ("tickets", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Compteur de la salle d'attente",
+                "verbose_name_plural": "Compteurs de la salle d'attente",
+            },
+        ),
+    ]
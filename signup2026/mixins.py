@@ -1,20 +1,63 @@
+import time
+
 from django.conf import settings
 from django.contrib.auth.mixins import AccessMixin
 from django.http import HttpResponseRedirect
 from django.urls import reverse_lazy
 from django.utils import timezone
 
+from . import waiting_room
 from .models import Signup
 
+PRE_SIGNUP_SESSION_KEY = "can_pre_signup"
+PRE_SIGNUP_SESSION_TTL = 5 * 60
+SIGNUP_SESSION_KEY = "signup2026_id"
+
+
+def user_can_pre_signup(request):
+    """Whether the user belongs to the "préinscriptions" group.
+
+    The answer is kept in the session for ``PRE_SIGNUP_SESSION_TTL`` seconds,
+    so adding someone to the group takes effect within a few minutes.
+    """
+    user = request.user
+    if not user.is_authenticated:
+        return False
+    cached = request.session.get(PRE_SIGNUP_SESSION_KEY)
+    now = time.time()
+    if cached and cached[0] == user.pk and now - cached[1] < PRE_SIGNUP_SESSION_TTL:
+        return cached[2]
+    can_pre_signup = user.groups.filter(name="préinscriptions").exists()
+    request.session[PRE_SIGNUP_SESSION_KEY] = [user.pk, now, can_pre_signup]
+    return can_pre_signup
+
 
 class SignupStartedMixin(AccessMixin):
-    """Verify that the current user is authenticated and signup is open."""
+    """Verify that the current user is authenticated and signup is open.
+
+    The signup of the user is resolved once per request. Its id is kept in the
+    session, so later steps read it by primary key instead of running
+    ``get_or_create`` again.
+    """
+
+    signup = None
 
     def get_object(self, queryset=None):
-        signup, _ = Signup.objects.get_or_create(
-            owner=self.request.user,
-            year=2026,
-        )
+        if self.signup is None:
+            self.signup = self.resolve_signup()
+        return self.signup
+
+    def resolve_signup(self):
+        request = self.request
+        signup_id = request.session.get(SIGNUP_SESSION_KEY)
+        if signup_id is not None:
+            signup = Signup.objects.filter(
+                pk=signup_id, owner=request.user, year=2026
+            ).first()
+            if signup is not None:
+                return signup
+        signup, _ = Signup.objects.get_or_create(owner=request.user, year=2026)
+        request.session[SIGNUP_SESSION_KEY] = signup.pk
         return signup
 
     def dispatch(self, request, *args, **kwargs):
@@ -23,10 +66,15 @@ class SignupStartedMixin(AccessMixin):
             return self.handle_no_permission()
 
         signup_not_started = timezone.now() < settings.DYNAMOBILE_START_SIGNUP
-        user_can_pre_signup = user.groups.filter(name="préinscriptions").exists()
-        if signup_not_started and not user_can_pre_signup:
+        can_pre_signup = user_can_pre_signup(request)
+        if signup_not_started and not can_pre_signup:
             return HttpResponseRedirect(reverse_lazy("signup2026:home"))
 
+        if not can_pre_signup:
+            admitted, _ = waiting_room.admit(request.session)
+            if not admitted:
+                return HttpResponseRedirect(reverse_lazy("signup2026:waiting_room"))
+
         signup = self.get_object()
         if signup.validated_at is not None:
             return HttpResponseRedirect(reverse_lazy("signup2026:completed"))
@@ -1,13 +1,19 @@
+import logging
+from decimal import Decimal
+
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericRelation
-from django.core.mail import send_mail
-from django.db import models
+from django.contrib.contenttypes.models import ContentType
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import models, transaction
 from django.db.models import (
     BooleanField,
     Case,
+    Count,
     DecimalField,
     F,
     OuterRef,
+    Prefetch,
     Q,
     Subquery,
     Sum,
@@ -15,12 +21,16 @@ from django.db.models import (
     When,
 )
 from django.db.models.functions import Coalesce
+from django.db.models.lookups import Exact
 from django.template.loader import get_template
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from phonenumber_field.modelfields import PhoneNumberField
 
 from accounts.models import OperationValidation
+from dynasignup import pricing
+
+logger = logging.getLogger(__name__)
 
 
 class SignupQuerySet(models.QuerySet):
@@ -72,6 +82,88 @@ class SignupQuerySet(models.QuerySet):
             )
         )
 
+    def calculate_amounts(self, batch_size=500):
+        """Price the participants of every signup of the queryset at once.
+
+        Same result as calling :meth:`Signup.calculate_amounts` on each
+        signup, with one query to load the participants and bulk updates to
+        store the prices and the descriptions.
+
+        :return: the number of signups priced.
+        """
+        signups = list(
+            self.prefetch_related(
+                Prefetch(
+                    "participants_set",
+                    queryset=Participant.objects.order_by("birthday"),
+                )
+            )
+        )
+        participants = []
+        for signup in signups:
+            group = list(signup.participants_set.all())
+            _, signup.comments = signup.price_participants(group)
+            participants += group
+        with transaction.atomic():
+            Participant.objects.bulk_update(
+                participants, ["amount_due_calculated"], batch_size=batch_size
+            )
+            self.model.objects.bulk_update(signups, ["comments"], batch_size=batch_size)
+            # bulk_update() sends no signal to outdate the exported amounts.
+            transaction.on_commit(ExportJob.objects.outdate)
+        return len(signups)
+
+    def waiting_list(self):
+        """On-hold signups, in the order in which freed seats are offered.
+
+        Full signups validated before the partial signups open come first,
+        then the partial ones validated in the same period, then everyone
+        else, each group by validation date.
+        """
+        return (
+            self.filter(
+                on_hold_at__isnull=False,
+                validated_at__isnull=False,
+                cancelled_at__isnull=True,
+            )
+            .annotate(
+                ranking=Case(
+                    When(
+                        validated_at__lt=settings.DYNAMOBILE_START_PARTIAL_SIGNUP,
+                        on_hold_partial=False,
+                        then=Value(1),
+                    ),
+                    When(
+                        validated_at__lt=settings.DYNAMOBILE_START_PARTIAL_SIGNUP,
+                        on_hold_partial=True,
+                        then=Value(2),
+                    ),
+                    default=Value(3),
+                )
+            )
+            .order_by("ranking", "validated_at", "id")
+        )
+
+    def renumber_waiting_list(self, year):
+        """Store the position of every signup of ``year`` on the waiting list.
+
+        :return: dict mapping the id of each waiting signup to its number.
+        """
+        waiting = (
+            self.filter(year=year).waiting_list().values_list("id", "waiting_number")
+        )
+        numbers = {}
+        changed = []
+        for number, (pk, current) in enumerate(waiting, start=1):
+            numbers[pk] = number
+            if current != number:
+                changed.append(Signup(id=pk, waiting_number=number))
+        self.filter(year=year, waiting_number__isnull=False).exclude(
+            id__in=numbers
+        ).update(waiting_number=None)
+        self.bulk_update(changed, ["waiting_number"])
+        return numbers
+
 
 class SignupManager(models.Manager.from_queryset(SignupQuerySet)):
     def get_queryset(self):
@@ -94,6 +186,9 @@ class Signup(models.Model):
     )
     on_hold_vae = models.BooleanField(default=False)
     on_hold_partial = models.BooleanField(default=False)
+    waiting_number = models.PositiveIntegerField(
+        _("N° d'attente"), default=None, null=True, blank=True, editable=False
+    )
     comments = models.TextField(_("Commentaires"), blank=True)
 
     objects = SignupManager()
@@ -123,53 +218,33 @@ class Signup(models.Model):
         return True
 
     def calculate_amounts(self):
+        participants = list(self.participants_set.order_by("birthday"))
+        total_price, self.comments = self.price_participants(participants)
+        Participant.objects.bulk_update(participants, ["amount_due_calculated"])
+        self.save()
+        transaction.on_commit(ExportJob.objects.outdate)
+        return total_price
+
+    @staticmethod
+    def price_participants(participants):
+        """Set ``amount_due_calculated`` on ``participants``, without saving.
+
+        ``participants`` must be ordered by birthday, as the children
+        reductions depend on the rank of the child in the family.
+
+        :return: the total price and the description of the calculation.
+        """
         description = ""
-        total_price = 0
-        child_nb = 0
-        participants = self.participants_set.all().order_by("birthday")
-        for participant in participants:
-            age = participant.age_at_dynamobile_end()
+        total_price = Decimal(0)
+        for participant, price in pricing.price_participants(participants):
             description += (
                 f"prix pour {participant.first_name} {participant.last_name}: "
+                f"{price.explanation}\n"
             )
-            for (
-                min_age,
-                max_age,
-                all_days_price,
-                upfront_price,
-            ) in settings.DYNAMOBILE_PRICES:
-                if min_age <= age < max_age:
-                    if participant.complete_signup():
-                        price = upfront_price + all_days_price
-                        description += f"(totalité) {upfront_price} + {all_days_price} "
-                    else:
-                        nb_days = participant.nb_of_days()
-                        price = upfront_price + (all_days_price / 8 * nb_days)
-                        description += f"(partiel) {upfront_price} + {all_days_price} / 8 * {nb_days} "
-
-                    if age < 18:
-                        reduction = 0
-                        if child_nb == 1:
-                            reduction = 0.25
-                        elif child_nb >= 2:
-                            reduction = 0.50
-                        price *= 1 - reduction
-                        child_nb += 1
-                        description += f"enfant {child_nb} réduction {reduction:.0%} "
-
-                    total_price += price
-                    description += f"= {price:.2f}€\n"
-                    break
-            else:
-                raise ValueError(
-                    f"Aucune tranche de prix pour {participant} (âge {age})"
-                )
-            participant.amount_due_calculated = price
-            participant.save()
+            total_price += price.amount
+            participant.amount_due_calculated = price.amount
         description += f"total: {total_price:.2f}€"
-        self.comments = description
-        self.save()
-        return total_price
+        return total_price, description
 
     def amount_due(self):
         return (
@@ -209,7 +284,7 @@ class Signup(models.Model):
 
     def send_payment_confirmation_mail(self):
         context = {"signup": self}
-        send_mail(
+        QueuedMail.objects.queue(
             subject="Confirmation de paiement - Dynamobile",
             message=get_template("signup2026/email/email_confirmation.txt").render(
                 context
@@ -223,70 +298,201 @@ class Signup(models.Model):
         self.payment_confirmation_sent_at = timezone.now()
         self.save(update_fields=["payment_confirmation_sent_at"])
 
-    def waiting_number(self):
-        from django.db.models import Case, Value, When
-        from django.db.models.expressions import Window
-        from django.db.models.functions import RowNumber
-
-        waiting_signups = Signup.objects.filter(on_hold_at__isnull=False, year=2026)
-        ordered = waiting_signups.annotate(
-            ranking=Case(
-                When(
-                    validated_at__lt=settings.DYNAMOBILE_START_PARTIAL_SIGNUP,
-                    on_hold_partial=False,
-                    then=Value(1),
-                ),
-                When(
-                    validated_at__lt=settings.DYNAMOBILE_START_PARTIAL_SIGNUP,
-                    on_hold_partial=True,
-                    then=Value(2),
-                ),
-                default=Value(3),
-            )
-        ).annotate(
-            final_ranking=Window(RowNumber(), order_by=["ranking", "validated_at"])
+    def refresh_waiting_number(self):
+        self.waiting_number = Signup.objects.renumber_waiting_list(self.year).get(
+            self.pk
         )
-        collect = {k: v for k, v in ordered.values_list("id", "final_ranking")}
-        return collect.get(self.id, 0)
 
     def check_if_on_hold(self):
+        """Put the signup on hold if it does not fit in the remaining seats.
+
+        Must run in the same ``transaction.atomic()`` block as the ``save()``
+        validating the signup: the seat ledger of the edition stays locked
+        until the commit, so two concurrent reviews cannot both take the last
+        seats.
+        """
+        ledger = SeatLedger.lock(self.year)
+        group = self.participants_set.aggregate(
+            total=Count("id"),
+            vae=Count("id", filter=Q(vae=True)),
+            partial=Count("id", filter=Participant.partial_q()),
+        )
+
         # Vérification des limites (VAE, participants, partiels)
         if (
-            not self.complete_signup()
+            group["partial"]
             and settings.DYNAMOBILE_START_PARTIAL_SIGNUP > timezone.now()
         ):
             self.on_hold_partial = True
             self.on_hold_at = timezone.now()
 
         # VAE limit
-        if additional_vae := self.has_vae():
-            registered_vae = Participant.objects.filter(
-                signup_group__validated_at__isnull=False,
-                vae=True,
-                signup_group__year=2026,
-            ).count()
-            if (
-                registered_vae + additional_vae
-                > settings.DYNAMOBILE_MAX_VAE_PARTICIPANTS
-            ):
-                self.on_hold_vae = True
-                self.on_hold_at = timezone.now()
+        if (
+            group["vae"]
+            and ledger.vae + group["vae"] > settings.DYNAMOBILE_MAX_VAE_PARTICIPANTS
+        ):
+            self.on_hold_vae = True
+            self.on_hold_at = timezone.now()
 
         # Total participants limit
-        nb_participants = (
-            Participant.objects.filter(
-                signup_group__validated_at__isnull=False,
-                signup_group__on_hold_at__isnull=True,
-                signup_group__cancelled_at__isnull=True,
-                signup_group__year=2026,
-            ).count()
-            + self.participants_set.count()
-        )
-        if nb_participants > settings.DYNAMOBILE_MAX_PARTICIPANTS:
+        if ledger.participants + group["total"] > settings.DYNAMOBILE_MAX_PARTICIPANTS:
             self.on_hold_at = timezone.now()
 
+        ledger.reserve(
+            participants=0 if self.on_hold_at else group["total"],
+            vae=group["vae"],
+        )
+
+
+class SeatLedger(models.Model):
+    """Seats taken per edition, kept in sync with the validated signups.
+
+    ``participants`` counts the participants of validated signups that are
+    neither on hold nor cancelled, ``vae`` the VAE participants of every
+    validated signup. Reviews update the counters in place; admin actions
+    that move signups around call :meth:`rebuild`, which also renumbers the
+    waiting list.
+    """
+
+    year = models.IntegerField(unique=True)
+    participants = models.PositiveIntegerField(default=0)
+    vae = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Places occupées"
+        verbose_name_plural = "Places occupées"
+
+    def __str__(self):
+        return f"{self.year}: {self.participants} participants, {self.vae} VAE"
+
+    @staticmethod
+    def count_seats(year):
+        return Participant.objects.filter(
+            signup_group__year=year,
+            signup_group__validated_at__isnull=False,
+        ).aggregate(
+            participants=Count(
+                "id",
+                filter=Q(
+                    signup_group__on_hold_at__isnull=True,
+                    signup_group__cancelled_at__isnull=True,
+                ),
+            ),
+            vae=Count("id", filter=Q(vae=True)),
+        )
+
+    @classmethod
+    def rebuild(cls, year):
+        ledger, _ = cls.objects.update_or_create(
+            year=year, defaults=cls.count_seats(year)
+        )
+        Signup.objects.renumber_waiting_list(year)
+        return ledger
+
+    @classmethod
+    def lock(cls, year):
+        """Return the ledger of ``year``, holding a write lock on it.
+
+        The lock is taken with an ``UPDATE`` rather than
+        ``select_for_update()``, which SQLite ignores: the first write of a
+        transaction takes the database write lock there, and the row lock on
+        other backends. Must be called inside ``transaction.atomic()``.
+        """
+        if not cls.objects.filter(year=year).update(updated_at=timezone.now()):
+            return cls.rebuild(year)
+        return cls.objects.get(year=year)
+
+    def reserve(self, participants, vae):
+        SeatLedger.objects.filter(pk=self.pk).update(
+            participants=F("participants") + participants,
+            vae=F("vae") + vae,
+        )
+
+
+class WaitingRoomCounter(models.Model):
+    """Last ticket handed out by the waiting room of an edition."""
+
+    year = models.IntegerField(unique=True)
+    tickets = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Compteur de la salle d'attente"
+        verbose_name_plural = "Compteurs de la salle d'attente"
+
+    def __str__(self):
+        return f"{self.year}: {self.tickets} tickets"
+
+    @classmethod
+    def take(cls, year):
+        """Return the next ticket number of ``year``.
+
+        The counter is incremented with an ``UPDATE`` and read back in the
+        same transaction, which holds the write lock: two workers never get
+        the same number.
+        """
+        counter, _ = cls.objects.get_or_create(year=year)
+        with transaction.atomic():
+            cls.objects.filter(pk=counter.pk).update(tickets=F("tickets") + 1)
+            return cls.objects.values_list("tickets", flat=True).get(pk=counter.pk)
+
+
+AGE_BANDS = (
+    ("a0_6", Q(age__lte=6)),
+    ("a6_12", Q(age__gt=6, age__lte=12)),
+    ("a12_18", Q(age__gt=12, age__lt=18)),
+    ("a18plus", Q(age__gte=18)),
+)
+DAYS = tuple(f"day{day}" for day in range(1, 10))
+#: ``Participant.days`` of the participants coming every day.
+ALL_DAYS = (1 << len(DAYS)) - 1
+
+
+def day_bit(number):
+    """Bit of day ``number``, from 1, in ``Participant.days``."""
+    return 1 << (number - 1)
+
+
+def attends_q(number):
+    """Lookup matching the participants coming on day ``number``."""
+    bit = day_bit(number)
+    return Q(Exact(F("days").bitand(bit), bit))
+
+
+def days_expression():
+    """``Participant.days`` computed from the ``day1`` … ``day9`` columns."""
+    return sum(
+        (
+            Case(When(**{day: True}, then=Value(day_bit(number))), default=Value(0))
+            for number, day in enumerate(DAYS, 1)
+        ),
+        start=Value(0),
+    )
+
 
 class ParticipantQuerySet(models.QuerySet):
+    def attending(self, number):
+        return self.filter(attends_q(number))
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for participant in objs:
+            participant.days = participant.days_mask()
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def update(self, **kwargs):
+        """Keep ``days`` in sync with the day columns.
+
+        ``bulk_update()`` goes through here too.
+        """
+        if "days" in kwargs or not kwargs.keys() & set(DAYS):
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            pks = list(self.values_list("pk", flat=True))
+            rows = super().update(**kwargs)
+            self.model.objects.filter(pk__in=pks).update(days=days_expression())
+        return rows
+
     def with_amounts(self):
         return self.annotate(
             amount_due=Coalesce(
@@ -320,6 +526,63 @@ class ParticipantQuerySet(models.QuerySet):
             )
         )
 
+    def kitchen_counts(self):
+        """Participants per day and age band, and the totals of the kitchen.
+
+        Everything is counted in a single query. Only validated signups are
+        counted; all but the ``total_on_hold*`` counts leave out the signups
+        on hold or cancelled.
+        """
+        active = Q(
+            signup_group__on_hold_at__isnull=True,
+            signup_group__cancelled_at__isnull=True,
+        )
+        aggregates = {
+            f"{day}_{band}": Count("id", filter=active & attends_q(number) & q)
+            for number, day in enumerate(DAYS, 1)
+            for band, q in AGE_BANDS
+        }
+        counts = (
+            self.with_age()
+            .filter(signup_group__validated_at__isnull=False)
+            .aggregate(
+                **aggregates,
+                total_signups=Count("id", filter=active),
+                total_vae=Count("id", filter=active & Q(vae=True)),
+                total_partials=Count("id", filter=active & Participant.partial_q()),
+                total_on_hold=Count(
+                    "id", filter=Q(signup_group__on_hold_at__isnull=True)
+                ),
+                total_on_hold_vae=Count("id", filter=Q(signup_group__on_hold_vae=True)),
+                total_on_hold_partial=Count(
+                    "id", filter=Q(signup_group__on_hold_partial=True)
+                ),
+                arrive_day_before=Count(
+                    "id", filter=active & Q(arrive_day_before=True)
+                ),
+                **{
+                    f"car_back_{choice}": Count(
+                        "id", filter=active & Q(takes_car_back=choice)
+                    )
+                    for choice in (
+                        Participant.CarBackChoice.BRUSSELS,
+                        Participant.CarBackChoice.NAMUR,
+                    )
+                },
+            )
+        )
+        days = {}
+        for number, day in enumerate(DAYS, 1):
+            bands = {band: counts.pop(f"{day}_{band}") for band, _ in AGE_BANDS}
+            bands["total"] = sum(bands.values())
+            bands["eaters"] = bands["total"] - bands["a0_6"]
+            days[f"day {number}"] = bands
+        counts["takes_car_back"] = {
+            "brussels": counts.pop("car_back_brussels"),
+            "namur": counts.pop("car_back_namur"),
+        }
+        return {"days": days, **counts}
+
 
 class ParticipantManager(models.Manager.from_queryset(ParticipantQuerySet)):
     pass
@@ -381,6 +644,9 @@ class Participant(models.Model):
     day7 = models.BooleanField(_("23-07"), default=True)
     day8 = models.BooleanField(_("24-07"), default=True)
     day9 = models.BooleanField(_("25-07"), default=True)
+    #: Bit ``n - 1`` is set when ``day<n>`` is, see :func:`attends_q`. Not
+    #: indexed: the bitwise predicates on it cannot use an index on SQLite.
+    days = models.PositiveSmallIntegerField(default=ALL_DAYS, editable=False)
 
     # Champs financiers (de 'reunion')
     amount_due_modified = models.DecimalField(
@@ -400,6 +666,22 @@ class Participant(models.Model):
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
+    def save(self, *args, update_fields=None, **kwargs):
+        self.days = self.days_mask()
+        if update_fields is not None and set(update_fields) & set(DAYS):
+            update_fields = {*update_fields, "days"}
+        super().save(*args, update_fields=update_fields, **kwargs)
+
+    def days_mask(self):
+        return sum(
+            day_bit(number) for number, day in enumerate(DAYS, 1) if getattr(self, day)
+        )
+
+    @staticmethod
+    def partial_q():
+        """Lookup matching the participants who skip at least one day."""
+        return ~Q(days=ALL_DAYS)
+
     def complete_signup(self):
         return all(
             [
@@ -520,3 +802,238 @@ class ExtraParticipantInfo(models.Model):
 
     def __str__(self):
         return f"Infos complémentaires - {self.participant}"
+
+
+class QueuedMailQuerySet(models.QuerySet):
+    def pending(self):
+        return self.filter(sent_at__isnull=True, failed_at__isnull=True)
+
+    def due(self):
+        return self.pending().filter(next_attempt_at__lte=timezone.now())
+
+    def queue(self, subject, message, from_email, recipient_list, html_message=None):
+        """Store an email to be sent by the ``send_queued_mail`` worker.
+
+        Takes the same arguments as :func:`django.core.mail.send_mail` so call
+        sites can switch from one to the other without reshaping their data.
+        """
+        return self.create(
+            subject=subject,
+            message=message,
+            from_email=from_email,
+            recipient_list=list(recipient_list),
+            html_message=html_message or "",
+        )
+
+    def claim(self, batch_size):
+        """Lease up to ``batch_size`` due emails to the calling worker.
+
+        Each email is claimed with a conditional ``UPDATE`` that pushes its
+        ``next_attempt_at`` by ``QueuedMail.CLAIM_TIMEOUT``: other workers do
+        not see it as due anymore, and it becomes due again if this worker
+        dies before sending it.
+        """
+        claimed = []
+        for mail in list(self.due().order_by("next_attempt_at", "id")[:batch_size]):
+            leased_until = timezone.now() + QueuedMail.CLAIM_TIMEOUT
+            # Another worker may have claimed it in the meantime.
+            if (
+                self.due()
+                .filter(pk=mail.pk, next_attempt_at=mail.next_attempt_at)
+                .update(next_attempt_at=leased_until)
+            ):
+                mail.next_attempt_at = leased_until
+                claimed.append(mail)
+        return claimed
+
+    def send_due(self, batch_size=50):
+        """Send one batch of due emails over a single SMTP connection.
+
+        Failed emails, including the whole batch when the connection cannot be
+        opened, are rescheduled with an exponential backoff and given up on
+        after ``QueuedMail.MAX_ATTEMPTS`` tries.
+
+        :return: tuple ``(sent, failed)`` with the number of emails of the batch.
+        """
+        batch = self.claim(batch_size)
+        if not batch:
+            return 0, 0
+
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as exc:
+            logger.warning("Cannot open the mail connection: %r", exc)
+            for mail in batch:
+                mail.record_failure(exc)
+            return 0, len(batch)
+
+        sent = failed = 0
+        try:
+            for mail in batch:
+                try:
+                    connection.send_messages([mail.as_email_message(connection)])
+                except Exception as exc:
+                    logger.warning("Cannot send queued mail %s: %r", mail.pk, exc)
+                    mail.record_failure(exc)
+                    failed += 1
+                else:
+                    mail.sent_at = timezone.now()
+                    mail.attempts += 1
+                    mail.save(update_fields=["sent_at", "attempts"])
+                    sent += 1
+        finally:
+            try:
+                connection.close()
+            except Exception as exc:
+                logger.warning("Cannot close the mail connection: %r", exc)
+        return sent, failed
+
+
+class QueuedMail(models.Model):
+    """Outgoing email, persisted so that requests do not wait on SMTP."""
+
+    MAX_ATTEMPTS = 6
+    RETRY_DELAY = timezone.timedelta(minutes=1)
+    CLAIM_TIMEOUT = timezone.timedelta(minutes=10)
+
+    subject = models.CharField(max_length=255)
+    message = models.TextField()
+    html_message = models.TextField(blank=True, default="")
+    from_email = models.CharField(max_length=255)
+    recipient_list = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now, db_index=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    sent_at = models.DateTimeField(default=None, null=True, blank=True)
+    failed_at = models.DateTimeField(default=None, null=True, blank=True)
+
+    objects = QueuedMailQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "E-mail en attente d'envoi"
+        verbose_name_plural = "E-mails en attente d'envoi"
+
+    def __str__(self):
+        return f"{self.subject} - {', '.join(self.recipient_list)}"
+
+    def as_email_message(self, connection=None):
+        email = EmailMultiAlternatives(
+            subject=self.subject,
+            body=self.message,
+            from_email=self.from_email,
+            to=self.recipient_list,
+            connection=connection,
+        )
+        if self.html_message:
+            email.attach_alternative(self.html_message, "text/html")
+        return email
+
+    def record_failure(self, exc):
+        self.attempts += 1
+        self.last_error = repr(exc)
+        if self.attempts >= self.MAX_ATTEMPTS:
+            self.failed_at = timezone.now()
+        else:
+            self.next_attempt_at = timezone.now() + self.RETRY_DELAY * 2 ** (
+                self.attempts - 1
+            )
+        self.save(
+            update_fields=["attempts", "last_error", "failed_at", "next_attempt_at"]
+        )
+
+
+class ExportJobQuerySet(models.QuerySet):
+    def reusable(self, key):
+        """Job exporting ``key`` that is done and still current, or running."""
+        self.expire()
+        return (
+            self.filter(key=key, outdated=False)
+            .exclude(status=ExportJob.Status.FAILED)
+            .order_by("-created_at")
+            .first()
+        )
+
+    def expire(self):
+        """Fail the jobs left running by a worker that stopped."""
+        now = timezone.now()
+        return self.filter(
+            status=ExportJob.Status.RUNNING,
+            started_at__lt=now - ExportJob.RUNNING_TIMEOUT,
+        ).update(
+            status=ExportJob.Status.FAILED,
+            error="Le rendu a été interrompu.",
+            finished_at=now,
+        )
+
+    def outdate(self):
+        """Stop reusing the exports done so far: their data changed."""
+        return self.filter(outdated=False).update(outdated=True)
+
+    def claim(self):
+        """Mark the oldest pending job as running and return it, or ``None``."""
+        while True:
+            job = self.filter(status=ExportJob.Status.PENDING).order_by("id").first()
+            if job is None:
+                return None
+            # Another worker may have claimed it in the meantime.
+            if self.filter(pk=job.pk, status=ExportJob.Status.PENDING).update(
+                status=ExportJob.Status.RUNNING, started_at=timezone.now()
+            ):
+                job.refresh_from_db()
+                return job
+
+
+class ExportJob(models.Model):
+    """Admin export rendered by the ``run_export_jobs`` worker.
+
+    ``key`` identifies what is exported: the model, the resource, the fields,
+    the filters of the changelist and the user. A finished export is reused
+    for the same key until the exported data changes and it is ``outdated``.
+    A job still running after ``RUNNING_TIMEOUT`` is failed, its worker is
+    assumed dead.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "En attente"
+        RUNNING = "running", "En cours"
+        DONE = "done", "Terminé"
+        FAILED = "failed", "Échec"
+
+    RUNNING_TIMEOUT = timezone.timedelta(minutes=30)
+
+    key = models.CharField(max_length=64, db_index=True)
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    resource = models.PositiveSmallIntegerField(default=0)
+    export_fields = models.JSONField(default=list, blank=True)
+    query = models.TextField(blank=True, default="")
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL
+    )
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    progress = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(null=True, blank=True)
+    file = models.FileField(upload_to="exports/", blank=True)
+    error = models.TextField(blank=True, default="")
+    outdated = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(default=None, null=True, blank=True)
+    finished_at = models.DateTimeField(default=None, null=True, blank=True)
+
+    objects = ExportJobQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Export"
+        verbose_name_plural = "Exports"
+
+    def __str__(self):
+        return f"{self.content_type.name} ({self.get_status_display()})"
+
+    @property
+    def percent(self):
+        if not self.total:
+            return 100 if self.status == self.Status.DONE else 0
+        return min(100, self.progress * 100 // self.total)
@@ -0,0 +1,58 @@
+"""Drop what is derived from the participants when one of them changes.
+
+That is the cached kitchen counts and the finished exports. Both are dropped
+once the change is committed: dropped earlier, a request could derive them
+again from the old data before the commit. The seat ledger is rebuilt after
+deletions, which may come from any admin or cascade from a user.
+"""
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from signup2026 import kitchen
+from signup2026.models import (
+    ExportJob,
+    ExtraParticipantInfo,
+    Participant,
+    SeatLedger,
+    Signup,
+)
+
+
+@receiver(post_save, sender=Participant)
+@receiver(post_delete, sender=Participant)
+@receiver(post_save, sender=Signup)
+@receiver(post_delete, sender=Signup)
+def invalidate_kitchen_counts(sender, instance, **kwargs):
+    transaction.on_commit(kitchen.invalidate)
+
+
+@receiver(post_save, sender=Participant)
+@receiver(post_delete, sender=Participant)
+@receiver(post_save, sender=Signup)
+@receiver(post_delete, sender=Signup)
+@receiver(post_save, sender=ExtraParticipantInfo)
+@receiver(post_delete, sender=ExtraParticipantInfo)
+def outdate_export_jobs(sender, instance, **kwargs):
+    transaction.on_commit(ExportJob.objects.outdate)
+
+
+@receiver(pre_delete, sender=Participant)
+def remember_participant_year(sender, instance, **kwargs):
+    # The signup may be deleted along with the participant.
+    instance._signup_year = (
+        Signup.objects.filter(pk=instance.signup_group_id)
+        .values_list("year", flat=True)
+        .first()
+    )
+
+
+@receiver(post_delete, sender=Participant)
+@receiver(post_delete, sender=Signup)
+def rebuild_seat_ledger(sender, instance, **kwargs):
+    year = instance.year if sender is Signup else instance._signup_year
+    if year is not None:
+        transaction.on_commit(partial(SeatLedger.rebuild, year))
@@ -6,6 +6,12 @@ app_name = "signup2026"
 
 urlpatterns = [
     path("", views.HomePage.as_view(), name="home"),
+    path("attente/", views.WaitingRoomView.as_view(), name="waiting_room"),
+    path(
+        "attente/statut/",
+        views.WaitingRoomStatusView.as_view(),
+        name="waiting_room_status",
+    ),
     path("group/", views.CreateGroupView.as_view(), name="group_edit"),
     path("days/", views.SelectDayView.as_view(), name="day_edit"),
     path("extra/", views.GroupExtraEditView.as_view(), name="group_extra_info"),
@@ -17,4 +23,10 @@ urlpatterns = [
         name="followup_extra_info",
     ),
     path("kitchen/", views.KitchenView.as_view(), name="kitchen"),
+    path("presences/<int:day>/", views.AttendanceView.as_view(), name="attendance"),
+    path(
+        "kitchen/forecast.json",
+        views.MealForecastView.as_view(),
+        name="meal_forecast",
+    ),
 ]
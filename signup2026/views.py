@@ -1,14 +1,28 @@
+import hashlib
+
 from django.conf import settings
 from django.contrib import messages
-from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.mail import send_mail
-from django.db.models import Case, Count, Q, Value, When
-from django.http import HttpResponseRedirect
+from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.http import Http404, HttpResponse, HttpResponseRedirect, JsonResponse
 from django.template.loader import get_template
 from django.urls import reverse, reverse_lazy
 from django.utils import timezone
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import quote_etag
+from django.utils.translation import get_language
+from django.views import View
 from django.views.generic import DetailView, FormView, TemplateView, UpdateView
+from django_tables2 import SingleTableView, Table
 
+from . import kitchen, waiting_room
 from .forms import (
     DaySignupFormset,
     DaySignupFormsetHelper,
@@ -18,23 +32,51 @@ from .forms import (
     ParticipantFormSet,
     ParticipantFormSetHelper,
 )
-from .mixins import SignupStartedMixin
-from .models import ExtraParticipantInfo, Participant, Signup
+from .mixins import SignupStartedMixin, user_can_pre_signup
+from .models import DAYS, ExtraParticipantInfo, Participant, QueuedMail, Signup
 
 
 class HomePage(TemplateView):
+    """Landing page, refreshed constantly in the hour before the opening.
+
+    The countdown runs client side, so the anonymous page only changes when
+    the signup opens: it is rendered once per minute into the cache and
+    served with ``Cache-Control``/``ETag`` headers, without touching the
+    database.
+    """
+
     template_name = "signup2026/index.html"
+    anonymous_cache_seconds = 60
+
+    def get(self, request, *args, **kwargs):
+        if request.user.is_authenticated or get_messages(request):
+            return super().get(request, *args, **kwargs)
+
+        registration_open = timezone.now() >= settings.DYNAMOBILE_START_SIGNUP
+        key = f"signup2026:home:{get_language()}:{registration_open:d}"
+        content = cache.get(key)
+        if content is None:
+            response = super().get(request, *args, **kwargs)
+            content = response.render().content
+            cache.set(key, content, self.anonymous_cache_seconds)
+
+        max_age = self.anonymous_cache_seconds
+        if not registration_open:
+            # Do not let browsers keep the closed page past the opening.
+            time_remaining = settings.DYNAMOBILE_START_SIGNUP - timezone.now()
+            max_age = min(max_age, int(time_remaining.total_seconds()))
+        etag = quote_etag(hashlib.md5(content, usedforsecurity=False).hexdigest())
+        response = HttpResponse(content)
+        response.headers["ETag"] = etag
+        patch_cache_control(response, public=True, max_age=max_age)
+        patch_vary_headers(response, ["Cookie"])
+        return get_conditional_response(request, etag=etag, response=response)
 
     def get_context_data(self, **kwargs):
         kwargs = super().get_context_data(**kwargs)
-        user = self.request.user
-        can_pre_signup = (
-            user.is_authenticated
-            and user.groups.filter(name="préinscriptions").exists()
-        )
-        kwargs["registration_open"] = (
-            can_pre_signup or timezone.now() >= settings.DYNAMOBILE_START_SIGNUP
-        )
+        kwargs["registration_open"] = timezone.now() >= (
+            settings.DYNAMOBILE_START_SIGNUP
+        ) or user_can_pre_signup(self.request)
         time_remaining = settings.DYNAMOBILE_START_SIGNUP - timezone.now()
         kwargs["hours_remaining"] = int(time_remaining.total_seconds() // 3600)
         kwargs["minutes_remaining"] = int(time_remaining.total_seconds() // 60 % 60)
@@ -45,6 +87,49 @@ class HomePage(TemplateView):
         return kwargs
 
 
+class WaitingRoomView(TemplateView):
+    """Position in the queue of the ticket taken by the signup forms.
+
+    Without a ticket, the visitor is sent to the forms to take one.
+    """
+
+    template_name = "signup2026/waiting-room.html"
+
+    def get(self, request, *args, **kwargs):
+        admitted, position = waiting_room.status(request.session)
+        if admitted or position is None:
+            return HttpResponseRedirect(reverse("signup2026:group_edit"))
+        return self.render_to_response(
+            self.get_context_data(
+                position=position,
+                estimated_wait=waiting_room.estimated_wait(position),
+            )
+        )
+
+
+class WaitingRoomStatusView(View):
+    """Polled by the waiting room page: reads the session only, no database.
+
+    ``ticket`` is false when the session has no ticket; the page then goes
+    to the forms, which hand one out.
+    """
+
+    def get(self, request, *args, **kwargs):
+        admitted, position = waiting_room.status(request.session)
+        return JsonResponse(
+            {
+                "admitted": admitted,
+                "ticket": position is not None,
+                "position": position,
+                "estimated_wait": (
+                    None if position is None else waiting_room.estimated_wait(position)
+                ),
+                "next": reverse("signup2026:group_edit"),
+            },
+            headers={"Cache-Control": "no-store"},
+        )
+
+
 class CreateGroupView(SignupStartedMixin, FormView):
     template_name = "signup2026/create_group.html"
     success_url = reverse_lazy("signup2026:day_edit")
@@ -113,15 +198,18 @@ class GroupReviewView(SignupStartedMixin, UpdateView):
 
     def form_valid(self, form):
         signup = self.get_object()
-        signup.validated_at = timezone.now()
-        signup.check_if_on_hold()
-        signup.save()
+        with transaction.atomic():
+            signup.validated_at = timezone.now()
+            signup.check_if_on_hold()
+            signup.save()
+            if signup.on_hold_at:
+                signup.refresh_waiting_number()
         signup.calculate_amounts()
         email_context = {
             "signup": signup,
             "partial_open": settings.DYNAMOBILE_START_PARTIAL_SIGNUP,
         }
-        send_mail(
+        QueuedMail.objects.queue(
             subject="Votre inscription à dynamobile",
             message=get_template("signup2026/email/email.txt").render(email_context),
             from_email=settings.EMAIL_HOST_USER,
@@ -212,77 +300,66 @@ class FollowupExtraInfoView(LoginRequiredMixin, TemplateView):
 
 
 class KitchenView(TemplateView):
-    template_name = "signup/kitchen.html"
+    """Meals to plan per day and age band, see :mod:`signup2026.kitchen`."""
+
+    template_name = "signup2026/kitchen.html"
 
     def get_context_data(self, **context):
-        active = Participant.objects.with_age().filter(
-            signup_group__validated_at__isnull=False,
-            signup_group__on_hold_at__isnull=True,
-            signup_group__cancelled_at__isnull=True,
-        )
-        days = (
-            ("day1", "day 1"),
-            ("day2", "day 2"),
-            ("day3", "day 3"),
-            ("day4", "day 4"),
-            ("day5", "day 5"),
-            ("day6", "day 6"),
-            ("day7", "day 7"),
-            ("day8", "day 8"),
-            ("day9", "day 9"),
+        return super().get_context_data(**kitchen.counts(), **context)
+
+
+class MealForecastView(View):
+    """The kitchen counts as JSON, for the dashboards of the kitchen team.
+
+    The ``ETag`` is the kitchen data version, so a conditional request is
+    answered from the cache without counting anything.
+    """
+
+    def get(self, request, *args, **kwargs):
+        version = kitchen.data_version()
+        etag = quote_etag(version)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = JsonResponse(kitchen.forecast(version))
+        response.headers["ETag"] = etag
+        patch_cache_control(response, no_cache=True)
+        return response
+
+
+class AttendanceTable(Table):
+    class Meta:
+        model = Participant
+        fields = (
+            "signup_group_id",
+            "last_name",
+            "first_name",
+            "phone",
+            "vae",
+            "arrive_day_before",
+            "takes_car_back",
         )
-        context["days"] = {
-            label: {
-                k: v
-                for k, v in active.filter(
-                    **{field: True},
-                )
-                .values(
-                    age_group=Case(
-                        When(age__lte=6, then=Value("a0_6")),
-                        When(age__lte=12, then=Value("a6_12")),
-                        When(age__lt=18, then=Value("a12_18")),
-                        default=Value("a18plus"),
-                    ),
-                )
-                .annotate(participants=Count("age_group"))
-                .values_list("age_group", "participants")
-            }
-            for field, label in days
-        }
+        template_name = "django_tables2/bootstrap5.html"
 
-        for _, label in days:
-            total = sum(context["days"][label].values())
-            context["days"][label]["total"] = total
-            context["days"][label]["eaters"] = total - context["days"][label].get(
-                "a0_6", 0
-            )
 
-        context["total_signups"] = active.count()
-        context["total_vae"] = active.filter(vae=True).count()
-        context["total_partials"] = active.filter(
-            Q(day1=False)
-            | Q(day2=False)
-            | Q(day3=False)
-            | Q(day4=False)
-            | Q(day5=False)
-            | Q(day6=False)
-            | Q(day7=False)
-            | Q(day8=False)
-            | Q(day9=False)
-        ).count()
-        participants_this_year = Participant.objects.filter(
-            signup_group__validated_at__isnull=False,
+class AttendanceView(PermissionRequiredMixin, SingleTableView):
+    """Participants of validated signups coming on day ``day``, from 1."""
+
+    permission_required = "signup2026.view_participant"
+    template_name = "signup2026/participant_table.html"
+    table_class = AttendanceTable
+    table_pagination = False
+
+    def get_queryset(self):
+        day = self.kwargs["day"]
+        if not 1 <= day <= len(DAYS):
+            raise Http404
+        return (
+            Participant.objects.attending(day)
+            .filter(
+                signup_group__year=settings.DYNAMOBILE_LAST_DAY.year,
+                signup_group__validated_at__isnull=False,
+                signup_group__on_hold_at__isnull=True,
+                signup_group__cancelled_at__isnull=True,
+            )
+            .order_by("last_name", "first_name")
         )
-        context["total_on_hold"] = participants_this_year.filter(
-            signup_group__validated_at__isnull=False,
-            signup_group__on_hold_at__isnull=True,
-        ).count()
-        context["total_on_hold_vae"] = participants_this_year.filter(
-            signup_group__on_hold_vae=True
-        ).count()
-        context["total_on_hold_partial"] = participants_this_year.filter(
-            signup_group__on_hold_partial=True
-        ).count()
-
-        return super().get_context_data(**context)
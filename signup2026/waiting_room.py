@@ -0,0 +1,99 @@
+"""Admission control in front of the signup forms at the signup opening.
+
+Every logged-in visitor of the signup forms takes a numbered ticket, see
+:func:`admit`. Tickets are admitted
+at ``DYNAMOBILE_ADMISSIONS_PER_MINUTE`` from ``DYNAMOBILE_START_SIGNUP`` on, so
+the number of users filling in forms (and writing to SQLite) grows at a
+controlled pace instead of all at once. Once admitted, the session skips the
+queue for good. Outside of ``DYNAMOBILE_WAITING_ROOM_DURATION`` everybody is
+admitted right away.
+
+Tickets are numbered by a :class:`~signup2026.models.WaitingRoomCounter` row,
+incremented atomically in the database so that every worker draws from the
+same sequence. Only :func:`admit` writes to it: the waiting room page and its
+status endpoint read the ticket from the session.
+"""
+
+from math import ceil
+
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+
+from .models import WaitingRoomCounter
+
+TICKET_SALT = "signup2026.waiting_room"
+TICKET_SESSION_KEY = "waiting_room_ticket"
+ADMITTED_SESSION_KEY = "waiting_room_admitted"
+
+
+def is_open(now=None):
+    now = now or timezone.now()
+    start = settings.DYNAMOBILE_START_SIGNUP
+    return start <= now < start + settings.DYNAMOBILE_WAITING_ROOM_DURATION
+
+
+def admitted_up_to(now=None):
+    """Highest ticket number admitted so far.
+
+    The first minute worth of tickets is admitted at the opening.
+    """
+    now = now or timezone.now()
+    elapsed = (now - settings.DYNAMOBILE_START_SIGNUP).total_seconds()
+    rate = settings.DYNAMOBILE_ADMISSIONS_PER_MINUTE
+    return rate + int(max(elapsed, 0) * rate / 60)
+
+
+def take_ticket():
+    """Return the next ticket number of the current edition."""
+    return WaitingRoomCounter.take(settings.DYNAMOBILE_LAST_DAY.year)
+
+
+def get_ticket(session):
+    """Ticket number stored in the session, or ``None``."""
+    ticket = session.get(TICKET_SESSION_KEY)
+    if ticket is None:
+        return None
+    try:
+        return signing.loads(
+            ticket,
+            salt=TICKET_SALT,
+            max_age=settings.DYNAMOBILE_WAITING_ROOM_DURATION,
+        )
+    except signing.BadSignature:
+        return None
+
+
+def status(session, now=None):
+    """Admit the session if its turn has come, without taking a ticket.
+
+    Returns ``(admitted, position)``, where ``position`` is the number of
+    tickets still to be admitted before this one, or ``None`` if the session
+    has no ticket yet.
+    """
+    if session.get(ADMITTED_SESSION_KEY) or not is_open(now):
+        return True, 0
+    number = get_ticket(session)
+    if number is None:
+        return False, None
+    position = number - admitted_up_to(now)
+    if position <= 0:
+        session[ADMITTED_SESSION_KEY] = True
+        return True, 0
+    return False, position
+
+
+def admit(session, now=None):
+    """:func:`status`, giving the session a ticket first if it has none."""
+    if (
+        not session.get(ADMITTED_SESSION_KEY)
+        and is_open(now)
+        and get_ticket(session) is None
+    ):
+        session[TICKET_SESSION_KEY] = signing.dumps(take_ticket(), salt=TICKET_SALT)
+    return status(session, now)
+
+
+def estimated_wait(position):
+    """Estimated wait in minutes for ``position``."""
+    return ceil(position / settings.DYNAMOBILE_ADMISSIONS_PER_MINUTE)
@@ -1,5 +1,6 @@
 import pytest
 from django.conf import settings
+from django.core.cache import cache
 from model_bakery import baker
 from pytest_bdd import given
 
@@ -53,3 +54,14 @@ def use_dummy_cache_backend(settings):
         for x in settings.MIDDLEWARE
         if x != "whitenoise.middleware.WhiteNoiseMiddleware"
     ]
+
+
+@pytest.fixture
+def locmem_cache(settings):
+    """A real cache, for the tests of what is cached."""
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    yield
+    cache.clear()
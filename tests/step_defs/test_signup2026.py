@@ -1,6 +1,7 @@
 from datetime import timedelta
 
 import pytest
+from django.core.management import call_command
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.formats import date_format
@@ -230,6 +231,7 @@ def check_confirmation_message(response):
 
 @then('a confirmation email should have been sent to "test@example.com"')
 def check_confirmation_email(mailoutbox):
+    call_command("send_queued_mail")
     assert any("test@example.com" in m.to for m in mailoutbox)
 
 
@@ -311,6 +313,7 @@ def check_partial_date_visible(response, settings):
 
 @then("the confirmation email should mention the partial signup opening date")
 def check_partial_date_in_email(mailoutbox, settings):
+    call_command("send_queued_mail")
     expected = date_format(settings.DYNAMOBILE_START_PARTIAL_SIGNUP, use_l10n=True)
     confirmation = next(m for m in mailoutbox if "Votre inscription" in m.subject)
     html_body = confirmation.alternatives[0][0] if confirmation.alternatives else ""
@@ -1,3 +1,4 @@
+from django.core.management import call_command
 from django.urls import reverse
 from django.utils import timezone
 from model_bakery import baker
@@ -105,4 +106,5 @@ def check_amounts_calculated(on_hold_signup):
 
 @then('a confirmation email should be sent to "waiting@example.com"')
 def check_email_sent(mailoutbox):
+    call_command("send_queued_mail")
     assert any("waiting@example.com" in m.to for m in mailoutbox)
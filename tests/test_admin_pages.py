@@ -8,9 +8,11 @@ from decimal import Decimal
 
 import pytest
 from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
 from django.urls import reverse
 from model_bakery import baker
 
+from accounts.matching import refresh_suggestions
 from accounts.models import IncomeChoices, OperationValidation
 
 # ---------------------------------------------------------------------------
@@ -238,7 +240,8 @@ class TestOperationLinkToSignup2026:
 
     def test_changelist_shows_link_button_for_signup2026(self):
         signup = self._make_signup()
-        self._make_operation(signup.id, 200)
+        operation = self._make_operation(signup.id, 200)
+        refresh_suggestions([operation])
 
         response = get(self.client, reverse("admin:accounts_operation_changelist"))
         assert f"Link to #{signup.id}" in response.content.decode()
@@ -321,6 +324,7 @@ class TestOperationLinkToSignup2026:
             args=[operation.id, signup.id],
         )
         self.client.get(url)
+        call_command("send_queued_mail")
 
         assert len(mailoutbox) == 1
         assert "owner@example.com" in mailoutbox[0].to
@@ -348,6 +352,7 @@ class TestOperationLinkToSignup2026:
             args=[operation.id, signup.id],
         )
         self.client.get(url)
+        call_command("send_queued_mail")
 
         assert len(mailoutbox) == 0
         signup.refresh_from_db()
@@ -387,6 +392,7 @@ class TestSignup2026PaymentConfirmationButton:
         )
         response = self.client.post(url)
         assert response.status_code == 302
+        call_command("send_queued_mail")
 
         assert len(mailoutbox) == 1
         assert "user@example.com" in mailoutbox[0].to
@@ -413,6 +419,7 @@ class TestSignup2026PaymentConfirmationButton:
             kwargs={"pk": signup.pk, "tool": "send_payment_confirmation"},
         )
         self.client.post(url)
+        call_command("send_queued_mail")
 
         assert len(mailoutbox) == 1
         signup.refresh_from_db()
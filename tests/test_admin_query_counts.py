@@ -0,0 +1,69 @@
+"""The 2026 admin changelists render in a constant number of queries."""
+
+from datetime import date, timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+
+from signup2026.models import ExtraParticipantInfo, Participant, Signup
+
+CHANGELISTS = [
+    "admin:signup2026_participant_changelist",
+    "admin:signup2026_signup_changelist",
+    "admin:signup2026_extraparticipantinfo_changelist",
+    "admin:signup2026_waitinglistparticipant_changelist",
+]
+
+
+def make_signups(count):
+    validated = timezone.now() - timedelta(days=1)
+    for i in range(count):
+        signup = baker.make(
+            Signup,
+            year=2026,
+            validated_at=validated,
+            on_hold_at=validated if i % 2 else None,
+        )
+        participant = baker.make(
+            Participant, signup_group=signup, birthday=date(1980, 1, 1)
+        )
+        baker.make(ExtraParticipantInfo, participant=participant)
+
+
+def queries_for(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+@pytest.mark.parametrize("url_name", CHANGELISTS)
+def test_changelist_query_count_does_not_grow(admin_client, url_name, count_queries):
+    url = reverse(url_name)
+    make_signups(2)
+    admin_client.get(url)  # warm the content type cache
+    few_rows = queries_for(admin_client, url)
+
+    make_signups(20)
+    many_rows = queries_for(admin_client, url)
+
+    assert many_rows == few_rows
+
+
+@pytest.mark.django_db
+def test_participant_changelist_shows_age_and_signup(admin_client):
+    make_signups(1)
+    signup = Signup.objects.select_related("owner").get()
+
+    content = admin_client.get(
+        reverse("admin:signup2026_participant_changelist")
+    ).content.decode()
+
+    assert str(signup) in content
+    assert '<td class="field-age">46</td>' in content
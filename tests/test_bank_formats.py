@@ -0,0 +1,191 @@
+"""Tests for the CODA and camt.053 bank statement formats."""
+
+from datetime import datetime
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+
+from accounts.format import CAMT053, CODA
+from accounts.matching import parse_communication
+from accounts.models import Account
+
+
+def coda_record(*fields):
+    """128 characters record with ``(position, text)`` fields, 1-based."""
+    record = [" "] * 128
+    for position, text in fields:
+        record[position - 1 : position - 1 + len(text)] = text
+    return "".join(record)
+
+
+def coda_movement(sequence, sign, amount, communication, detail="0000"):
+    structured = communication.startswith("101")
+    return coda_record(
+        (1, "21"),
+        (3, f"{sequence:04d}"),
+        (7, detail),
+        (11, f"REF{sequence:018d}"),
+        (32, sign),
+        (33, f"{amount:015d}"),
+        (48, "020326"),
+        (54, "00150000"),
+        (62, "1" if structured else "0"),
+        (63, communication[:53]),
+        (116, "010326"),
+        (122, "042"),
+        (126, "1"),
+    )
+
+
+COMMUNICATION = "inscription 42 pour Jean et Marie Dupont, merci de bien confirmer"
+CODA_STATEMENT = [
+    coda_record((1, "0"), (6, "010326")),
+    coda_record(
+        (1, "12"),
+        (6, "BE71096123456769"),
+        (40, "EUR"),
+        (65, "Dynamobile ASBL"),
+    ),
+    coda_movement(1, "0", 125500, COMMUNICATION[:53]),
+    coda_record((1, "22"), (3, "0001"), (11, COMMUNICATION[53:])),
+    coda_record(
+        (1, "23"),
+        (3, "0001"),
+        (11, "BE62510007547061"),
+        (48, "Jean Dupont"),
+    ),
+    coda_movement(2, "1", 3000, "101000012345678"),
+    coda_movement(2, "1", 1000, "detail", detail="0001"),
+    coda_record((1, "8"), (2, "042")),
+    coda_record((1, "9")),
+]
+
+
+@pytest.mark.django_db
+def test_coda_movements():
+    rows = list(CODA().iter_rows(StringIO("\r\n".join(CODA_STATEMENT))))
+
+    account = Account.objects.get(IBAN="BE71096123456769")
+    assert account.name == "Dynamobile ASBL"
+    assert rows == [
+        (
+            account.id,
+            420001,
+            2026,
+            datetime(2026, 3, 1),
+            "Code 00150000",
+            Decimal("125.5"),
+            "EUR",
+            datetime(2026, 3, 2),
+            "BE62510007547061",
+            "Jean Dupont",
+            COMMUNICATION,
+            "REF000000000000000001",
+        ),
+        (
+            account.id,
+            420002,
+            2026,
+            datetime(2026, 3, 1),
+            "Code 00150000",
+            Decimal("-3"),
+            "EUR",
+            datetime(2026, 3, 2),
+            "",
+            "",
+            "+++000/0123/45678+++",
+            "REF000000000000000002",
+        ),
+    ]
+
+
+CAMT_STATEMENT = """<?xml version="1.0" encoding="UTF-8"?>
+<Document xmlns="urn:iso:std:iso:20022:tech:xsd:camt.053.001.02">
+  <BkToCstmrStmt>
+    <Stmt>
+      <Id>2026-042</Id>
+      <ElctrncSeqNb>42</ElctrncSeqNb>
+      <Acct>
+        <Id><IBAN>BE71096123456769</IBAN></Id>
+        <Ccy>EUR</Ccy>
+      </Acct>
+      <Ntry>
+        <NtryRef>1</NtryRef>
+        <Amt Ccy="EUR">125.50</Amt>
+        <CdtDbtInd>CRDT</CdtDbtInd>
+        <BookgDt><Dt>2026-03-01</Dt></BookgDt>
+        <ValDt><Dt>2026-03-02</Dt></ValDt>
+        <AcctSvcrRef>BANKREF1</AcctSvcrRef>
+        <NtryDtls>
+          <TxDtls>
+            <RltdPties>
+              <Dbtr><Nm>Jean Dupont</Nm></Dbtr>
+              <DbtrAcct><Id><IBAN>BE62510007547061</IBAN></Id></DbtrAcct>
+            </RltdPties>
+            <RmtInf>
+              <Strd><CdtrRefInf><Ref>000012345678</Ref></CdtrRefInf></Strd>
+            </RmtInf>
+          </TxDtls>
+        </NtryDtls>
+        <AddtlNtryInf>Virement SEPA</AddtlNtryInf>
+      </Ntry>
+      <Ntry>
+        <Amt Ccy="EUR">3.00</Amt>
+        <CdtDbtInd>DBIT</CdtDbtInd>
+        <BookgDt><Dt>2026-03-04</Dt></BookgDt>
+        <NtryDtls>
+          <TxDtls>
+            <RltdPties><Cdtr><Nm>Banque</Nm></Cdtr></RltdPties>
+            <RmtInf><Ustrd>Frais</Ustrd><Ustrd>mars</Ustrd></RmtInf>
+          </TxDtls>
+        </NtryDtls>
+      </Ntry>
+    </Stmt>
+  </BkToCstmrStmt>
+</Document>
+"""
+
+
+@pytest.mark.django_db
+def test_camt053_entries():
+    dataset = CAMT053().create_dataset(CAMT_STATEMENT)
+
+    account = Account.objects.get(IBAN="BE71096123456769")
+    assert list(dataset) == [
+        (
+            account.id,
+            420001,
+            2026,
+            datetime(2026, 3, 1),
+            "Virement SEPA",
+            Decimal("125.50"),
+            "EUR",
+            datetime(2026, 3, 2),
+            "BE62510007547061",
+            "Jean Dupont",
+            "+++000/0123/45678+++",
+            "BANKREF1",
+        ),
+        (
+            account.id,
+            420002,
+            2026,
+            datetime(2026, 3, 4),
+            "",
+            Decimal("-3.00"),
+            "EUR",
+            datetime(2026, 3, 4),
+            "",
+            "Banque",
+            "Frais\nmars",
+            "",
+        ),
+    ]
+
+
+def test_structured_communications_are_not_signup_numbers():
+    candidates = parse_communication("+++000/0123/45678+++")
+
+    assert candidates.signup_id is None
+    assert candidates.expense_report_title is None
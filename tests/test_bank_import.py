@@ -0,0 +1,72 @@
+"""Tests for the streaming import of bank statements."""
+
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from model_bakery import baker
+
+from accounts.format import BPostCSV, FortisCSV
+from accounts.models import Account, Operation, ReconciliationSuggestion
+
+
+def bpost_statement(path, numbers, communication="loyer"):
+    lines = [";BE71096123456769;Compte courant", "header"]
+    lines += [
+        f"{number};2026-03-01;Virement;12,50;EUR;2026-03-02;BE62510007547061;"
+        f"Jean;{communication};REF{number};"
+        for number in numbers
+    ]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+@pytest.mark.django_db
+def test_command_streams_new_operations_and_skips_known_ones(tmp_path, capsys):
+    signup = baker.make("signup2026.Signup", year=2026)
+    statement = bpost_statement(
+        tmp_path / "bpost.csv", range(1, 6), f"inscription {signup.id}"
+    )
+
+    call_command("import_bank_statement", statement, format_name="bpost", batch_size=2)
+
+    assert "5 new operations, 0 skipped" in capsys.readouterr().out
+    operation = Operation.objects.get(number=3)
+    assert operation.account == Account.objects.get(IBAN="BE71096123456769")
+    assert operation.amount == Decimal("12.50")
+    assert operation.communication == f"inscription {signup.id}"
+    assert ReconciliationSuggestion.objects.filter(object_id=signup.id).count() == 5
+
+    bpost_statement(statement, range(4, 8))
+    call_command("import_bank_statement", statement, format_name="bpost", batch_size=2)
+
+    assert "2 new operations, 2 skipped" in capsys.readouterr().out
+    assert Operation.objects.count() == 7
+
+
+@pytest.mark.django_db
+def test_admin_dataset_is_built_from_the_same_rows(tmp_path):
+    statement = bpost_statement(tmp_path / "bpost.csv", [1, 2])
+
+    dataset = BPostCSV().create_dataset(statement.read_text(encoding="utf-8"))
+
+    assert dataset.headers[:3] == ["account", "number", "year"]
+    assert dataset["amount"] == [Decimal("12.50"), Decimal("12.50")]
+
+
+@pytest.mark.django_db
+def test_fortis_rows_without_number_are_skipped(monkeypatch):
+    monkeypatch.setattr(FortisCSV, "_account_ids", {})
+    lines = [
+        "header",
+        "2026-0001;01/03/2026;02/03/2026;-10,00;EUR;BE71096123456769;"
+        "Virement;BE62510007547061;Jean;loyer;Loyer mars;;",
+        "2026-;01/03/2026;02/03/2026;5,00;EUR;BE71096123456769;"
+        "Virement;;;;En attente;;",
+    ]
+
+    rows = list(FortisCSV().iter_rows(iter(lines)))
+
+    assert len(rows) == 1
+    assert rows[0][1] == "0001"
+    assert rows[0][5] == Decimal("-10.00")
@@ -0,0 +1,71 @@
+"""Tests for confirming a bank statement import from the parsed preview."""
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+
+from accounts.format import BPostCSV
+from accounts.models import Operation
+
+STATEMENT = "\n".join(
+    [
+        ";BE71096123456769;Compte courant",
+        "header",
+        "1;2026-03-01;Virement;12,50;EUR;2026-03-02;BE62510007547061;Jean;loyer;R1;",
+        "2;2026-03-02;Virement;-3,00;EUR;2026-03-02;BE62510007547061;Jean;frais;R2;",
+    ]
+)
+
+
+@pytest.fixture
+def parsed_rows(monkeypatch):
+    """Count the statements parsed."""
+    calls = []
+    iter_rows = BPostCSV.iter_rows
+
+    def counting_iter_rows(self, lines):
+        calls.append(self)
+        return iter_rows(self, lines)
+
+    monkeypatch.setattr(BPostCSV, "iter_rows", counting_iter_rows)
+    return calls
+
+
+def preview_and_confirm(client):
+    response = client.post(
+        reverse("admin:accounts_operation_import"),
+        {
+            "format": "0",
+            "import_file": SimpleUploadedFile(
+                "bpost.csv", STATEMENT.encode(), content_type="text/csv"
+            ),
+        },
+    )
+    assert response.status_code == 200
+    confirm_form = response.context["confirm_form"]
+    assert confirm_form.initial["file_hash"]
+    assert not Operation.objects.exists()
+
+    response = client.post(
+        reverse("admin:accounts_operation_process_import"), confirm_form.initial
+    )
+    assert response.status_code == 302
+    return confirm_form.initial
+
+
+@pytest.mark.django_db
+def test_confirm_imports_the_rows_parsed_for_the_preview(
+    admin_client, parsed_rows, locmem_cache
+):
+    preview_and_confirm(admin_client)
+
+    assert len(parsed_rows) == 1
+    assert sorted(Operation.objects.values_list("number", flat=True)) == [1, 2]
+
+
+@pytest.mark.django_db
+def test_confirm_parses_the_file_again_without_cache(admin_client, parsed_rows):
+    preview_and_confirm(admin_client)
+
+    assert len(parsed_rows) == 2
+    assert Operation.objects.count() == 2
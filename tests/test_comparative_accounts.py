@@ -0,0 +1,113 @@
+"""Tests for the multi-year comparative accounts and their exports."""
+
+import csv
+import datetime
+from decimal import Decimal
+from io import BytesIO, StringIO
+
+import pytest
+from django.urls import reverse
+from model_bakery import baker
+from openpyxl import load_workbook
+
+from accounts.models import (
+    ExpenditureChoices,
+    IncomeChoices,
+    Operation,
+    OperationValidation,
+)
+from accounts.reports import ComparativeReport
+
+
+def validate(day, amount, validation_type):
+    operation = baker.make(Operation, year=day.year, date=day, amount=Decimal(amount))
+    OperationValidation.objects.create(
+        operation=operation, amount=Decimal(amount), validation_type=validation_type
+    )
+
+
+@pytest.fixture
+def ledger(db):
+    validate(datetime.date(2025, 3, 1), "100", IncomeChoices.SIGNUP)
+    validate(datetime.date(2026, 3, 1), "80", IncomeChoices.SIGNUP)
+    validate(datetime.date(2026, 4, 1), "40", IncomeChoices.SIGNUP)
+    validate(datetime.date(2026, 4, 2), "-30", ExpenditureChoices.POST)
+    validate(datetime.date(2027, 1, 1), "1000", IncomeChoices.DONATION)
+
+
+def by_code(rows):
+    return {(row[0], row[1]): row[2:] for row in rows}
+
+
+def test_yearly_report(ledger):
+    report = ComparativeReport(2025, 2026)
+
+    rows = by_code(report.rows())
+
+    assert report.header() == ["code", "libellé", "2025", "2026", "total"]
+    assert rows[(IncomeChoices.SIGNUP, "INSCRIPTIONS")] == [100, 120, 220]
+    assert rows[(IncomeChoices.DONATION, "DONS")] == [0, 0, 0]
+    assert rows[(ExpenditureChoices.POST, "POSTE")] == [0, -30, -30]
+    assert rows[("", "TOTAL DES CHARGES")] == [0, -30, -30]
+    assert rows[("", "TOTAL DES PRODUITS")] == [100, 120, 220]
+    assert rows[("", "BÉNÉFICE / PERTE")] == [100, 90, 190]
+
+
+def test_monthly_report(ledger):
+    report = ComparativeReport(2026, 2026, by_month=True)
+
+    rows = by_code(report.rows())
+
+    assert report.header()[2:5] == ["janv. 2026", "févr. 2026", "mars 2026"]
+    signups = rows[(IncomeChoices.SIGNUP, "INSCRIPTIONS")]
+    assert signups[2:4] == [80, 40]
+    assert signups[-1] == 120
+
+
+def test_csv_export_is_streamed(admin_client, ledger, django_assert_max_num_queries):
+    url = reverse("comparative_accounts", args=[2025, 2026])
+
+    with django_assert_max_num_queries(4):
+        response = admin_client.get(url, {"format": "csv"})
+        content = b"".join(response.streaming_content).decode()
+
+    assert response["Content-Type"] == "text/csv"
+    rows = list(csv.reader(StringIO(content)))
+    assert rows[0] == ["code", "libellé", "2025", "2026", "total"]
+    assert ["7000", "INSCRIPTIONS", "100.00", "120.00", "220.00"] in rows
+
+
+def test_xlsx_export(admin_client, ledger):
+    url = reverse("comparative_accounts", args=[2025, 2026])
+
+    response = admin_client.get(url, {"format": "xlsx", "period": "month"})
+
+    assert response.streaming
+    assert 'filename="comptes_2025_2026.xlsx"' in response["Content-Disposition"]
+    sheet = load_workbook(BytesIO(b"".join(response.streaming_content))).active
+    rows = list(sheet.values)
+    assert len(rows[0]) == 2 + 24 + 1
+    signups = next(row for row in rows if row[0] == IncomeChoices.SIGNUP)
+    assert signups[-1] == 220
+
+
+def test_html_report(admin_client, ledger):
+    response = admin_client.get(reverse("comparative_accounts", args=[2025, 2026]))
+
+    assert response.status_code == 200
+    assert "INSCRIPTIONS" in response.content.decode()
+
+
+def test_unknown_validation_types_are_reported_as_others(ledger):
+    validate(datetime.date(2026, 5, 1), "15", "9999")
+
+    rows = by_code(ComparativeReport(2025, 2026).rows())
+
+    assert rows[("", "AUTRES")] == [0, 15, 15]
+    assert rows[("", "BÉNÉFICE / PERTE")] == [100, 105, 205]
+
+
+def test_reversed_year_range_is_rejected(admin_client, ledger):
+    response = admin_client.get(reverse("comparative_accounts", args=[2026, 2025]))
+
+    assert response.status_code == 400
@@ -0,0 +1,177 @@
+"""Tests for the XLSX exports rendered by the background worker."""
+
+import datetime
+from io import BytesIO
+
+import pytest
+from django.contrib import admin
+from django.contrib.auth.models import Permission
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from import_export.formats.base_formats import XLSX
+from model_bakery import baker
+from openpyxl import load_workbook
+
+from accounts.models import Operation, OperationValidation
+from signup2026.models import ExportJob, Participant, Signup
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def participants(db):
+    signup = baker.make("signup2026.Signup", year=2026)
+    return baker.make(Participant, signup_group=signup, _quantity=3)
+
+
+def request_export(client, query=""):
+    formats = admin.site._registry[Participant].get_export_formats()
+    data = {
+        "format": next(index for index, f in enumerate(formats) if f is XLSX),
+        "resource": 0,
+        "participantresource_id": "on",
+        "participantresource_first_name": "on",
+    }
+    url = reverse("admin:signup2026_participant_export") + query
+    response = client.post(url, data)
+    assert response.status_code == 302
+    return ExportJob.objects.get(pk=response.url.split("/")[-3])
+
+
+def test_export_is_rendered_by_the_worker(admin_client, participants):
+    job = request_export(admin_client)
+    assert job.status == ExportJob.Status.PENDING
+    assert job.export_fields == ["id", "first_name"]
+    response = admin_client.get(
+        reverse("admin:signup2026_exportjob_status", args=[job.pk])
+    )
+    assert b'http-equiv="refresh"' in response.content
+
+    call_command("run_export_jobs", chunk_size=2)
+
+    job.refresh_from_db()
+    assert job.status == ExportJob.Status.DONE
+    assert (job.progress, job.total) == (3, 3)
+    response = admin_client.get(
+        reverse("admin:signup2026_exportjob_status", args=[job.pk])
+    )
+    assert b'http-equiv="refresh"' not in response.content
+    response = admin_client.get(
+        reverse("admin:signup2026_exportjob_download", args=[job.pk])
+    )
+    rows = list(
+        load_workbook(BytesIO(b"".join(response.streaming_content))).active.values
+    )
+    assert rows[0] == ("id", "first_name")
+    assert sorted(rows[1:]) == sorted((p.id, p.first_name) for p in participants)
+
+
+def test_export_is_reused_until_the_data_changes(
+    admin_client, participants, django_capture_on_commit_callbacks
+):
+    job = request_export(admin_client)
+    assert request_export(admin_client) == job
+    assert request_export(admin_client, "?vae__exact=1") != job
+    call_command("run_export_jobs")
+    assert request_export(admin_client) == job
+
+    with django_capture_on_commit_callbacks(execute=True):
+        participants[0].first_name = "Changed"
+        participants[0].save()
+
+    new_job = request_export(admin_client)
+    assert new_job != job
+    call_command("run_export_jobs")
+    assert not ExportJob.objects.filter(pk=job.pk).exists()
+
+
+def test_filters_of_the_changelist_apply(admin_client, participants):
+    Participant.objects.filter(pk=participants[0].pk).update(vae=True)
+
+    job = request_export(admin_client, "?vae__exact=1")
+    call_command("run_export_jobs")
+
+    job.refresh_from_db()
+    assert job.total == 1
+
+
+def test_export_is_not_shared_between_users(
+    admin_client, admin_user, django_user_model, participants
+):
+    job = request_export(admin_client)
+    other = Client()
+    other.force_login(
+        django_user_model.objects.create_superuser("other", "other@example.com")
+    )
+
+    assert request_export(other) != job
+
+
+def test_stale_running_export_is_not_reused(admin_client, participants):
+    job = request_export(admin_client)
+    ExportJob.objects.filter(pk=job.pk).update(
+        status=ExportJob.Status.RUNNING,
+        started_at=timezone.now() - ExportJob.RUNNING_TIMEOUT * 2,
+    )
+
+    assert request_export(admin_client) != job
+    job.refresh_from_db()
+    assert job.status == ExportJob.Status.FAILED
+
+
+def test_status_requires_the_export_permission(
+    admin_client, django_user_model, participants, settings
+):
+    settings.IMPORT_EXPORT_EXPORT_PERMISSION_CODE = "view"
+    job = request_export(admin_client)
+    staff = django_user_model.objects.create(username="staff", is_staff=True)
+    staff.user_permissions.add(Permission.objects.get(codename="view_exportjob"))
+    client = Client()
+    client.force_login(staff)
+    url = reverse("admin:signup2026_exportjob_status", args=[job.pk])
+
+    assert client.get(url).status_code == 403
+
+    staff.user_permissions.add(
+        Permission.objects.get(
+            content_type__app_label="signup2026", codename="view_participant"
+        )
+    )
+    assert client.get(url).status_code == 200
+
+
+@pytest.fixture
+def done_job(db):
+    return ExportJob.objects.create(
+        key="participants",
+        content_type=ContentType.objects.get_for_model(Participant),
+        status=ExportJob.Status.DONE,
+    )
+
+
+def test_reprice_outdates_the_exports(
+    done_job, participants, django_capture_on_commit_callbacks
+):
+    Participant.objects.update(birthday=datetime.date(1980, 1, 1))
+    with django_capture_on_commit_callbacks(execute=True):
+        Signup.objects.calculate_amounts()
+
+    done_job.refresh_from_db()
+    assert done_job.outdated
+
+
+def test_payment_outdates_the_exports(done_job, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        OperationValidation.objects.bulk_create(
+            [OperationValidation(operation=baker.make(Operation), amount=10)]
+        )
+
+    done_job.refresh_from_db()
+    assert done_job.outdated
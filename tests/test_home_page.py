@@ -0,0 +1,65 @@
+"""Tests for the caching of the 2026 landing page."""
+
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import Group
+from django.urls import reverse
+from django.utils import timezone
+
+
+@pytest.fixture
+def signup_closed(settings):
+    settings.DYNAMOBILE_START_SIGNUP = timezone.now() + timedelta(hours=1)
+
+
+@pytest.mark.django_db
+def test_anonymous_home_page_makes_no_queries(
+    client, locmem_cache, signup_closed, django_assert_num_queries
+):
+    with django_assert_num_queries(0):
+        response = client.get(reverse("signup2026:home"))
+
+    assert response.status_code == 200
+    assert 'id="countdown"' in response.content.decode()
+    assert "public" in response["Cache-Control"]
+    assert 0 < int(response["Cache-Control"].split("max-age=")[1]) <= 60
+
+
+@pytest.mark.django_db
+def test_anonymous_home_page_is_revalidated_with_etag(
+    client, locmem_cache, signup_closed
+):
+    etag = client.get(reverse("signup2026:home"))["ETag"]
+
+    response = client.get(reverse("signup2026:home"), headers={"if-none-match": etag})
+
+    assert response.status_code == 304
+
+
+@pytest.mark.django_db
+def test_home_page_changes_at_the_opening(client, locmem_cache, settings):
+    settings.DYNAMOBILE_START_SIGNUP = timezone.now() + timedelta(hours=1)
+    closed = client.get(reverse("signup2026:home"))
+
+    settings.DYNAMOBILE_START_SIGNUP = timezone.now() - timedelta(seconds=1)
+    opened = client.get(reverse("signup2026:home"))
+
+    assert closed["ETag"] != opened["ETag"]
+    assert reverse("signup2026:group_edit") in opened.content.decode()
+
+
+@pytest.mark.django_db
+def test_pre_signup_flag_is_kept_in_the_session(
+    client, django_user_model, signup_closed, django_assert_num_queries
+):
+    user = django_user_model.objects.create(username="pre", email="pre@x")
+    Group.objects.create(name="préinscriptions").user_set.add(user)
+    client.force_login(user)
+
+    first = client.get(reverse("signup2026:home"))
+    with django_assert_num_queries(1):  # loading the user from the session
+        second = client.get(reverse("signup2026:home"))
+
+    assert first.context["registration_open"]
+    assert second.context["registration_open"]
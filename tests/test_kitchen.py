@@ -0,0 +1,130 @@
+"""Tests for the kitchen counts per day and age band."""
+
+import datetime
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+
+from signup2026.models import Participant, Signup
+
+
+def make_participant(signup, age, **days):
+    last_day = datetime.date(2026, 7, 25)
+    return baker.make(
+        Participant,
+        signup_group=signup,
+        birthday=last_day.replace(year=last_day.year - age),
+        **days,
+    )
+
+
+@pytest.fixture
+def signups(db):
+    now = timezone.now()
+    active = baker.make(Signup, year=2026, validated_at=now)
+    make_participant(active, 4)
+    make_participant(active, 6, vae=True)
+    make_participant(active, 12, day2=False)
+    make_participant(active, 17)
+    make_participant(active, 40, arrive_day_before=True, takes_car_back="namur")
+    on_hold = baker.make(
+        Signup, year=2026, validated_at=now, on_hold_at=now, on_hold_vae=True
+    )
+    make_participant(on_hold, 40)
+    make_participant(baker.make(Signup, year=2026), 40)
+    return active
+
+
+def test_counts_in_one_query(signups, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        counts = Participant.objects.kitchen_counts()
+
+    assert counts["days"]["day 1"] == {
+        "a0_6": 2,
+        "a6_12": 1,
+        "a12_18": 1,
+        "a18plus": 1,
+        "total": 5,
+        "eaters": 3,
+    }
+    assert counts["days"]["day 2"]["a6_12"] == 0
+    assert counts["days"]["day 2"]["total"] == 4
+    assert counts["total_signups"] == 5
+    assert counts["total_vae"] == 1
+    assert counts["total_partials"] == 1
+    assert counts["total_on_hold"] == 5
+    assert counts["total_on_hold_vae"] == 1
+    assert counts["total_on_hold_partial"] == 0
+    assert counts["arrive_day_before"] == 1
+    assert counts["takes_car_back"] == {"brussels": 0, "namur": 1}
+
+
+def test_cached_until_a_participant_changes(
+    client,
+    signups,
+    locmem_cache,
+    django_assert_num_queries,
+    django_capture_on_commit_callbacks,
+):
+    url = reverse("signup2026:kitchen")
+    client.get(url)
+
+    with django_assert_num_queries(0):
+        response = client.get(url)
+    assert response.context["total_signups"] == 5
+
+    with django_capture_on_commit_callbacks(execute=True):
+        make_participant(signups, 30)
+    response = client.get(url)
+    assert response.context["total_signups"] == 6
+
+    with django_capture_on_commit_callbacks(execute=True):
+        signups.cancelled_at = timezone.now()
+        signups.save()
+    response = client.get(url)
+    assert response.context["total_signups"] == 0
+
+
+def test_meal_forecast_answers_conditional_requests(
+    client,
+    signups,
+    locmem_cache,
+    settings,
+    django_assert_num_queries,
+    django_capture_on_commit_callbacks,
+):
+    settings.DYNAMOBILE_MAX_EATERS = 2
+    url = reverse("signup2026:meal_forecast")
+
+    response = client.get(url)
+
+    forecast = response.json()
+    assert forecast["max_eaters"] == 2
+    assert forecast["days"][0] == {
+        "date": "2026-07-17",
+        "label": "day 1",
+        "a0_6": 2,
+        "a6_12": 1,
+        "a12_18": 1,
+        "a18plus": 1,
+        "total": 5,
+        "eaters": 3,
+        "over_capacity": True,
+    }
+    assert forecast["days"][1]["over_capacity"] is False
+    assert forecast["arrive_day_before"] == 1
+    assert forecast["takes_car_back"] == {"brussels": 0, "namur": 1}
+
+    etag = response["ETag"]
+    with django_assert_num_queries(0):
+        response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    with django_capture_on_commit_callbacks(execute=True):
+        make_participant(signups, 30)
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+    assert response.json()["days"][0]["a18plus"] == 2
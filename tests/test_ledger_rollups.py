@@ -0,0 +1,131 @@
+"""Tests for the monthly ledger rollups behind the annual accounts."""
+
+import datetime
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from model_bakery import baker
+
+from accounts.models import (
+    ExpenditureChoices,
+    IncomeChoices,
+    LedgerRollup,
+    Operation,
+    OperationValidation,
+)
+
+
+def make_operation(amount, month=3, day=1):
+    return baker.make(
+        Operation,
+        year=2026,
+        date=datetime.date(2026, month, day),
+        amount=Decimal(amount),
+    )
+
+
+def rollups():
+    return sorted(
+        LedgerRollup.objects.values_list(
+            "year", "month", "validation_type", "amount", "count"
+        )
+    )
+
+
+@pytest.mark.django_db
+def test_rollups_follow_the_validations():
+    march = make_operation("100")
+    april = make_operation("-30", month=4)
+
+    validation = OperationValidation.objects.create(
+        operation=march, amount=Decimal("100"), validation_type=IncomeChoices.SIGNUP
+    )
+    OperationValidation.objects.bulk_create(
+        [
+            OperationValidation(
+                operation=april,
+                amount=Decimal("-30"),
+                validation_type=ExpenditureChoices.POST,
+            )
+        ]
+    )
+    assert rollups() == [
+        (2026, 3, IncomeChoices.SIGNUP, Decimal("100"), 1),
+        (2026, 4, ExpenditureChoices.POST, Decimal("-30"), 1),
+    ]
+
+    validation.operation = april
+    validation.save()
+    assert rollups() == [
+        (2026, 4, ExpenditureChoices.POST, Decimal("-30"), 1),
+        (2026, 4, IncomeChoices.SIGNUP, Decimal("100"), 1),
+    ]
+
+    OperationValidation.objects.filter(validation_type=ExpenditureChoices.POST).update(
+        amount=Decimal("-25")
+    )
+    validation.delete()
+    assert rollups() == [(2026, 4, ExpenditureChoices.POST, Decimal("-25"), 1)]
+
+
+@pytest.mark.django_db
+def test_rollups_follow_the_operations():
+    operation = make_operation("10")
+    OperationValidation.objects.create(
+        operation=operation, amount=Decimal("10"), validation_type=IncomeChoices.SIGNUP
+    )
+
+    operation.date = datetime.date(2026, 5, 1)
+    operation.save()
+    assert rollups() == [(2026, 5, IncomeChoices.SIGNUP, Decimal("10"), 1)]
+
+    operation.delete()
+    assert rollups() == []
+
+
+@pytest.mark.django_db
+def test_rebuild_command():
+    operation = make_operation("100", month=12, day=31)
+    OperationValidation.objects.create(
+        operation=operation, amount=Decimal("60"), validation_type=IncomeChoices.SIGNUP
+    )
+    OperationValidation.objects.create(
+        operation=operation,
+        amount=Decimal("40"),
+        validation_type=IncomeChoices.DONATION,
+    )
+    expected = rollups()
+    LedgerRollup.objects.all().delete()
+
+    call_command("rebuild_ledger_rollups")
+
+    assert rollups() == expected
+    assert len(expected) == 2
+
+
+@pytest.mark.django_db
+def test_annual_accounts_read_the_rollups(admin_client, django_assert_max_num_queries):
+    signup = make_operation("100")
+    OperationValidation.objects.create(
+        operation=signup, amount=Decimal("100"), validation_type=IncomeChoices.SIGNUP
+    )
+    make_operation("50")
+    make_operation("-20")
+    next_year = baker.make(
+        Operation, year=2027, date=datetime.date(2027, 1, 1), amount=Decimal("10")
+    )
+    OperationValidation.objects.create(
+        operation=next_year,
+        amount=Decimal("10"),
+        validation_type=IncomeChoices.SIGNUP,
+    )
+
+    with django_assert_max_num_queries(6):
+        response = admin_client.get(reverse("annual_accounts", args=[2026]))
+
+    assert response.status_code == 200
+    assert response.context["total_incomes"] == Decimal("100")
+    assert response.context["positive_pending_transactions"] == Decimal("50")
+    assert response.context["negative_pending_transactions"] == Decimal("-20")
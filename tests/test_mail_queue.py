@@ -0,0 +1,118 @@
+"""Tests for the persistent outbox used for the signup emails."""
+
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from signup2026.models import QueuedMail
+
+
+def queue_mail(**kwargs):
+    defaults = {
+        "subject": "Votre inscription à dynamobile",
+        "message": "texte",
+        "from_email": "inscriptions@dynamobile.net",
+        "recipient_list": ["owner@example.com"],
+        "html_message": "<p>html</p>",
+    }
+    defaults.update(kwargs)
+    return QueuedMail.objects.queue(**defaults)
+
+
+@pytest.mark.django_db
+def test_queue_does_not_send_immediately(mailoutbox):
+    queue_mail()
+
+    assert len(mailoutbox) == 0
+    assert QueuedMail.objects.pending().count() == 1
+
+
+@pytest.mark.django_db
+def test_worker_sends_queued_mail_with_html_alternative(mailoutbox):
+    mail = queue_mail()
+
+    call_command("send_queued_mail")
+
+    assert len(mailoutbox) == 1
+    assert mailoutbox[0].to == ["owner@example.com"]
+    assert mailoutbox[0].alternatives[0][0] == "<p>html</p>"
+    mail.refresh_from_db()
+    assert mail.sent_at is not None
+    assert QueuedMail.objects.pending().count() == 0
+
+
+@pytest.mark.django_db
+def test_worker_sends_in_batches(mailoutbox):
+    for i in range(5):
+        queue_mail(recipient_list=[f"p{i}@example.com"])
+
+    assert QueuedMail.objects.send_due(batch_size=2) == (2, 0)
+    call_command("send_queued_mail", batch_size=2)
+
+    assert len(mailoutbox) == 5
+
+
+@pytest.mark.django_db
+def test_failed_mail_is_retried_with_backoff(mailoutbox):
+    mail = queue_mail()
+
+    with mock.patch(
+        "django.core.mail.backends.locmem.EmailBackend.send_messages",
+        side_effect=ConnectionError("smtp down"),
+    ):
+        assert QueuedMail.objects.send_due() == (0, 1)
+
+    mail.refresh_from_db()
+    assert mail.attempts == 1
+    assert mail.next_attempt_at > timezone.now()
+    assert "smtp down" in mail.last_error
+    # Not due yet: the worker leaves it alone until the backoff expires.
+    assert QueuedMail.objects.send_due() == (0, 0)
+
+    QueuedMail.objects.update(next_attempt_at=timezone.now())
+    assert QueuedMail.objects.send_due() == (1, 0)
+    assert len(mailoutbox) == 1
+
+
+@pytest.mark.django_db
+def test_mail_is_given_up_after_max_attempts():
+    mail = queue_mail()
+    mail.attempts = QueuedMail.MAX_ATTEMPTS - 1
+    mail.save()
+
+    mail.record_failure(ConnectionError("smtp down"))
+
+    assert mail.failed_at is not None
+    assert QueuedMail.objects.pending().count() == 0
+
+
+@pytest.mark.django_db
+def test_unreachable_server_reschedules_the_batch(mailoutbox):
+    mail = queue_mail()
+
+    with mock.patch(
+        "django.core.mail.backends.locmem.EmailBackend.open",
+        side_effect=ConnectionRefusedError("smtp down"),
+    ):
+        assert QueuedMail.objects.send_due() == (0, 1)
+
+    mail.refresh_from_db()
+    assert mail.attempts == 1
+    assert mail.sent_at is None
+    assert "smtp down" in mail.last_error
+
+
+@pytest.mark.django_db
+def test_claimed_mail_is_not_sent_by_another_worker(mailoutbox):
+    queue_mail()
+
+    assert len(QueuedMail.objects.claim(batch_size=10)) == 1
+    assert QueuedMail.objects.claim(batch_size=10) == []
+    assert QueuedMail.objects.send_due() == (0, 0)
+
+    # The lease expires if the worker died before sending it.
+    QueuedMail.objects.update(next_attempt_at=timezone.now())
+    assert QueuedMail.objects.send_due() == (1, 0)
+    assert len(mailoutbox) == 1
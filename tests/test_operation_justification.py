@@ -0,0 +1,107 @@
+"""Tests for the justified amount stored on bank operations."""
+
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from model_bakery import baker
+
+from accounts.models import Operation, OperationValidation
+
+
+def make_operation(amount="100", **kwargs):
+    return baker.make(Operation, year=2026, amount=Decimal(amount), **kwargs)
+
+
+def justification(operation):
+    operation.refresh_from_db()
+    return operation.justified_amount, operation.justified
+
+
+@pytest.mark.django_db
+def test_saving_and_deleting_validations_updates_the_operation():
+    operation = make_operation()
+    assert justification(operation) == (None, None)
+
+    validation = OperationValidation.objects.create(
+        operation=operation, amount=Decimal("60")
+    )
+    assert justification(operation) == (Decimal("-40"), False)
+
+    OperationValidation.objects.create(operation=operation, amount=Decimal("40"))
+    assert justification(operation) == (Decimal("0"), True)
+
+    validation.amount = Decimal("50")
+    validation.save()
+    assert justification(operation) == (Decimal("-10"), False)
+
+    OperationValidation.objects.filter(operation=operation).delete()
+    assert justification(operation) == (None, None)
+
+
+@pytest.mark.django_db
+def test_moving_a_validation_updates_both_operations():
+    first = make_operation()
+    second = make_operation()
+    OperationValidation.objects.create(operation=first, amount=Decimal("100"))
+
+    validation = OperationValidation.objects.get()
+    validation.operation = second
+    validation.save()
+
+    assert justification(first) == (None, None)
+    assert justification(second) == (Decimal("0"), True)
+
+
+@pytest.mark.django_db
+def test_bulk_writes_update_the_operations():
+    first = make_operation()
+    second = make_operation("50")
+
+    OperationValidation.objects.bulk_create(
+        [
+            OperationValidation(operation=first, amount=Decimal("100")),
+            OperationValidation(operation=second, amount=Decimal("20")),
+        ]
+    )
+    assert justification(first) == (Decimal("0"), True)
+    assert justification(second) == (Decimal("-30"), False)
+
+    OperationValidation.objects.filter(operation=second).update(amount=Decimal("50"))
+    assert justification(second) == (Decimal("0"), True)
+
+    OperationValidation.objects.filter(operation=second).update(operation=first)
+    assert justification(first) == (Decimal("50"), False)
+    assert justification(second) == (None, None)
+
+    validations = list(OperationValidation.objects.order_by("id"))
+    validations[1].operation = second
+    OperationValidation.objects.bulk_update(validations, ["operation"])
+    assert justification(first) == (Decimal("0"), True)
+    assert justification(second) == (Decimal("0"), True)
+
+
+@pytest.mark.django_db
+def test_refresh_justifications_command():
+    operation = make_operation()
+    OperationValidation.objects.create(operation=operation, amount=Decimal("100"))
+    Operation.objects.update(justified_amount=None, justified=None)
+
+    call_command("refresh_justifications", year=2026)
+
+    assert justification(operation) == (Decimal("0"), True)
+
+
+@pytest.mark.django_db
+def test_justified_filter_reads_the_stored_state(admin_client):
+    justified = make_operation(counterparty_name="Payeur Dupont")
+    OperationValidation.objects.create(operation=justified, amount=Decimal("100"))
+    make_operation(counterparty_name="Propriétaire Martin")
+
+    content = admin_client.get(
+        reverse("admin:accounts_operation_changelist"), {"justified": "unkown"}
+    ).content.decode()
+
+    assert "Propriétaire Martin" in content
+    assert "Payeur Dupont" not in content
@@ -0,0 +1,200 @@
+"""Tests for matching bank operations to signups and expense reports."""
+
+from decimal import Decimal
+
+import pytest
+import tablib
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from model_bakery import baker
+
+from accounts.matching import Match, refresh_suggestions, resolve_matches
+from accounts.models import Operation, OperationValidation, ReconciliationSuggestion
+from accounts.resource import OperationResource
+
+
+def make_operation(communication, **kwargs):
+    return baker.make(
+        Operation,
+        communication=communication,
+        year=2026,
+        amount=Decimal("100"),
+        **kwargs,
+    )
+
+
+@pytest.mark.django_db
+def test_resolve_matches():
+    reunion = baker.make("reunion.Signup")
+    report = baker.make("accounts.ExpenseReport", title="2026-0003")
+    signup = baker.make("signup2026.Signup", year=2026)
+    operations = [
+        make_operation(f"Reunion-{reunion.id}"),
+        make_operation("reunion 99999"),
+        make_operation("NF 2026-0003"),
+        make_operation(f"inscription {signup.id}"),
+        make_operation("inscription 99999"),
+        make_operation("loyer"),
+    ]
+
+    matches = resolve_matches(operations)
+
+    assert [matches[operation.pk] for operation in operations] == [
+        Match("reunion", reunion.id, f"reunion #{reunion.id}", 90),
+        None,
+        Match("expense_report", report.id, "NF 2026-0003", 90),
+        Match("signup2026", signup.id, f"#{signup.id}", 80),
+        Match("signup", 99999, "#99999", 10),
+        None,
+    ]
+
+
+@pytest.mark.django_db
+def test_unknown_expense_report_falls_back_to_the_signup_number():
+    [match] = resolve_matches([make_operation("NF 2026-0042")]).values()
+
+    assert match == Match("signup", 2026, "#2026", 10)
+
+
+@pytest.mark.django_db
+def test_refresh_suggestions_replaces_the_previous_ones():
+    signup = baker.make("signup2026.Signup", year=2026)
+    operation = make_operation(str(signup.id))
+    justified = make_operation(f"inscription {signup.id}")
+    baker.make(OperationValidation, operation=justified, amount=Decimal("100"))
+
+    assert refresh_suggestions([operation, justified]) == 1
+    assert refresh_suggestions([operation, justified]) == 1
+
+    [suggestion] = ReconciliationSuggestion.objects.all()
+    assert suggestion.operation == operation
+    assert suggestion.target == signup
+    assert suggestion.kind == "signup2026"
+    assert suggestion.confidence == 50
+
+
+@pytest.mark.django_db
+def test_import_stores_suggestions():
+    signup = baker.make("signup2026.Signup", year=2026)
+    account = baker.make("accounts.Account")
+    dataset = tablib.Dataset(
+        headers=[
+            "account",
+            "year",
+            "number",
+            "date",
+            "description",
+            "amount",
+            "currency",
+            "effective_date",
+            "counterparty_IBAN",
+            "counterparty_name",
+            "communication",
+            "reference",
+        ]
+    )
+    for number, communication in ((1, f"inscription {signup.id}"), (2, "loyer")):
+        dataset.append(
+            [
+                account.id,
+                2026,
+                number,
+                "2026-03-01",
+                "Virement",
+                "100",
+                "EUR",
+                "2026-03-01",
+                "BE71096123456769",
+                "Jean",
+                communication,
+                "",
+            ]
+        )
+
+    OperationResource().import_data(dataset, dry_run=True)
+    assert not ReconciliationSuggestion.objects.exists()
+
+    result = OperationResource().import_data(dataset)
+
+    assert not result.has_errors()
+    [suggestion] = ReconciliationSuggestion.objects.all()
+    assert suggestion.operation.number == 1
+    assert suggestion.target == signup
+
+
+@pytest.mark.django_db
+def test_refresh_suggestions_command():
+    signup = baker.make("signup2026.Signup", year=2026)
+    for _ in range(3):
+        make_operation(f"inscription {signup.id}")
+    make_operation("loyer")
+
+    call_command("refresh_suggestions", batch_size=2)
+
+    assert ReconciliationSuggestion.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_to_reconcile_filter(admin_client):
+    signup = baker.make("signup2026.Signup", year=2026)
+    suggested = make_operation(
+        f"inscription {signup.id}", counterparty_name="Payeur Dupont"
+    )
+    make_operation("loyer", counterparty_name="Propriétaire Martin")
+    refresh_suggestions(Operation.objects.all())
+
+    content = admin_client.get(
+        reverse("admin:accounts_operation_changelist"), {"to_reconcile": "yes"}
+    ).content.decode()
+
+    assert "Payeur Dupont" in content
+    assert "Propriétaire Martin" not in content
+    assert f"Link to #{signup.id}" in content
+    assert suggested.suggestions.get().confidence == 80
+
+
+@pytest.mark.django_db
+def test_changelist_matches_the_page_in_constant_queries(admin_client):
+    url = reverse("admin:accounts_operation_changelist")
+
+    def page_queries():
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.get(url)
+        assert response.status_code == 200
+        return len(context.captured_queries), response.content.decode()
+
+    reunion = baker.make("reunion.Signup")
+    baker.make("accounts.ExpenseReport", title="2026-0001")
+    make_operation(f"reunion {reunion.id}")
+    make_operation("2026-0001")
+    refresh_suggestions(Operation.objects.all())
+    page_queries()
+    few_rows, _ = page_queries()
+
+    for i in range(20):
+        signup = baker.make("signup2026.Signup", year=2026)
+        make_operation(f"inscription {signup.id}")
+        make_operation(f"reunion {reunion.id}")
+        make_operation(f"{i:04d}-0001")
+    refresh_suggestions(Operation.objects.all())
+    many_rows, content = page_queries()
+
+    assert many_rows == few_rows
+    assert f"Link to reunion #{reunion.id}" in content
+    assert "Link to NF 2026-0001" in content
+
+
+@pytest.mark.django_db
+def test_justified_operations_are_not_matched(admin_client):
+    signup = baker.make("signup2026.Signup", year=2026)
+    operation = make_operation(f"inscription {signup.id}")
+    refresh_suggestions([operation])
+    baker.make(OperationValidation, operation=operation, amount=Decimal("100"))
+
+    content = admin_client.get(
+        reverse("admin:accounts_operation_changelist")
+    ).content.decode()
+
+    assert f"Link to #{signup.id}" not in content
@@ -0,0 +1,95 @@
+"""Tests for the day bitmask of the 2026 participants."""
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+
+from signup2026.models import ALL_DAYS, Participant, Signup
+
+
+@pytest.fixture
+def signup(db):
+    return baker.make(Signup, year=2026, validated_at=timezone.now())
+
+
+def make_participant(signup, **kwargs):
+    return baker.make(Participant, signup_group=signup, **kwargs)
+
+
+def days(participant):
+    return Participant.objects.values_list("days", flat=True).get(pk=participant.pk)
+
+
+def test_days_follow_the_day_columns(signup):
+    everyday = make_participant(signup)
+    partial = make_participant(signup, day1=False, day9=False)
+    assert days(everyday) == ALL_DAYS
+    assert days(partial) == 0b011111110
+
+    partial.day9 = True
+    partial.save(update_fields=["day9"])
+    assert days(partial) == 0b111111110
+
+    Participant.objects.filter(day1=True).update(day1=False, day2=False)
+    assert days(everyday) == 0b111111100
+
+    everyday.day1 = True
+    Participant.objects.bulk_update([everyday], ["day1"])
+    assert days(everyday) == 0b111111101
+
+    [created] = Participant.objects.bulk_create(
+        [baker.prepare(Participant, signup_group=signup, day5=False)]
+    )
+    assert days(created) == ALL_DAYS & ~0b10000
+
+
+def test_bitwise_filters(signup):
+    make_participant(signup, last_name="Everyday")
+    make_participant(signup, last_name="Partial", day3=False)
+
+    assert [p.last_name for p in Participant.objects.attending(3)] == ["Everyday"]
+    assert Participant.objects.attending(4).count() == 2
+    partials = Participant.objects.filter(Participant.partial_q())
+    assert [p.last_name for p in partials] == ["Partial"]
+
+
+def test_admin_day_filter(admin_client, signup):
+    make_participant(signup, last_name="Everyday")
+    make_participant(signup, last_name="Partial", day3=False)
+
+    response = admin_client.get(
+        reverse("admin:signup2026_participant_changelist"), {"date": "day3"}
+    )
+
+    assert [p.last_name for p in response.context["cl"].result_list] == ["Everyday"]
+
+
+def test_attendance_roster(admin_client, signup):
+    make_participant(signup, last_name="Everyday")
+    make_participant(signup, last_name="Partial", day3=False)
+    cancelled = baker.make(
+        Signup,
+        year=2026,
+        validated_at=timezone.now(),
+        cancelled_at=timezone.now(),
+    )
+    make_participant(cancelled, last_name="Cancelled")
+
+    response = admin_client.get(reverse("signup2026:attendance", args=[3]))
+    names = [row.record.last_name for row in response.context["table"].rows]
+    assert names == ["Everyday"]
+
+    response = admin_client.get(reverse("signup2026:attendance", args=[2]))
+    names = [row.record.last_name for row in response.context["table"].rows]
+    assert names == ["Everyday", "Partial"]
+
+    assert (
+        admin_client.get(reverse("signup2026:attendance", args=[10])).status_code == 404
+    )
+
+
+def test_attendance_roster_needs_permission(client, signup):
+    response = client.get(reverse("signup2026:attendance", args=[1]))
+
+    assert response.status_code == 302
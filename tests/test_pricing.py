@@ -0,0 +1,91 @@
+"""Tests for the price table shared by the signup apps."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from model_bakery import baker
+
+from dynasignup import pricing
+from signup2023.models import Bill
+from signup2023.models import Participant as Participant2023
+from signup2023.models import Signup as Signup2023
+
+
+class FakeParticipant:
+    def __init__(self, age, days=9):
+        self.age = age
+        self.days = days
+
+    def age_at_dynamobile_end(self):
+        return self.age
+
+    def complete_signup(self):
+        return self.days == 9
+
+    def nb_of_days(self):
+        return self.days
+
+    def __str__(self):
+        return f"participant de {self.age} ans"
+
+
+def amounts(*participants):
+    return [price.amount for _, price in pricing.price_participants(participants)]
+
+
+def test_full_and_partial_prices_are_exact_decimals():
+    assert amounts(FakeParticipant(40), FakeParticipant(40, days=5)) == [
+        Decimal("465.00"),
+        Decimal("309.38"),  # 50 + 415 / 8 * 5 = 309.375
+    ]
+
+
+def test_children_reductions_follow_their_rank():
+    family = [FakeParticipant(40), FakeParticipant(14), FakeParticipant(10)]
+    family += [FakeParticipant(8), FakeParticipant(1)]
+
+    assert amounts(*family) == [
+        Decimal("465.00"),
+        Decimal("355.00"),
+        Decimal("165.00"),
+        Decimal("110.00"),
+        Decimal("0.00"),
+    ]
+
+
+def test_explanation():
+    [(_, price)] = pricing.price_participants([FakeParticipant(10, days=4)])
+
+    assert (
+        price.explanation
+        == "(partiel) 30 + 190 / 8 * 4 enfant 1 réduction 0% = 125.00€"
+    )
+
+
+def test_prices_are_memoised():
+    pricing.band_price.cache_clear()
+
+    amounts(*(FakeParticipant(40) for _ in range(10)))
+
+    assert pricing.band_price.cache_info().misses == 1
+
+
+def test_age_outside_the_bands():
+    with pytest.raises(ValueError, match="Aucune tranche de prix"):
+        amounts(FakeParticipant(1000))
+
+
+@pytest.mark.django_db
+def test_2023_bills_use_the_shared_prices():
+    signup = baker.make(Signup2023)
+    for birthday in (date(1980, 1, 1), date(2015, 1, 1)):
+        baker.make(Participant2023, signup_group=signup, birthday=birthday, day5=False)
+    bill = baker.prepare(Bill, signup=signup)
+
+    total, description = bill.calculate_amount_and_explain()
+
+    # Eight days out of nine: 50 + 415 / 8 * 8 and 30 + 190 / 8 * 8.
+    assert total == Decimal("465.00") + Decimal("220.00")
+    assert bill.calculated_amount == total
+    assert description.endswith("total: 685.00€")
@@ -0,0 +1,69 @@
+"""Tests for the batch pricing of the 2026 signups."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from model_bakery import baker
+
+from signup2026.models import Participant, Signup
+
+ALL_DAYS = {f"day{i}": True for i in range(1, 10)}
+NAMES = {"first_name": "Anne", "last_name": "Dupont"}
+
+
+def make_family(year=2026):
+    signup = baker.make(Signup, year=year)
+    baker.make(
+        Participant, signup_group=signup, birthday=date(1980, 1, 1), **ALL_DAYS, **NAMES
+    )
+    baker.make(
+        Participant, signup_group=signup, birthday=date(2015, 1, 1), **ALL_DAYS, **NAMES
+    )
+    baker.make(
+        Participant, signup_group=signup, birthday=date(2016, 1, 1), **ALL_DAYS, **NAMES
+    )
+    return signup
+
+
+def amounts(signup):
+    return list(
+        signup.participants_set.order_by("birthday").values_list(
+            "amount_due_calculated", flat=True
+        )
+    )
+
+
+@pytest.mark.django_db
+def test_batch_pricing_matches_single_signup_pricing():
+    single, batch = make_family(), make_family()
+
+    single.calculate_amounts()
+    Signup.objects.filter(pk=batch.pk).calculate_amounts()
+
+    batch.refresh_from_db()
+    single.refresh_from_db()
+    assert amounts(batch) == amounts(single)
+    assert amounts(batch) == [Decimal("465"), Decimal("220"), Decimal("165")]
+    assert batch.comments == single.comments
+
+
+@pytest.mark.django_db
+def test_batch_pricing_query_count_does_not_grow(django_assert_num_queries):
+    for _ in range(5):
+        make_family()
+
+    # signups, participants, savepoint + bulk update each, release savepoint
+    with django_assert_num_queries(6):
+        assert Signup.objects.calculate_amounts() == 5
+
+
+@pytest.mark.django_db
+def test_reprice_command_only_touches_the_edition():
+    current, other = make_family(), make_family(year=2025)
+
+    call_command("reprice_signups", year=2026)
+
+    assert None not in amounts(current)
+    assert amounts(other) == [None, None, None]
@@ -0,0 +1,119 @@
+"""Tests for the per-edition seat ledger used when validating signups."""
+
+import pytest
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+
+from signup2026.models import Participant, SeatLedger, Signup
+
+
+def make_signup(nb_participants=1, vae=False, **kwargs):
+    signup = baker.make(Signup, year=2026, **kwargs)
+    baker.make(
+        Participant,
+        signup_group=signup,
+        birthday=timezone.datetime(1985, 1, 1).date(),
+        vae=vae,
+        _quantity=nb_participants,
+    )
+    return signup
+
+
+def validate(signup):
+    with transaction.atomic():
+        signup.validated_at = timezone.now()
+        signup.check_if_on_hold()
+        signup.save()
+    return signup
+
+
+@pytest.fixture(autouse=True)
+def limits(settings):
+    settings.DYNAMOBILE_START_PARTIAL_SIGNUP = timezone.now()
+    settings.DYNAMOBILE_MAX_PARTICIPANTS = 3
+    settings.DYNAMOBILE_MAX_VAE_PARTICIPANTS = 1
+
+
+@pytest.mark.django_db
+def test_rebuild_counts_active_participants_and_vae():
+    make_signup(2, validated_at=timezone.now())
+    make_signup(1, vae=True, validated_at=timezone.now(), on_hold_at=timezone.now())
+    make_signup(1, validated_at=timezone.now(), cancelled_at=timezone.now())
+    make_signup(5)  # not validated
+
+    ledger = SeatLedger.rebuild(2026)
+
+    assert (ledger.participants, ledger.vae) == (2, 1)
+
+
+@pytest.mark.django_db
+def test_validation_reserves_seats_in_the_ledger():
+    validate(make_signup(2))
+    validate(make_signup(1, vae=True))
+
+    ledger = SeatLedger.objects.get(year=2026)
+    assert (ledger.participants, ledger.vae) == (3, 1)
+
+
+@pytest.mark.django_db
+def test_signup_exceeding_the_seats_goes_on_hold_without_taking_seats():
+    first = validate(make_signup(2))
+    second = validate(make_signup(2))
+
+    assert first.on_hold_at is None
+    assert second.on_hold_at is not None
+    assert SeatLedger.objects.get(year=2026).participants == 2
+
+
+@pytest.mark.django_db
+def test_vae_limit_uses_the_ledger():
+    validate(make_signup(1, vae=True))
+    second = validate(make_signup(1, vae=True))
+
+    assert second.on_hold_vae is True
+    assert SeatLedger.objects.get(year=2026).vae == 2
+
+
+@pytest.mark.django_db
+def test_seat_check_does_not_depend_on_the_number_of_signups(
+    django_assert_max_num_queries,
+):
+    for _ in range(20):
+        make_signup(1, validated_at=timezone.now(), on_hold_at=timezone.now())
+    SeatLedger.rebuild(2026)
+    signup = make_signup(1)
+
+    # lock + read ledger, group aggregate, reservation. The test already runs
+    # inside a transaction, which is what check_if_on_hold() expects.
+    with django_assert_max_num_queries(4):
+        signup.check_if_on_hold()
+
+
+@pytest.mark.django_db
+def test_admin_validate_action_rebuilds_the_ledger(admin_client):
+    signup = make_signup(2)
+
+    admin_client.get(
+        reverse("admin:signup2026_signup_actions", args=(signup.pk, "validate"))
+    )
+
+    signup.refresh_from_db()
+    assert signup.validated_at is not None
+    assert SeatLedger.objects.get(year=2026).participants == 2
+
+
+@pytest.mark.django_db
+def test_deletions_rebuild_the_ledger(django_capture_on_commit_callbacks):
+    first = make_signup(2, validated_at=timezone.now())
+    second = make_signup(1, validated_at=timezone.now())
+    SeatLedger.rebuild(2026)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        first.participants_set.first().delete()
+    assert SeatLedger.objects.get(year=2026).participants == 2
+
+    with django_capture_on_commit_callbacks(execute=True):
+        second.owner.delete()
+    assert SeatLedger.objects.get(year=2026).participants == 1
@@ -0,0 +1,70 @@
+"""Smoke test for the opening-rush load generator."""
+
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+from magiclink.models import MagicLink
+
+from signup2026.models import QueuedMail, Signup, WaitingRoomCounter
+
+
+@pytest.fixture
+def signup_open(settings):
+    settings.DYNAMOBILE_START_SIGNUP = timezone.now() - timezone.timedelta(days=1)
+
+
+def test_load_test_completes_signups(live_server, signup_open):
+    # The live server shares one in-memory SQLite connection between its
+    # threads, so the smoke test goes through the flow one user at a time.
+    out = StringIO()
+
+    call_command(
+        "signup_load_test",
+        base_url=live_server.url,
+        users=1,
+        participants=1,
+        keep=True,
+        stdout=out,
+    )
+
+    output = out.getvalue()
+    assert "1/1 signups completed" in output
+    assert "0 failed requests, 0 SQLite lock errors" in output
+    assert "overbooked by 0 participants and 0 VAE" in output
+    assert Signup.objects.filter(validated_at__isnull=False).count() == 1
+
+
+def test_load_test_does_not_count_the_waiting_room_as_failures(live_server, settings):
+    settings.DYNAMOBILE_START_SIGNUP = timezone.now() - timezone.timedelta(seconds=1)
+    settings.DYNAMOBILE_ADMISSIONS_PER_MINUTE = 1
+    WaitingRoomCounter.objects.create(
+        year=settings.DYNAMOBILE_LAST_DAY.year, tickets=100
+    )
+    out = StringIO()
+
+    call_command("signup_load_test", base_url=live_server.url, users=1, stdout=out)
+
+    output = out.getvalue()
+    assert "0/1 signups completed" in output
+    assert "1 sent to the waiting room" in output
+    assert "0 failed requests" in output
+
+
+def test_load_test_cleans_up(live_server, signup_open):
+    call_command(
+        "signup_load_test", base_url=live_server.url, users=1, stdout=StringIO()
+    )
+
+    assert not get_user_model().objects.exists()
+    assert not Signup.objects.exists()
+    assert not QueuedMail.objects.exists()
+    assert not MagicLink.objects.exists()
+
+
+@pytest.mark.django_db
+def test_load_test_refuses_remote_hosts():
+    with pytest.raises(CommandError, match="not a local server"):
+        call_command("signup_load_test", base_url="https://inscriptions.example.org")
@@ -0,0 +1,60 @@
+"""Tests for the per-request signup resolution of the 2026 wizard."""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+
+from signup2026.mixins import SIGNUP_SESSION_KEY
+from signup2026.models import Participant, Signup
+
+
+@pytest.fixture
+def signed_in(client, django_user_model, settings):
+    settings.DYNAMOBILE_START_SIGNUP = timezone.now() - timezone.timedelta(days=1)
+    user = django_user_model.objects.create(username="owner", email="owner@x")
+    client.force_login(user)
+    return user
+
+
+def signup_reads(queries):
+    return [
+        query["sql"]
+        for query in queries
+        if query["sql"].startswith("SELECT")
+        and 'FROM "signup2026_signup"' in query["sql"]
+    ]
+
+
+@pytest.mark.django_db
+def test_signup_id_is_pinned_in_the_session(client, signed_in):
+    client.get(reverse("signup2026:group_edit"))
+
+    signup = Signup.objects.get(owner=signed_in)
+    assert client.session[SIGNUP_SESSION_KEY] == signup.pk
+
+
+@pytest.mark.django_db
+def test_wizard_step_reads_the_signup_once(client, signed_in):
+    client.get(reverse("signup2026:group_edit"))
+    baker.make(Participant, signup_group=Signup.objects.get(owner=signed_in))
+
+    for step in ("day_edit", "group_extra_info", "review"):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(reverse(f"signup2026:{step}"))
+        assert response.status_code == 200
+        assert len(signup_reads(context.captured_queries)) == 1, step
+
+
+@pytest.mark.django_db
+def test_stale_signup_id_falls_back_to_get_or_create(client, signed_in):
+    client.get(reverse("signup2026:group_edit"))
+    Signup.objects.all().delete()
+
+    response = client.get(reverse("signup2026:group_edit"))
+
+    assert response.status_code == 200
+    signup = Signup.objects.get(owner=signed_in)
+    assert client.session[SIGNUP_SESSION_KEY] == signup.pk
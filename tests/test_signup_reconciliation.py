@@ -0,0 +1,199 @@
+"""Tests for linking bank operations to 2026 signups in batches."""
+
+import datetime
+from decimal import Decimal
+
+import pytest
+from django.contrib.admin import helpers
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+
+from accounts.matching import refresh_suggestions
+from accounts.models import IncomeChoices, Operation, OperationValidation
+from accounts.reconciliation import (
+    EXACT,
+    NOTHING_DUE,
+    OVERPAID,
+    PARTIAL,
+    apply_signup_payments,
+    plan_signup_payments,
+)
+from signup2026.models import QueuedMail
+
+
+def make_signup(*amounts_due):
+    owner = baker.make("auth.User", email="owner@example.com")
+    signup = baker.make(
+        "signup2026.Signup", owner=owner, year=2026, validated_at=timezone.now()
+    )
+    for amount_due in amounts_due:
+        baker.make(
+            "signup2026.Participant",
+            signup_group=signup,
+            birthday=datetime.date(1990, 1, 1),
+            amount_due_calculated=Decimal(amount_due),
+        )
+    return signup
+
+
+def make_payment(signup, amount, day=1):
+    operation = baker.make(
+        Operation,
+        year=2026,
+        date=datetime.date(2026, 3, day),
+        communication=f"inscription {signup.id}",
+        amount=Decimal(amount),
+    )
+    refresh_suggestions([operation])
+    return operation
+
+
+@pytest.mark.django_db
+def test_plan_matches_by_communication_and_amount():
+    exact = make_signup("100", "150")
+    partial = make_signup("200")
+    overpaid = make_signup("100")
+    make_payment(exact, "250", day=1)
+    make_payment(partial, "50", day=2)
+    make_payment(overpaid, "120", day=3)
+    baker.make(Operation, year=2026, communication="loyer", amount=Decimal("500"))
+
+    plan = plan_signup_payments(Operation.objects.all())
+
+    assert [(a.signup, a.status, a.due) for a in plan] == [
+        (exact, EXACT, Decimal("250")),
+        (partial, PARTIAL, Decimal("200")),
+        (overpaid, OVERPAID, Decimal("100")),
+    ]
+    assert not OperationValidation.objects.exists()
+
+
+@pytest.mark.django_db
+def test_payments_to_the_same_signup_are_allocated_in_date_order():
+    signup = make_signup("100", "100")
+    first = make_payment(signup, "150", day=1)
+    second = make_payment(signup, "50", day=2)
+    third = make_payment(signup, "10", day=3)
+
+    plan = plan_signup_payments(Operation.objects.all())
+
+    assert [(a.operation, a.status) for a in plan] == [
+        (first, PARTIAL),
+        (second, EXACT),
+        (third, NOTHING_DUE),
+    ]
+    assert [v.amount for v in plan[0].validations] == [
+        Decimal("100"),
+        Decimal("50"),
+    ]
+    assert [v.amount for v in plan[1].validations] == [Decimal("50")]
+
+
+@pytest.mark.django_db
+def test_apply_stores_the_plan_in_one_insert_and_confirms_payment():
+    paid = make_signup("100", "150")
+    unpaid = make_signup("200")
+    make_payment(paid, "250", day=1)
+    make_payment(unpaid, "50", day=2)
+    plan = plan_signup_payments(Operation.objects.all())
+
+    with CaptureQueriesContext(connection) as context:
+        applied = apply_signup_payments(plan)
+
+    assert len(applied) == 2
+    inserts = [
+        q["sql"]
+        for q in context.captured_queries
+        if q["sql"].startswith('INSERT INTO "accounts_operationvalidation"')
+    ]
+    assert len(inserts) == 1
+    assert list(
+        OperationValidation.objects.order_by("id").values_list(
+            "amount", "validation_type"
+        )
+    ) == [
+        (Decimal("100"), IncomeChoices.SIGNUP),
+        (Decimal("150"), IncomeChoices.SIGNUP),
+        (Decimal("50"), IncomeChoices.SIGNUP),
+    ]
+    assert QueuedMail.objects.count() == 1
+    paid.refresh_from_db()
+    unpaid.refresh_from_db()
+    assert paid.payment_confirmation_sent_at is not None
+    assert unpaid.payment_confirmation_sent_at is None
+
+
+@pytest.mark.django_db
+def test_command_is_a_dry_run_unless_applied(capsys):
+    signup = make_signup("100")
+    make_payment(signup, "100")
+
+    call_command("reconcile_signup_payments", year=2026)
+    assert "1/1 operations would be linked" in capsys.readouterr().out
+    assert not OperationValidation.objects.exists()
+
+    call_command("reconcile_signup_payments", year=2026, apply=True)
+    assert "1/1 operations linked" in capsys.readouterr().out
+    assert OperationValidation.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_admin_action_confirms_before_linking(admin_client):
+    signup = make_signup("100")
+    operation = make_payment(signup, "100")
+    url = reverse("admin:accounts_operation_changelist")
+    data = {
+        "action": "reconcile_signup_payments",
+        helpers.ACTION_CHECKBOX_NAME: [operation.pk],
+    }
+
+    response = admin_client.post(url, data)
+
+    assert response.status_code == 200
+    assert f"inscription {signup.id}" in response.content.decode()
+    assert not OperationValidation.objects.exists()
+
+    response = admin_client.post(url, {**data, "apply": "yes"})
+
+    assert response.status_code == 302
+    assert OperationValidation.objects.get().operation == operation
+
+
+@pytest.mark.django_db
+def test_unpriced_participants_are_skipped(admin_client):
+    signup = make_signup("100")
+    baker.make(
+        "signup2026.Participant",
+        signup_group=signup,
+        birthday=datetime.date(1990, 1, 1),
+        amount_due_calculated=None,
+    )
+    unpriced = make_signup()
+    baker.make(
+        "signup2026.Participant",
+        signup_group=unpriced,
+        birthday=datetime.date(1990, 1, 1),
+        amount_due_calculated=None,
+    )
+    make_payment(signup, "100", day=1)
+    make_payment(unpriced, "50", day=2)
+
+    plan = plan_signup_payments(Operation.objects.all())
+
+    assert [allocation.status for allocation in plan] == [EXACT, NOTHING_DUE]
+    assert [v.amount for v in plan[0].validations] == [Decimal("100")]
+
+    operation = make_payment(unpriced, "20", day=3)
+    response = admin_client.get(
+        reverse(
+            "admin:accounts_operation_link_to_signup2026",
+            args=[operation.id, unpriced.id],
+        )
+    )
+    assert response.status_code == 302
+    validation = OperationValidation.objects.get(operation=operation)
+    assert validation.validation_type == IncomeChoices.DONATION
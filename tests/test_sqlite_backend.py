@@ -0,0 +1,87 @@
+"""Tests for the SQLite backend used in production."""
+
+import sqlite3
+import threading
+
+import pytest
+from django.db import OperationalError, connection, connections, transaction
+
+from dynasignup.db.backends.sqlite3 import base
+
+
+@pytest.fixture
+def file_connection(tmp_path, django_db_blocker):
+    settings_dict = {
+        **connection.settings_dict,
+        "NAME": str(tmp_path / "db.sqlite3"),
+        "OPTIONS": {"timeout": 0.01},
+    }
+    wrapper = base.DatabaseWrapper(settings_dict, alias="lock_test")
+    connections["lock_test"] = wrapper
+    with django_db_blocker.unblock():
+        with wrapper.cursor() as cursor:
+            cursor.execute("CREATE TABLE seat (id INTEGER PRIMARY KEY)")
+        yield wrapper
+        wrapper.close()
+    del connections["lock_test"]
+
+
+@pytest.fixture
+def other_writer(file_connection):
+    """A second process-like connection holding the write lock for a moment."""
+    conn = sqlite3.connect(
+        file_connection.settings_dict["NAME"],
+        isolation_level=None,
+        check_same_thread=False,
+    )
+    conn.execute("BEGIN IMMEDIATE")
+    timer = threading.Timer(0.2, conn.commit)
+    timer.start()
+    yield conn
+    timer.join()
+    conn.close()
+
+
+def test_connection_settings(file_connection):
+    with file_connection.cursor() as cursor:
+        cursor.execute("PRAGMA journal_mode")
+        assert cursor.fetchone()[0] == "wal"
+        cursor.execute("PRAGMA synchronous")
+        assert cursor.fetchone()[0] == 1  # NORMAL
+    assert file_connection.transaction_mode == "IMMEDIATE"
+
+
+def test_begin_is_retried_while_the_database_is_locked(
+    file_connection, other_writer, monkeypatch
+):
+    monkeypatch.setattr(base, "lock_retries", base.Counter())
+    monkeypatch.setattr(base, "MAX_ATTEMPTS", 20)
+
+    with transaction.atomic(using="lock_test"):
+        with file_connection.cursor() as cursor:
+            cursor.execute("INSERT INTO seat DEFAULT VALUES")
+
+    assert base.lock_retries["begin"] > 0
+    with file_connection.cursor() as cursor:
+        cursor.execute("SELECT count(*) FROM seat")
+        assert cursor.fetchone()[0] == 1
+
+
+def test_autocommit_write_is_retried_while_the_database_is_locked(
+    file_connection, other_writer, monkeypatch
+):
+    monkeypatch.setattr(base, "lock_retries", base.Counter())
+    monkeypatch.setattr(base, "MAX_ATTEMPTS", 20)
+
+    with file_connection.cursor() as cursor:
+        cursor.execute("INSERT INTO seat DEFAULT VALUES")
+
+    assert base.lock_retries["autocommit"] > 0
+
+
+def test_gives_up_after_max_attempts(file_connection, other_writer, monkeypatch):
+    monkeypatch.setattr(base, "MAX_ATTEMPTS", 1)
+
+    with pytest.raises(OperationalError, match="locked"):
+        with file_connection.cursor() as cursor:
+            cursor.execute("INSERT INTO seat DEFAULT VALUES")
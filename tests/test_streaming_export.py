@@ -0,0 +1,89 @@
+"""Tests for the streaming CSV export of the admin."""
+
+import csv
+from io import StringIO
+
+import pytest
+from django.contrib import admin
+from django.urls import reverse
+from import_export.formats.base_formats import CSV, XLSX
+from model_bakery import baker
+
+from accounts.models import Operation
+from accounts.resource import OperationResource
+from signup2026.admin import ExtraInfoRessource
+from signup2026.models import ExtraParticipantInfo, Participant
+
+
+def csv_format_index(model):
+    formats = admin.site._registry[model].get_export_formats()
+    return next(index for index, f in enumerate(formats) if f is CSV)
+
+
+def export_fields(resource, fields):
+    return {f"{resource.__name__.lower()}_{field}": "on" for field in fields}
+
+
+@pytest.fixture
+def extra_infos(db):
+    return baker.make(
+        ExtraParticipantInfo,
+        participant=lambda: baker.make(
+            Participant, signup_group=baker.make("signup2026.Signup", year=2026)
+        ),
+        _quantity=5,
+        _fill_optional=["comments"],
+    )
+
+
+def test_extra_info_csv_is_streamed_with_participants_joined(
+    admin_client, extra_infos, django_assert_max_num_queries
+):
+    fields = ExtraInfoRessource._meta.fields
+    data = {
+        "format": csv_format_index(ExtraParticipantInfo),
+        "resource": 0,
+        **export_fields(ExtraInfoRessource, fields),
+    }
+    url = reverse("admin:signup2026_extraparticipantinfo_export")
+
+    with django_assert_max_num_queries(8):
+        response = admin_client.post(url, data)
+        content = b"".join(response.streaming_content).decode()
+
+    rows = list(csv.reader(StringIO(content)))
+    expected = list(csv.reader(StringIO(ExtraInfoRessource().export(extra_infos).csv)))
+    assert rows[0] == expected[0]
+    assert sorted(rows[1:]) == sorted(expected[1:])
+    assert len(rows) == 6
+
+
+@pytest.mark.django_db
+def test_operations_export(admin_client):
+    baker.make(Operation, year=2026, _quantity=3)
+    data = {
+        "format": csv_format_index(Operation),
+        "resource": 0,
+        **export_fields(OperationResource, ["account", "number", "amount"]),
+    }
+
+    response = admin_client.post(reverse("admin:accounts_operation_export"), data)
+
+    rows = list(csv.reader(StringIO(b"".join(response.streaming_content).decode())))
+    assert rows[0] == ["account", "number", "amount"]
+    assert len(rows) == 4
+
+
+@pytest.mark.django_db
+def test_other_formats_are_not_streamed(admin_client):
+    formats = admin.site._registry[Operation].get_export_formats()
+    data = {
+        "format": next(index for index, f in enumerate(formats) if f is XLSX),
+        "resource": 0,
+        **export_fields(OperationResource, ["number"]),
+    }
+
+    response = admin_client.post(reverse("admin:accounts_operation_export"), data)
+
+    assert not response.streaming
+    assert response["Content-Type"] == XLSX().get_content_type()
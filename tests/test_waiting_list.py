@@ -0,0 +1,83 @@
+"""Tests for the stored waiting-list numbers of the 2026 signups."""
+
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+
+from signup2026.models import Participant, SeatLedger, Signup
+
+
+@pytest.fixture
+def partial_open(settings):
+    settings.DYNAMOBILE_START_PARTIAL_SIGNUP = timezone.now()
+    return settings.DYNAMOBILE_START_PARTIAL_SIGNUP
+
+
+def make_waiting_signup(validated_at, **kwargs):
+    signup = baker.make(
+        Signup,
+        year=2026,
+        validated_at=validated_at,
+        on_hold_at=validated_at,
+        **kwargs,
+    )
+    baker.make(
+        Participant,
+        signup_group=signup,
+        birthday=timezone.datetime(1985, 1, 1).date(),
+    )
+    return signup
+
+
+@pytest.mark.django_db
+def test_waiting_list_order(partial_open):
+    before = partial_open - timedelta(days=2)
+    partial = make_waiting_signup(before, on_hold_partial=True)
+    late = make_waiting_signup(partial_open + timedelta(days=1))
+    full = make_waiting_signup(before + timedelta(hours=1))
+    cancelled = make_waiting_signup(before, cancelled_at=timezone.now())
+
+    numbers = Signup.objects.renumber_waiting_list(2026)
+
+    assert numbers == {full.id: 1, partial.id: 2, late.id: 3}
+    cancelled.refresh_from_db()
+    assert cancelled.waiting_number is None
+
+
+@pytest.mark.django_db
+def test_leaving_the_waiting_list_renumbers_the_others(partial_open):
+    first = make_waiting_signup(partial_open - timedelta(days=2))
+    second = make_waiting_signup(partial_open - timedelta(days=1))
+    SeatLedger.rebuild(2026)
+
+    first.on_hold_at = None
+    first.save()
+    SeatLedger.rebuild(2026)
+
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert first.waiting_number is None
+    assert second.waiting_number == 1
+
+
+@pytest.mark.django_db
+def test_waiting_list_admin_query_count_does_not_grow(
+    admin_client, partial_open, django_assert_max_num_queries
+):
+    url = reverse("admin:signup2026_waitinglistparticipant_changelist")
+    for days in range(3):
+        make_waiting_signup(partial_open - timedelta(days=days + 1))
+    SeatLedger.rebuild(2026)
+    with django_assert_max_num_queries(20) as few_rows:
+        admin_client.get(url)
+
+    for days in range(3, 20):
+        make_waiting_signup(partial_open - timedelta(days=days + 1))
+    SeatLedger.rebuild(2026)
+    with django_assert_max_num_queries(len(few_rows)):
+        response = admin_client.get(url)
+
+    assert response.status_code == 200
@@ -0,0 +1,90 @@
+"""Tests for the waiting room in front of the 2026 signup forms."""
+
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import Group
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from signup2026.models import WaitingRoomCounter
+
+
+@pytest.fixture
+def waiting_room(settings):
+    settings.DYNAMOBILE_START_SIGNUP = timezone.now() - timedelta(seconds=1)
+    settings.DYNAMOBILE_ADMISSIONS_PER_MINUTE = 2
+    return settings
+
+
+@pytest.fixture
+def visitors(django_user_model):
+    def make(count):
+        clients = []
+        for i in range(count):
+            client = Client()
+            client.force_login(
+                django_user_model.objects.create(username=f"user{i}", email=f"{i}@x")
+            )
+            clients.append(client)
+        return clients
+
+    return make
+
+
+@pytest.mark.django_db
+def test_visitors_beyond_the_admission_rate_wait(waiting_room, visitors):
+    first, second, third = visitors(3)
+    url = reverse("signup2026:group_edit")
+
+    assert first.get(url).status_code == 200
+    assert second.get(url).status_code == 200
+    response = third.get(url)
+
+    assert response.url == reverse("signup2026:waiting_room")
+    status = third.get(reverse("signup2026:waiting_room_status")).json()
+    assert status["admitted"] is False
+    assert status["position"] == 1
+    page = third.get(reverse("signup2026:waiting_room"))
+    assert "Personnes devant vous" in page.content.decode()
+
+
+@pytest.mark.django_db
+def test_visitors_are_admitted_over_time_and_stay_admitted(waiting_room, visitors):
+    first, second, last = visitors(3)
+    url = reverse("signup2026:group_edit")
+    first.get(url)
+    second.get(url)
+    assert last.get(url).status_code == 302
+
+    waiting_room.DYNAMOBILE_START_SIGNUP -= timedelta(minutes=1)
+    status = last.get(reverse("signup2026:waiting_room_status")).json()
+    assert status["admitted"] is True
+
+    # Admission is kept in the session, even if the window moves back.
+    waiting_room.DYNAMOBILE_START_SIGNUP += timedelta(minutes=1)
+    assert last.get(url).status_code == 200
+
+
+@pytest.mark.django_db
+def test_pre_signup_users_skip_the_queue(waiting_room, visitors):
+    clients = visitors(3)
+    url = reverse("signup2026:group_edit")
+    clients[0].get(url)
+    clients[1].get(url)
+    group = Group.objects.create(name="préinscriptions")
+    group.user_set.add(clients[2].session["_auth_user_id"])
+
+    assert clients[2].get(url).status_code == 200
+
+
+@pytest.mark.django_db
+def test_waiting_room_pages_do_not_hand_out_tickets(waiting_room, client):
+    status = client.get(reverse("signup2026:waiting_room_status")).json()
+    response = client.get(reverse("signup2026:waiting_room"))
+
+    assert status["admitted"] is False
+    assert status["ticket"] is False
+    assert response.url == reverse("signup2026:group_edit")
+    assert not WaitingRoomCounter.objects.exists()